@@ -1,4 +1,4 @@
-import { bestiarySource } from "@/lib/source";
+import { bestiarySource, getPageToc } from "@/lib/source";
 import {
   DocsPage,
   DocsBody,
@@ -22,7 +22,7 @@ export default async function Page({
   const isMonster = page.data.creatureType !== undefined;
 
   return (
-    <DocsPage toc={page.data.toc}>
+    <DocsPage toc={getPageToc('bestiary', params.slug) ?? page.data.toc}>
       <DocsTitle>{page.data.title}</DocsTitle>
       <DocsDescription>
         {page.data.description && !isMonster && page.data.description}
@@ -1,4 +1,4 @@
-import { source } from "@/lib/source";
+import { source, getPageToc } from "@/lib/source";
 import {
   DocsPage,
   DocsBody,
@@ -20,7 +20,7 @@ export default async function Page({
   const MDX = page.data.body;
 
   return (
-    <DocsPage toc={page.data.toc}>
+    <DocsPage toc={getPageToc('docs', params.slug) ?? page.data.toc}>
       <DocsTitle>{page.data.title}</DocsTitle>
       <DocsDescription>
         {page.data.description}
@@ -1,4 +1,4 @@
-import { magicItemsSource } from "@/lib/source";
+import { magicItemsSource, getPageToc } from "@/lib/source";
 import {
   DocsPage,
   DocsBody,
@@ -22,7 +22,7 @@ export default async function Page({
   const isItem = page.data.rarity !== undefined;
 
   return (
-    <DocsPage toc={page.data.toc}>
+    <DocsPage toc={getPageToc('magicitems', params.slug) ?? page.data.toc}>
       <DocsTitle>{page.data.title}</DocsTitle>
       <DocsDescription>
         {page.data.description && !isItem && page.data.description}
@@ -1,4 +1,4 @@
-import { spellSource } from "@/lib/source";
+import { spellSource, getPageToc } from "@/lib/source";
 import {
   DocsPage,
   DocsBody,
@@ -69,7 +69,7 @@ export default async function Page({
   const isSpell = page.data.level !== undefined;
 
   return (
-    <DocsPage toc={page.data.toc}>
+    <DocsPage toc={getPageToc('spellbook', params.slug) ?? page.data.toc}>
       <DocsTitle>{page.data.title}</DocsTitle>
       <DocsDescription>
         {page.data.description && !isSpell && page.data.description}
@@ -1,6 +1,13 @@
 import { docs, meta, bestiaryDocs, bestiaryMeta, spellDocs, spellMeta, magicItemDocs, magicItemMeta } from '@/.source';
 import { createMDXSource } from 'fumadocs-mdx';
 import { loader } from 'fumadocs-core/source';
+import spellFacetsJson from '@/lib/facets/spells.json';
+import monsterFacetsJson from '@/lib/facets/monsters.json';
+import itemFacetsJson from '@/lib/facets/items.json';
+import contentTocJson from '@/lib/toc/content.json';
+import bestiaryTocJson from '@/lib/toc/bestiary.json';
+import spellbookTocJson from '@/lib/toc/spellbook.json';
+import magicItemsTocJson from '@/lib/toc/magicitems.json';
 
 // Main documentation source
 export const source = loader({
@@ -26,6 +33,51 @@ export const magicItemsSource = loader({
   source: createMDXSource(magicItemDocs, magicItemMeta),
 });
 
+// Facet indexes emitted by the Python importers (scripts/facets.py).
+// Each maps facet -> value -> sorted page IDs (slug paths within the source).
+type FacetIndex = Record<string, Record<string, string[]>>;
+
+const spellFacets: FacetIndex = spellFacetsJson;
+const monsterFacets: FacetIndex = monsterFacetsJson;
+const itemFacets: FacetIndex = itemFacetsJson;
+
+// Per-page tables of contents emitted by scripts/index-headings.py, keyed by
+// page ID. Headings are slugged the way fumadocs does, so the anchors match.
+// CI fails when they are stale (index-headings.py --check).
+type TocIndex = Record<string, { title: string; url: string; depth: number }[]>;
+
+const tocs: Record<'docs' | 'bestiary' | 'spellbook' | 'magicitems', TocIndex> = {
+  docs: contentTocJson,
+  bestiary: bestiaryTocJson,
+  spellbook: spellbookTocJson,
+  magicitems: magicItemsTocJson,
+};
+
+// Precomputed TOC for a page, or undefined if the page isn't indexed
+export function getPageToc(section: keyof typeof tocs, slugs: string[] = []) {
+  return tocs[section][slugs.join('/')];
+}
+
+// Look up page IDs for one facet value
+function facetIds(index: FacetIndex, facet: string, value: string | number | boolean) {
+  return index[facet]?.[String(value)] ?? [];
+}
+
+// Intersect any number of sorted page ID lists
+export function intersectFacets(...lists: string[][]) {
+  if (lists.length === 0) return [];
+  const [smallest, ...rest] = [...lists].sort((a, b) => a.length - b.length);
+  const sets = rest.map(list => new Set(list));
+  return smallest.filter(id => sets.every(set => set.has(id)));
+}
+
+// Resolve page IDs to pages, skipping any that no longer exist
+function resolvePages<T>(ids: string[], getPage: (slugs: string[]) => T | undefined) {
+  return ids
+    .map(id => getPage(id.split('/')))
+    .filter((page): page is T => page !== undefined);
+}
+
 // Helper to get all spells with their typed data
 export function getAllSpells() {
   return spellSource.getPages();
@@ -33,17 +85,42 @@ export function getAllSpells() {
 
 // Helper to filter spells by level
 export function getSpellsByLevel(level: number) {
-  return getAllSpells().filter(spell => spell.data.level === level);
+  return resolvePages(facetIds(spellFacets, 'level', level), slugs => spellSource.getPage(slugs));
 }
 
 // Helper to filter spells by school
 export function getSpellsBySchool(school: string) {
-  return getAllSpells().filter(spell => spell.data.school === school);
+  return resolvePages(facetIds(spellFacets, 'school', school), slugs => spellSource.getPage(slugs));
 }
 
 // Helper to filter spells by class
 export function getSpellsByClass(className: string) {
-  return getAllSpells().filter(spell =>
-    spell.data.classes?.includes(className)
+  return resolvePages(facetIds(spellFacets, 'class', className), slugs => spellSource.getPage(slugs));
+}
+
+// Helper to filter spells by any combination of facets, e.g.
+// getSpellsByFacets({ class: 'Wizard', level: 3, ritual: true })
+export function getSpellsByFacets(query: Record<string, string | number | boolean>) {
+  const ids = intersectFacets(
+    ...Object.entries(query).map(([facet, value]) => facetIds(spellFacets, facet, value)),
+  );
+  return resolvePages(ids, slugs => spellSource.getPage(slugs));
+}
+
+// Helper to filter monsters by type, CR and/or size, e.g.
+// getMonstersByFacets({ type: 'Dragon', cr: '17' })
+export function getMonstersByFacets(query: Record<string, string | number>) {
+  const ids = intersectFacets(
+    ...Object.entries(query).map(([facet, value]) => facetIds(monsterFacets, facet, value)),
+  );
+  return resolvePages(ids, slugs => bestiarySource.getPage(slugs));
+}
+
+// Helper to filter magic items by rarity, category and/or attunement, e.g.
+// getMagicItemsByFacets({ rarity: 'Rare', attunement: false })
+export function getMagicItemsByFacets(query: Record<string, string | boolean>) {
+  const ids = intersectFacets(
+    ...Object.entries(query).map(([facet, value]) => facetIds(itemFacets, facet, value)),
   );
+  return resolvePages(ids, slugs => magicItemsSource.getPage(slugs));
 }
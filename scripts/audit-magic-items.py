@@ -1,59 +1,69 @@
 #!/usr/bin/env python3
 """
 Audit magic item metadata against 5.2.1 SRD.
-Checks rarity and attunement for all magic items.
+Checks rarity and attunement for all magic items, including the per-variant
+rarities of +1/+2/+3 families.
+
+Fixes are collected while auditing and written at the end, one write per
+changed file. With --dry-run the fixes are printed as a unified diff instead.
+
+Usage:
+  python scripts/audit-magic-items.py [--dry-run]
 """
 
-import os
 import re
-import yaml
+import sys
 from pathlib import Path
 
+from corpus import split_frontmatter
+from frontmatter_patch import PatchSet
+from item_info import expand_variants, page_variants, parse_info_line
+from name_index import NameIndex
+from srd_index import SrdIndex
+
 # Read SRD extracted text
-srd_path = Path("pdfs/DND-SRD-5.2.1-CC - updated.docx.txt")
-with open(srd_path, 'r') as f:
-    srd_text = f.read()
+# Only the magic item chapter, located by the SRD span index
+srd_text = SrdIndex.load('srd-text').section_text('magic-items')
 
 # Parse SRD items - look for patterns like:
 # "123. Item Name"
 # "Category, Rarity (Requires Attunement...)"
+# The info line is parsed with the same tokenizer the importer uses, so
+# "+1, +2, or +3" families and "Rarity Varies" items are covered too.
 item_pattern = re.compile(
     r'^\s*\d+\.\s+(.+?)\n'
-    r'([A-Za-z].*?),\s*(Common|Uncommon|Rare|Very Rare|Legendary|Artifact|Rarity Varies)'
-    r'(?:\s*\(([^)]+)\))?',
+    r'\s*((?:Armor|Potion|Ring|Rod|Scroll|Staff|Wand|Weapon|Wondrous Item)\b[^\n]*)$',
     re.MULTILINE
 )
 
 srd_items = {}
 for match in item_pattern.finditer(srd_text):
     name = match.group(1).strip()
-    category = match.group(2).strip()
-    rarity = match.group(3).strip()
-    attunement_text = match.group(4) if match.group(4) else ""
-
-    # Parse attunement
-    attunement = None
-    if "Requires Attunement" in attunement_text:
-        if "by a " in attunement_text or "by an " in attunement_text:
-            # Extract the class/type requirement
-            req_match = re.search(r'by (?:a |an )?(.+)', attunement_text)
-            if req_match:
-                attunement = req_match.group(1).strip()
-        else:
-            attunement = True
+    info = parse_info_line(match.group(2))
+    if not info['rarity'] and not info['rarityVaries']:
+        continue
 
     srd_items[name] = {
-        'rarity': rarity,
-        'attunement': attunement,
-        'category': category
+        'rarity': info['rarity'],
+        'attunement': info['attunement'] or None,
+        'category': info['category'],
+        'variants': expand_variants(name, info),
+        'rarity_varies': info['rarityVaries'],
     }
 
+srd_index = NameIndex(srd_items)
+
 print(f"Found {len(srd_items)} items in SRD\n")
 
 # Now audit our items
 magicitems_path = Path("magicitems")
 issues = []
-fixed_count = 0
+variant_issues = []
+rarity_skipped = []
+fuzzy_matches = []
+unmatched = []
+patches = PatchSet()
+dry_run = '--dry-run' in sys.argv
 
 def get_item_files():
     """Get all MDX files in magicitems folder."""
@@ -62,97 +72,51 @@ def get_item_files():
             continue
         yield mdx_file
 
-def parse_frontmatter(content):
-    """Extract YAML frontmatter from MDX file."""
-    if not content.startswith('---'):
-        return None, content
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return None, content
-    try:
-        fm = yaml.safe_load(parts[1])
-        return fm, '---' + parts[1] + '---' + parts[2]
-    except:
-        return None, content
-
-def update_frontmatter(content, updates):
-    """Update frontmatter values."""
-    if not content.startswith('---'):
-        return content
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        return content
-
-    lines = parts[1].strip().split('\n')
-    new_lines = []
-    keys_updated = set()
-
-    for line in lines:
-        key_match = re.match(r'^(\w+):', line)
-        if key_match:
-            key = key_match.group(1)
-            if key in updates:
-                value = updates[key]
-                if value is True:
-                    new_lines.append(f'{key}: true')
-                elif value is False or value is None:
-                    # Skip this key (don't include it)
-                    pass
-                elif isinstance(value, str):
-                    if ' ' in value or value in ('true', 'false'):
-                        new_lines.append(f'{key}: "{value}"')
-                    else:
-                        new_lines.append(f'{key}: {value}')
-                else:
-                    new_lines.append(f'{key}: {value}')
-                keys_updated.add(key)
-            else:
-                new_lines.append(line)
-        else:
-            new_lines.append(line)
-
-    # Add any new keys not in original
-    for key, value in updates.items():
-        if key not in keys_updated and value is not None and value is not False:
-            if value is True:
-                new_lines.append(f'{key}: true')
-            elif isinstance(value, str):
-                if ' ' in value or value in ('true', 'false'):
-                    new_lines.append(f'{key}: "{value}"')
-                else:
-                    new_lines.append(f'{key}: {value}')
-            else:
-                new_lines.append(f'{key}: {value}')
-
-    return '---\n' + '\n'.join(new_lines) + '\n---' + parts[2]
-
 # Audit each item
 for mdx_file in get_item_files():
     with open(mdx_file, 'r') as f:
         content = f.read()
 
-    fm, _ = parse_frontmatter(content)
-    if not fm or 'title' not in fm:
+    fm, body = split_frontmatter(content)
+    if 'title' not in fm:
         continue
 
     title = fm['title']
     our_rarity = fm.get('rarity', 'Unknown')
     our_attunement = fm.get('attunement')
 
-    # Find matching SRD item
-    srd_item = srd_items.get(title)
-    if not srd_item:
-        # Try alternate names
-        # Handle +1, +2, or +3 variants
-        if '+1, +2, or +3' in title or ', +1, +2, or +3' in title:
-            continue  # These have variable rarity
+    # Find matching SRD item (exact after normalization, else best trigram match)
+    match = srd_index.resolve(title)
+    if not match:
+        unmatched.append((title, str(mdx_file)))
         continue
+    if not match.exact:
+        fuzzy_matches.append((title, match.name, match.score))
+    srd_item = match.payload
 
     srd_rarity = srd_item['rarity']
     srd_attunement = srd_item['attunement']
 
-    # Compare
-    rarity_matches = our_rarity == srd_rarity
+    # Per-variant rarities for +1/+2/+3 families
+    our_variants = {v['name']: v['rarity'] for v in page_variants(fm, body)}
+    for variant in srd_item['variants']:
+        if variant['bonus'] is None or variant['name'] not in our_variants:
+            continue
+        if our_variants[variant['name']] != variant['rarity']:
+            variant_issues.append({
+                'file': str(mdx_file),
+                'title': variant['name'],
+                'our_rarity': our_variants[variant['name']],
+                'srd_rarity': variant['rarity'],
+            })
+
+    # Compare. "Rarity Varies" items have no single rarity to check against,
+    # so only their attunement is compared; they are listed in the report
+    if srd_item['rarity_varies']:
+        rarity_skipped.append(title)
+        rarity_matches = True
+    else:
+        rarity_matches = our_rarity == srd_rarity
 
     # Normalize attunement comparison
     our_att_normalized = our_attunement
@@ -187,16 +151,36 @@ for mdx_file in get_item_files():
         if not attunement_matches:
             updates['attunement'] = srd_attunement
 
-        new_content = update_frontmatter(content, updates)
-        with open(mdx_file, 'w') as f:
-            f.write(new_content)
-        fixed_count += 1
+        patches.update(mdx_file, updates)
+
+fixed = patches.commit(dry_run=dry_run)
 
 # Report
 print(f"Issues found: {len(issues)}")
-print(f"Items fixed: {fixed_count}")
+print(f"Items {'to fix' if dry_run else 'fixed'}: {len(fixed)}")
+print(f"Fuzzy name matches: {len(fuzzy_matches)}")
+print(f"Not found in SRD: {len(unmatched)}")
+print(f"Rarity not checked (Rarity Varies): {len(rarity_skipped)}")
 print()
 
+if rarity_skipped:
+    print("=== Rarity Varies (attunement only) ===")
+    for title in sorted(rarity_skipped):
+        print(f"  {title}")
+    print()
+
+if fuzzy_matches:
+    print("=== Fuzzy Name Matches ===")
+    for title, srd_name, score in sorted(fuzzy_matches):
+        print(f"  {title} ~ {srd_name} ({score})")
+    print()
+
+if unmatched:
+    print("=== Not Found in SRD ===")
+    for title, path in sorted(unmatched):
+        print(f"  {title} ({path})")
+    print()
+
 if issues:
     print("=== Rarity Issues ===")
     rarity_issues = [i for i in issues if i['rarity_wrong']]
@@ -205,6 +189,11 @@ if issues:
     if len(rarity_issues) > 30:
         print(f"  ... and {len(rarity_issues) - 30} more")
 
+    print()
+    print("=== Variant Rarity Issues ===")
+    for issue in sorted(variant_issues, key=lambda x: x['title']):
+        print(f"  {issue['title']}: {issue['our_rarity']} -> {issue['srd_rarity']}")
+
     print()
     print("=== Attunement Issues ===")
     att_issues = [i for i in issues if i['attunement_wrong']]
@@ -0,0 +1,178 @@
+"""
+Full-text verification of page bodies against SRD entity text.
+
+Both sides are normalized to plain sentences (markdown emphasis, links,
+list markers and headings stripped on the page side; stat block and spell
+header lines stripped on the SRD side; quotes, dashes, case and whitespace
+unified on both). Alignment is done with hash lookups only:
+
+    1. every sentence is hashed whole; identical sentences pair off through
+       a Counter, in any order;
+    2. the remaining sentences are broken into word shingles, the SRD
+       shingles go into an inverted index, and each leftover page sentence
+       is paired with the SRD sentence sharing the most shingles.
+
+Pairs that share enough shingles are reported as altered, leftover page
+sentences as extra and leftover SRD sentences as missing. The cost is
+linear in the number of sentences, so the whole corpus verifies in a few
+seconds.
+
+    result = verify_body(page_body, srd.text(entity), kind='spell')
+    result['missing'], result['extra'], result['altered']
+"""
+
+import re
+from collections import Counter, defaultdict
+
+from stat_block import ABILITY_RE, FIELD_RE, TYPE_LINE_RE
+from text_normalize import fold
+
+# Words per shingle
+SHINGLE_SIZE = 3
+# Sentences shorter than this (headings, trait names, table cells) are ignored
+MIN_WORDS = 3
+# Share of shingles two sentences need in common to count as the same sentence
+ALTERED_THRESHOLD = 0.5
+
+SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+SPACE_RE = re.compile(r'\s+')
+WORD_RE = re.compile(r"[a-z0-9]+(?:['+/-][a-z0-9]+)*")
+
+# Page side markup
+IMPORT_RE = re.compile(r'^(?:import|export)\s')
+JSX_RE = re.compile(r'</?[A-Z][^>]*>')
+LINK_RE = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+HEADING_RE = re.compile(r'^#{1,6}\s+')
+LIST_RE = re.compile(r'^\s*(?:[-*+]|\d+\.)\s+')
+EMPHASIS_RE = re.compile(r'[*_`]+')
+
+# SRD side header lines
+SPELL_HEADER_RE = re.compile(
+    r'^\s*(?:Level \d+ \w+|\w+ Cantrip) \(|^\s*(?:Casting Time|Range|Components?|Duration):')
+HIGHER_LEVEL_RE = re.compile(r'^\s*(?:Using a Higher-Level Spell Slot|Cantrip Upgrade)\.')
+MONSTER_EXTRA_RE = re.compile(r'^\s*(?:Initiative|Gear|Proficiency Bonus|Mod\s+Save)\b', re.IGNORECASE)
+
+def normalize(text):
+    """Normalize a line of text: quotes, dashes, case and whitespace."""
+    text = fold(text)
+    return SPACE_RE.sub(' ', text).strip().lower()
+
+def page_lines(body):
+    """Plain-text lines of an MDX page body."""
+    lines = []
+    in_code = False
+    for line in body.split('\n'):
+        if line.startswith('```'):
+            in_code = not in_code
+            continue
+        if in_code or IMPORT_RE.match(line) or line.lstrip().startswith('|'):
+            continue
+        line = JSX_RE.sub('', line)
+        line = LINK_RE.sub(r'\1', line)
+        line = HEADING_RE.sub('', line)
+        line = LIST_RE.sub('', line)
+        line = EMPHASIS_RE.sub('', line)
+        lines.append(line)
+    return lines
+
+def srd_lines(text, kind):
+    """Plain-text lines of an SRD entity, without the lines frontmatter covers."""
+    lines = fold(text).split('\n')[1:]
+    kept = []
+    for i, line in enumerate(lines):
+        if '\t' in line:
+            continue
+        if kind == 'spell':
+            if HIGHER_LEVEL_RE.match(line):
+                break
+            if SPELL_HEADER_RE.match(line):
+                continue
+        elif kind == 'item':
+            if i == 0:
+                continue
+        elif kind == 'monster':
+            stripped = line.strip()
+            if (TYPE_LINE_RE.match(stripped) or FIELD_RE.match(stripped)
+                    or ABILITY_RE.search(stripped) or MONSTER_EXTRA_RE.match(stripped)):
+                continue
+        kept.append(line)
+    return kept
+
+def sentences(lines):
+    """Normalized sentences of at least MIN_WORDS words."""
+    result = []
+    for line in lines:
+        for sentence in SENTENCE_RE.split(normalize(line)):
+            if len(WORD_RE.findall(sentence)) >= MIN_WORDS:
+                result.append(sentence)
+    return result
+
+def shingles(sentence):
+    """Hashes of the word shingles of a normalized sentence."""
+    words = WORD_RE.findall(sentence)
+    if len(words) < SHINGLE_SIZE:
+        return {hash(tuple(words))}
+    return {hash(tuple(words[i:i + SHINGLE_SIZE])) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def align(ours, srd):
+    """
+    Align two sentence lists.
+
+    Returns (matched count, missing, extra, altered) where altered is a
+    list of (ours, srd, similarity).
+    """
+    # Pass 1: whole-sentence hashes
+    srd_counts = Counter(srd)
+    leftover_ours = []
+    matched = 0
+    for sentence in ours:
+        if srd_counts[sentence] > 0:
+            srd_counts[sentence] -= 1
+            matched += 1
+        else:
+            leftover_ours.append(sentence)
+    leftover_srd = [s for s in srd_counts.elements()]
+
+    # Pass 2: shingle inverted index over the leftover SRD sentences
+    srd_shingles = [shingles(s) for s in leftover_srd]
+    postings = defaultdict(list)
+    for idx, grams in enumerate(srd_shingles):
+        for gram in grams:
+            postings[gram].append(idx)
+
+    used = set()
+    extra = []
+    altered = []
+    for sentence in leftover_ours:
+        grams = shingles(sentence)
+        hits = Counter()
+        for gram in grams:
+            for idx in postings.get(gram, ()):
+                if idx not in used:
+                    hits[idx] += 1
+        best = None
+        for idx, shared in hits.most_common(3):
+            similarity = shared / max(len(grams), len(srd_shingles[idx]))
+            if similarity >= ALTERED_THRESHOLD and (best is None or similarity > best[1]):
+                best = (idx, similarity)
+        if best is None:
+            extra.append(sentence)
+        else:
+            used.add(best[0])
+            altered.append((sentence, leftover_srd[best[0]], round(best[1], 2)))
+
+    missing = [s for idx, s in enumerate(leftover_srd) if idx not in used]
+    return matched, missing, extra, altered
+
+def verify_body(body, srd_text, kind):
+    """Compare a page body with an SRD entity's text and return a result dict."""
+    ours = sentences(page_lines(body))
+    srd = sentences(srd_lines(srd_text, kind))
+    matched, missing, extra, altered = align(ours, srd)
+    return {
+        'sentences': len(srd),
+        'matched': matched,
+        'missing': missing,
+        'extra': extra,
+        'altered': [{'ours': o, 'srd': s, 'similarity': sim} for o, s, sim in altered],
+    }
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Rebuild the spell, monster and magic item facet indexes in lib/facets/.
+
+Importers regenerate their own index after writing; run this after editing
+frontmatter by hand or after a reorganize script moves pages.
+
+Usage: python scripts/build-facets.py [spells|monsters|items ...]
+"""
+
+import sys
+
+from facets import INDEXES, write_facets
+
+def main():
+    names = sys.argv[1:] or list(INDEXES)
+    for name in names:
+        if name not in INDEXES:
+            print(f"Unknown index: {name} (expected one of {', '.join(INDEXES)})")
+            sys.exit(1)
+        count = write_facets(name)
+        print(f"  {name}: {count} pages indexed")
+
+if __name__ == '__main__':
+    main()
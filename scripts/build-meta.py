@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Rebuild every meta.json and the site structure in TOC.md.
+
+content/, spellbook/, bestiary/ and magicitems/ are scanned once, and each
+folder's sidebar order is rebuilt with the rule for its path in
+scripts/meta-order.json (explicit, alpha or cr, with pinned entries first;
+see site_meta.py). Only meta.json files whose contents change are written.
+The "Site Structure" section of TOC.md is regenerated from the result.
+
+Pages that exist but aren't listed in an explicit meta.json (orphans) and
+listed entries whose page is gone (missing) are reported; missing entries
+are dropped.
+
+Usage:
+  python scripts/build-meta.py [SECTION ...] [--check] [--rules FILE]
+
+--check writes nothing and exits 1 if a meta.json or TOC.md is out of date.
+"""
+
+import argparse
+import sys
+import time
+
+from corpus import SECTIONS
+from site_meta import RULES_FILE, build_meta, load_rules, rule_for, scan, update_toc, write_meta
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild meta.json files and TOC.md.')
+    parser.add_argument('sections', nargs='*', help='content dirs (default: all)')
+    parser.add_argument('--check', action='store_true', help="report changes, don't write")
+    parser.add_argument('--rules', default=RULES_FILE, help='ordering rules file')
+    args = parser.parse_args()
+
+    unknown = [s for s in args.sections if s not in SECTIONS]
+    if unknown:
+        parser.error(f"not a content section: {', '.join(unknown)}")
+
+    rules = load_rules(args.rules)
+    started = time.perf_counter()
+    trees = {section: scan(section) for section in SECTIONS}
+    folders = changed = 0
+    orphans = []
+    missing = []
+    for section in args.sections or SECTIONS:
+        for folder in trees[section].walk():
+            folders += 1
+            meta, folder_orphans, folder_missing = build_meta(folder, rule_for(folder.rel, rules))
+            orphans += [f'{folder.rel}/{name}' for name in folder_orphans]
+            missing += [f'{folder.rel}/meta.json: {name}' for name in folder_missing]
+            if meta is None or meta == folder.meta:
+                continue
+            changed += 1
+            if args.check:
+                print(f"Stale {folder.rel}/meta.json")
+            elif write_meta(folder, meta):
+                print(f"Updated {folder.rel}/meta.json")
+    toc_changed = update_toc(trees, write=not args.check)
+    elapsed = time.perf_counter() - started
+    if toc_changed:
+        print(f"{'Stale' if args.check else 'Updated'} TOC.md")
+
+    if orphans:
+        print(f"\nOrphans, not in their folder's meta.json ({len(orphans)}):")
+        for name in orphans:
+            print(f"  {name}")
+    if missing:
+        print(f"\nMissing, listed but not found ({len(missing)}):")
+        for name in missing:
+            print(f"  {name}")
+
+    print(f"\nScanned {folders} folders in {elapsed:.2f}s, "
+          f"{changed} meta.json {'stale' if args.check else 'updated'}")
+    return 1 if args.check and (changed or toc_changed) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
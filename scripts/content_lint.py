@@ -0,0 +1,332 @@
+"""
+Lint engine for the conventions shown in content/style-guide.mdx.
+
+Every page is read once and each line is classified (frontmatter, fence,
+heading, table row, blank, prose) by one regex. Rules are compiled into a
+few combined scanners instead of being run one by one:
+
+  PROSE_RE   inline rules for every line outside code fences, as one
+             alternation with a named group per rule
+  TABLE_RE   inline rules for table cells, same layout
+  structure  heading levels, table shape, blank-line runs and frontmatter,
+             checked from the line classification as it streams by
+
+so adding an inline rule adds a branch to an existing regex, not another
+pass over the corpus. Inline code, link targets, JSX tags and {expressions}
+are masked (with NULs, so columns stay right) before the inline scanners
+run.
+
+Each violation is {'file', 'line', 'column', 'rule', 'level', 'message'};
+most rules also carry a fix, a replacement {'start', 'end', 'text'} for a
+slice of the line, or {'delete': n} to delete n lines from it. apply_fixes() applies the fixes of one
+page from right to left, skipping any that overlap one already applied.
+lint_tree() lints every page of the given sections in parallel, the way
+frontmatter_schema.check_tree() does.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import ROOT, SECTIONS
+
+# Rule IDs and levels
+RULES = {
+    'heading/h1': 'warning',
+    'heading/skip-level': 'warning',
+    'heading/trailing-punctuation': 'error',
+    'heading/title-case': 'warning',
+    'bold-lead/punctuation': 'warning',
+    'table/edge-pipes': 'error',
+    'table/columns': 'error',
+    'table/separator': 'error',
+    'table/empty-cell': 'warning',
+    'text/numeric-range': 'warning',
+    'text/trailing-whitespace': 'warning',
+    'text/blank-lines': 'warning',
+    'frontmatter/title-punctuation': 'error',
+    'file/final-newline': 'note',
+}
+
+# Words that stay lowercase inside a Title Case heading
+MINOR_WORDS = {
+    'a', 'an', 'the', 'and', 'but', 'or', 'nor', 'as', 'at', 'by', 'for', 'from',
+    'in', 'into', 'of', 'off', 'on', 'onto', 'out', 'per', 'to', 'up', 'via', 'vs',
+    'with', 'within', 'without', 'about', 'above', 'across', 'after', 'against',
+    'along', 'among', 'around', 'before', 'behind', 'below', 'between', 'beyond',
+    'during', 'like', 'over', 'through', 'toward', 'under', 'until', 'upon',
+}
+
+LINE_RE = re.compile(
+    r'(?P<fence>\s*(?:```|~~~).*)'
+    r'|(?P<heading>(?P<hashes>#{1,6})\s+(?P<htext>.*?)\s*)'
+    r'|(?P<table>\s*\|.*)'
+    r'|(?P<blank>\s*)'
+    r'|(?P<prose>.*)'
+)
+TABLE_SEPARATOR_RE = re.compile(r'\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*')
+TITLE_RE = re.compile(r'^title:\s*(["\']?)(.*?)\1\s*$')
+
+# Inline code, link targets, JSX tags and {expressions}, masked before scanning
+MASK_RE = re.compile(r'`[^`]*`|\]\([^)]*\)|</?[A-Za-z][^>]*>|\{[^}]*\}|^(?:import|export)\s.*')
+
+# (rule, pattern, message). Patterns must not use named groups.
+PROSE_RULES = [
+    # Only "**Name**." lead-ins; "**Trigger:** ..." label fields are left alone
+    ('bold-lead/punctuation', r'^\*\*[^*]+?\*\*\.',
+     'bold lead-ins end with a period inside the bold: **Name.**'),
+    ('text/numeric-range', r'(?<![\w.,/+-])\d+(?:,\d{3})*-\d+(?:,\d{3})*(?![\w/-]|[.,]\d)',
+     'numeric ranges use an en dash (5–6)'),
+    ('text/trailing-whitespace', r'[ \t]+$', 'trailing whitespace'),
+]
+TABLE_RULES = [
+    ('table/empty-cell', r'(?<=\|)[ \t]*-[ \t]*(?=\|)', 'empty cells use an em dash (—)'),
+]
+
+def _combine(rules):
+    names = {f'r{i}': rule for i, (rule, _, _) in enumerate(rules)}
+    pattern = '|'.join(f'(?P<r{i}>{p})' for i, (_, p, _) in enumerate(rules))
+    messages = {rule: message for rule, _, message in rules}
+    return re.compile(pattern), names, messages
+
+PROSE_RE, PROSE_NAMES, PROSE_MESSAGES = _combine(PROSE_RULES)
+TABLE_RE, TABLE_NAMES, TABLE_MESSAGES = _combine(TABLE_RULES)
+
+BOLD_LEAD_FIX_RE = re.compile(r'^\*\*(.+?)\*\*\.$')
+
+def _inline_fix(rule, text):
+    """Replacement text for an inline match, or None when not fixable."""
+    if rule == 'bold-lead/punctuation':
+        return BOLD_LEAD_FIX_RE.sub(r'**\1.**', text)
+    if rule == 'text/numeric-range':
+        return text.replace('-', '–')
+    if rule == 'text/trailing-whitespace':
+        return ''
+    if rule == 'table/empty-cell':
+        return ' — '
+    return None
+
+NON_SPACE_RE = re.compile(r'\S')
+
+def _mask(line):
+    return MASK_RE.sub(lambda m: NON_SPACE_RE.sub('\0', m.group()), line)
+
+def title_case(text):
+    """Heading text with every word but the minor ones capitalized."""
+    words = text.split(' ')
+    for i, word in enumerate(words):
+        if word and word[0].islower() and word.isalpha() and (i == 0 or word not in MINOR_WORDS):
+            words[i] = word[0].upper() + word[1:]
+    return ' '.join(words)
+
+def _split_cells(row):
+    row = row.strip()
+    if row.startswith('|'):
+        row = row[1:]
+    if row.endswith('|'):
+        row = row[:-1]
+    return re.split(r'(?<!\\)\|', row)
+
+class _Page:
+    """Violations and fixes of one page while it is being scanned."""
+
+    def __init__(self, path, rules):
+        self.path = path
+        self.rules = rules
+        self.results = []
+
+    def add(self, rule, line, column, message, fix=None):
+        if self.rules and rule not in self.rules:
+            return
+        result = {
+            'file': self.path, 'line': line, 'column': column,
+            'rule': rule, 'level': RULES[rule], 'message': message,
+        }
+        if fix is not None:
+            result['fix'] = fix
+        self.results.append(result)
+
+    def scan(self, scanner, names, messages, line_no, line, masked):
+        for match in scanner.finditer(masked):
+            rule = names[match.lastgroup]
+            start, end = match.span()
+            replacement = _inline_fix(rule, line[start:end])
+            fix = None if replacement is None else {'start': start, 'end': end, 'text': replacement}
+            self.add(rule, line_no, start + 1, messages[rule], fix)
+
+def lint_text(path, content, rules=None):
+    """Lint the text of one page; returns its violations in line order."""
+    page = _Page(path, rules)
+    lines = content.split('\n')
+    if content and not content.endswith('\n'):
+        page.add('file/final-newline', len(lines), len(lines[-1]) + 1,
+                 'file does not end with a newline', {'start': len(lines[-1]),
+                                                      'end': len(lines[-1]), 'text': '\n'})
+    elif content.endswith('\n'):
+        lines.pop()
+
+    title = None
+    body_start = 0
+    if lines and lines[0] == '---':
+        for i in range(1, len(lines)):
+            if lines[i] == '---':
+                body_start = i + 1
+                break
+            match = TITLE_RE.match(lines[i])
+            if match:
+                title = match.group(2)
+                if title.endswith('.') and not title.endswith('...'):
+                    end = match.end(2)
+                    page.add('frontmatter/title-punctuation', i + 1, end,
+                             'titles do not end with a period',
+                             {'start': end - 1, 'end': end, 'text': ''})
+
+    in_fence = False
+    prev_level = 1
+    blank_run = 0
+    table = None  # (header line number, column count, row index)
+    for i in range(body_start, len(lines)):
+        line = lines[i]
+        line_no = i + 1
+        kind = LINE_RE.fullmatch(line)
+        if kind.group('fence'):
+            in_fence = not in_fence
+            blank_run = 0
+            table = None
+            continue
+        if in_fence:
+            continue
+
+        if kind.group('blank') is not None:
+            blank_run += 1
+            table = None
+            if blank_run > 1:
+                page.add('text/blank-lines', line_no, 1, 'more than one blank line', {'delete': 1})
+            continue
+        blank_run = 0
+        masked = _mask(line)
+
+        if kind.group('heading'):
+            table = None
+            level = len(kind.group('hashes'))
+            text = kind.group('htext')
+            column = kind.start('htext') + 1
+            if level == 1:
+                fix = None
+                if title is not None and text == title:
+                    # Take the blank line after it along, so no blank run is left
+                    around = lines[i - 1:i] + lines[i + 1:i + 2]
+                    fix = {'delete': 2 if len(around) == 2 and not ''.join(around).strip() else 1}
+                page.add('heading/h1', line_no, 1,
+                         'the page title comes from frontmatter; use ## for sections', fix)
+            elif level > prev_level + 1:
+                page.add('heading/skip-level', line_no, 1,
+                         f'heading level jumps from {prev_level} to {level}')
+            prev_level = level
+            if text[-1:] in '.:;,' and not text.endswith('...'):
+                end = kind.end('htext')
+                page.add('heading/trailing-punctuation', line_no, end,
+                         'headings do not end with punctuation',
+                         {'start': end - 1, 'end': end, 'text': ''})
+            cased = title_case(text)
+            if cased != text:
+                page.add('heading/title-case', line_no, column, f'headings use Title Case: {cased}',
+                         {'start': column - 1, 'end': kind.end('htext'), 'text': cased})
+            page.scan(PROSE_RE, PROSE_NAMES, PROSE_MESSAGES, line_no, line, masked)
+            continue
+
+        if kind.group('table'):
+            stripped = line.rstrip()
+            if not stripped.endswith('|') or not stripped.lstrip().startswith('|'):
+                page.add('table/edge-pipes', line_no, len(stripped) + 1,
+                         'table rows start and end with a pipe',
+                         {'start': len(stripped), 'end': len(line), 'text': ' |'})
+            cells = _split_cells(line)
+            if table is None:
+                table = (line_no, len(cells), 0)
+            else:
+                header_line, columns, row = table
+                table = (header_line, columns, row + 1)
+                if row == 0:
+                    if not TABLE_SEPARATOR_RE.fullmatch(line):
+                        page.add('table/separator', line_no, 1,
+                                 'the row after a table header is a |---| separator')
+                    elif len(cells) != columns:
+                        page.add('table/separator', line_no, 1,
+                                 f'the separator has {len(cells)} columns, the header has {columns}',
+                                 {'start': 0, 'end': len(line),
+                                  'text': '|' + '|'.join(['---'] * columns) + '|'})
+                    continue
+                if len(cells) != columns:
+                    page.add('table/columns', line_no, 1,
+                             f'row has {len(cells)} cells, the header (line {header_line}) has {columns}')
+            page.scan(TABLE_RE, TABLE_NAMES, TABLE_MESSAGES, line_no, line, masked)
+            page.scan(PROSE_RE, PROSE_NAMES, PROSE_MESSAGES, line_no, line, masked)
+            continue
+
+        table = None
+        page.scan(PROSE_RE, PROSE_NAMES, PROSE_MESSAGES, line_no, line, masked)
+
+    page.results.sort(key=lambda r: (r['line'], r['column']))
+    return page.results
+
+def apply_fixes(content, results):
+    """Content with every non-overlapping fix applied; returns (content, fixed count)."""
+    lines = content.split('\n')
+    by_line = {}
+    for r in results:
+        if 'fix' in r:
+            by_line.setdefault(r['line'] - 1, []).append(r['fix'])
+    fixed = 0
+    deleted = set()
+    for idx, fixes in by_line.items():
+        delete = max(f.get('delete', 0) for f in fixes)
+        if delete:
+            deleted.update(range(idx, idx + delete))
+            fixed += 1
+            continue
+        line = lines[idx]
+        floor = len(line) + 1
+        for fix in sorted(fixes, key=lambda f: f['start'], reverse=True):
+            if fix['end'] > floor:
+                continue
+            line = line[:fix['start']] + fix['text'] + line[fix['end']:]
+            floor = fix['start']
+            fixed += 1
+        lines[idx] = line
+    lines = [line for idx, line in enumerate(lines) if idx not in deleted]
+    return '\n'.join(lines), fixed
+
+def _lint_file(job):
+    path, rules, fix = job
+    with open(path, encoding='utf-8') as f:
+        content = f.read()
+    rel = os.path.relpath(path, ROOT)
+    results = lint_text(rel, content, rules)
+    fixed = 0
+    if fix and any('fix' in r for r in results):
+        content, fixed = apply_fixes(content, results)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        results = lint_text(rel, content, rules)
+    return results, fixed
+
+def page_files(sections=None):
+    """Every .mdx page of the given sections (default: all), sorted."""
+    files = []
+    for section in sections or SECTIONS:
+        for dirpath, _, filenames in os.walk(ROOT / section):
+            files.extend(os.path.join(dirpath, name) for name in filenames if name.endswith('.mdx'))
+    return sorted(files)
+
+def lint_tree(files, rules=None, fix=False, workers=None):
+    """Lint pages in parallel; returns (violations, fixes applied)."""
+    jobs = [(path, rules, fix) for path in files]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        outcomes = list(map(_lint_file, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_lint_file, jobs, chunksize=64))
+    results = [r for page_results, _ in outcomes for r in page_results]
+    return results, sum(fixed for _, fixed in outcomes)
@@ -0,0 +1,69 @@
+"""
+Shared helpers for walking the content corpus.
+
+Each content section (content/, spellbook/, bestiary/, magicitems/) is a tree
+of MDX pages with YAML frontmatter. A page ID is its path relative to the
+section root, without the .mdx extension and without a trailing /index,
+which is the slug fumadocs uses for the page URL.
+"""
+
+import re
+import yaml
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# Section folder -> URL prefix (mirrors scripts/validate-links.mjs)
+SECTIONS = {
+    'content': '/docs',
+    'spellbook': '/spellbook',
+    'bestiary': '/bestiary',
+    'magicitems': '/magicitems',
+}
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---\n?', re.DOTALL)
+
+# libyaml's loader is several times faster when PyYAML was built with it
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def split_frontmatter(content):
+    """Split MDX content into (frontmatter dict, body). Returns ({}, content) if absent."""
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return {}, content
+    try:
+        data = yaml.load(match.group(1), Loader=YAML_LOADER) or {}
+    except yaml.YAMLError:
+        return {}, content
+    return data, content[match.end():]
+
+def page_id(filepath, section_dir):
+    """Convert a file path to its page ID within a section."""
+    rel = Path(filepath).relative_to(section_dir).with_suffix('').as_posix()
+    if rel == 'index':
+        return ''
+    if rel.endswith('/index'):
+        return rel[:-len('/index')]
+    return rel
+
+def is_redirect(content):
+    """Check if page content is a redirect stub rather than a real entry."""
+    head = content[:500]
+    return 'httpEquiv="refresh"' in head or 'redirect(' in head
+
+def iter_pages(section, include_index=False):
+    """
+    Yield (page_id, path, frontmatter, body) for every page in a section.
+
+    Index pages and redirect stubs are skipped unless include_index is set.
+    """
+    section_dir = ROOT / section
+    for filepath in sorted(section_dir.rglob('*.mdx')):
+        if filepath.name == 'index.mdx' and not include_index:
+            continue
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if is_redirect(content):
+            continue
+        data, body = split_frontmatter(content)
+        yield page_id(filepath, section_dir), filepath, data, body
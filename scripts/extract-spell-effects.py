@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Add structured effect fields to existing spellbook pages.
+
+Re-runs the spell_effects extraction over every spell MDX file and rewrites
+the effect keys (damage, save, attackType, area, conditions, materialCost,
+scaling) in its frontmatter. Other frontmatter lines and the body are left
+untouched, and re-running is idempotent.
+
+Usage: python scripts/extract-spell-effects.py [--dry-run]
+"""
+
+import re
+import sys
+import yaml
+from pathlib import Path
+
+from spell_effects import EFFECT_KEYS, extract_effects, effect_frontmatter_lines
+
+SPELLBOOK_DIR = Path(__file__).parent.parent / "spellbook"
+
+def strip_effect_keys(header_lines):
+    """Drop previously written effect keys (and their nested lines)."""
+    kept = []
+    skipping = False
+    for line in header_lines:
+        key_match = re.match(r'^(\w+):', line)
+        if key_match:
+            skipping = key_match.group(1) in EFFECT_KEYS
+        elif not line.startswith(' '):
+            skipping = False
+        if not skipping:
+            kept.append(line)
+    return kept
+
+def update_spell(filepath, dry_run=False):
+    """Rewrite effect fields for one spell. Returns the effects, or None if skipped."""
+    with open(filepath, 'r') as f:
+        content = f.read()
+
+    match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
+    if not match:
+        return None
+    fm = yaml.safe_load(match.group(1))
+    if not fm or 'level' not in fm:
+        return None
+
+    body = content[match.end():]
+    material = (fm.get('components') or {}).get('material')
+    effects = extract_effects(body, fm.get('higherLevel'), material)
+
+    header = strip_effect_keys(match.group(1).split('\n'))
+    header.extend(effect_frontmatter_lines(effects))
+    new_content = '---\n' + '\n'.join(header) + '\n---\n' + body
+
+    if new_content != content and not dry_run:
+        with open(filepath, 'w') as f:
+            f.write(new_content)
+    return effects
+
+def main():
+    dry_run = '--dry-run' in sys.argv
+
+    counts = {key: 0 for key in EFFECT_KEYS}
+    total = 0
+    for filepath in sorted(SPELLBOOK_DIR.glob('*/*.mdx')):
+        effects = update_spell(filepath, dry_run)
+        if effects is None:
+            continue
+        total += 1
+        for key in effects:
+            counts[key] += 1
+
+    print(f"{'Checked' if dry_run else 'Updated'} {total} spells")
+    for key, count in counts.items():
+        print(f"  {key}: {count}")
+
+if __name__ == '__main__':
+    main()
@@ -8,14 +8,13 @@ import os
 import yaml
 from pathlib import Path
 
-# Read the SRD text
-srd_path = Path(__file__).parent.parent / "pdfs" / "SRD_5.2.1.txt"
-with open(srd_path, 'r') as f:
-    lines = f.readlines()
+from facets import write_facets
+from srd_index import SrdIndex
+from spell_effects import extract_effects
 
-# Spell section roughly lines 6468-11238
-spell_lines = lines[6467:11240]
-spell_text = ''.join(spell_lines)
+# Read the SRD text
+# Only the spell chapter, located by the SRD span index
+spell_text = SrdIndex.load('srd-lines').section_text('spells')
 
 # Pattern to match spell headers
 # "Level X School (Classes)" or "School Cantrip (Classes)"
@@ -190,10 +189,8 @@ for i, match in enumerate(matches):
 
     if desc_match:
         desc_text = desc_match.group(1).strip()
-        # Clean up the description
-        # Remove page numbers like "123   System Reference Document 5.2.1"
-        desc_text = re.sub(r'\d+\s+System Reference Document \d+\.\d+\.\d+', '', desc_text)
-        # Remove extra whitespace
+        # Clean up the description (page footers are already gone, see
+        # text_normalize.py)
         desc_text = re.sub(r'\n\s+', '\n', desc_text)
         desc_text = re.sub(r'\s{2,}', ' ', desc_text)
 
@@ -266,6 +263,11 @@ for school, school_spells in by_school.items():
         }
         if 'higherLevel' in spell:
             frontmatter['higherLevel'] = spell['higherLevel']
+        frontmatter.update(extract_effects(
+            spell['description'],
+            spell.get('higherLevel'),
+            spell['components'].get('material'),
+        ))
 
         # Write file
         with open(filepath, 'w') as f:
@@ -277,4 +279,7 @@ for school, school_spells in by_school.items():
 
         print(f"  Wrote {filepath.name}")
 
+write_facets('spells')
+print("Updated lib/facets/spells.json")
+
 print(f"\nDone! Wrote {len(spells)} spell files.")
@@ -0,0 +1,102 @@
+"""
+Facet indexes for spells, monsters and magic items.
+
+Each index maps a facet name to {value: [sorted page IDs]}, e.g.
+
+    {"level": {"3": ["evocation/fireball", ...]}, "class": {"Wizard": [...]}}
+
+The indexes are written to lib/facets/*.json and read by lib/source.ts so
+listing pages can do set lookups instead of filtering every page. Importers
+call write_facets() after writing their output; build-facets.py rebuilds all
+of them from the current tree.
+"""
+
+import json
+
+from corpus import ROOT, iter_pages
+from item_info import page_variants
+
+FACETS_DIR = ROOT / "lib" / "facets"
+
+def _spell_facets(data, body):
+    level = data.get('level')
+    if level is None:
+        return None
+    return {
+        'level': [str(level)],
+        'school': [data.get('school')],
+        'class': data.get('classes') or [],
+        'ritual': [str(bool(data.get('ritual'))).lower()],
+        'concentration': [str(bool(data.get('concentration'))).lower()],
+    }
+
+def _monster_facets(data, body):
+    creature_type = data.get('creatureType')
+    if not creature_type:
+        return None
+    # "Dragon (Chromatic)" -> "Dragon"
+    base_type = creature_type.split('(')[0].strip()
+    return {
+        'type': [base_type],
+        'cr': [str(data['cr'])] if data.get('cr') is not None else [],
+        'size': [data.get('size')],
+    }
+
+def _item_facets(data, body):
+    if not data.get('rarity') and not data.get('category'):
+        return None
+    # Items with variants are listed under every rarity they come in
+    rarities = [data.get('rarity')] + [v['rarity'] for v in page_variants(data, body)]
+    return {
+        'rarity': list(dict.fromkeys(rarities)),
+        'category': [data.get('category')],
+        'attunement': [str(bool(data.get('attunement'))).lower()],
+    }
+
+# name -> (content section, per-page facet function)
+INDEXES = {
+    'spells': ('spellbook', _spell_facets),
+    'monsters': ('bestiary', _monster_facets),
+    'items': ('magicitems', _item_facets),
+}
+
+def build_facets(name):
+    """Build the facet index for one of INDEXES from the current tree."""
+    section, facet_fn = INDEXES[name]
+    index = {}
+    for page_id, _, data, body in iter_pages(section):
+        facets = facet_fn(data, body)
+        if not facets:
+            continue
+        for facet, values in facets.items():
+            for value in values:
+                if value is None:
+                    continue
+                index.setdefault(facet, {}).setdefault(str(value), []).append(page_id)
+
+    for values in index.values():
+        for ids in values.values():
+            ids.sort()
+    return {facet: dict(sorted(values.items())) for facet, values in sorted(index.items())}
+
+def write_facets(name):
+    """Rebuild and write lib/facets/<name>.json. Returns the number of pages indexed."""
+    index = build_facets(name)
+    FACETS_DIR.mkdir(parents=True, exist_ok=True)
+    # One line per facet value keeps the files compact but diffable
+    lines = ['{']
+    for i, (facet, values) in enumerate(index.items()):
+        lines.append(f'  {json.dumps(facet)}: {{')
+        for j, (value, ids) in enumerate(values.items()):
+            comma = ',' if j < len(values) - 1 else ''
+            lines.append(f'    {json.dumps(value)}: {json.dumps(ids, separators=(",", ":"))}{comma}')
+        lines.append('  },' if i < len(index) - 1 else '  }')
+    lines.append('}')
+    with open(FACETS_DIR / f"{name}.json", 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    pages = set()
+    for values in index.values():
+        for ids in values.values():
+            pages.update(ids)
+    return len(pages)
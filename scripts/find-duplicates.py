@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate pages and repeated passages across the corpus.
+
+Every page body and every prose paragraph gets a MinHash signature, and
+LSH buckets pick the pairs worth comparing (see near_duplicates.py), so
+the whole corpus is checked in one pass without comparing every pair.
+Two kinds of clusters are reported:
+
+  pages     pages whose bodies share most of their text (dragon age
+            categories, +1/+2/+3 item families, consolidated pages)
+  passages  paragraphs repeated, verbatim or nearly, on several pages;
+            candidates for a shared component or template
+
+Redirect stubs are duplicates by design; they are counted, not clustered.
+
+Usage:
+  python scripts/find-duplicates.py [SECTION...] [--threshold 0.5]
+                                    [--passage-threshold 0.8]
+                                    [--report FILE.md] [--json FILE]
+
+--report writes the clusters as markdown for editors; --json writes them
+as input for deduplication (pages and passage occurrences with lines).
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from corpus import ROOT, SECTIONS, is_redirect, split_frontmatter
+from body_verify import page_lines
+from near_duplicates import (LshIndex, MIN_PARAGRAPH_WORDS, SHINGLE_SIZE,
+                             paragraphs, shingle_hashes, signature, words)
+
+def preview(text, width=100):
+    return text if len(text) <= width else text[:width - 1].rstrip() + '…'
+
+def scan(sections):
+    """(page index, passage index, passage texts, page word counts, redirect files)."""
+    pages = LshIndex()
+    passages = LshIndex()
+    texts = {}
+    sizes = {}
+    redirects = []
+    for section in sections:
+        for path in sorted((ROOT / section).rglob('*.mdx')):
+            rel = path.relative_to(ROOT).as_posix()
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            if is_redirect(content):
+                redirects.append(rel)
+                continue
+            _, body = split_frontmatter(content)
+            tokens = words(page_lines(body))
+            if len(tokens) >= SHINGLE_SIZE:
+                pages.add(rel, signature(shingle_hashes(tokens)))
+                sizes[rel] = len(tokens)
+            first_line = content[:len(content) - len(body)].count('\n') + 1
+            for line, text_lines in paragraphs(body, first_line):
+                tokens = words(text_lines)
+                if len(tokens) < MIN_PARAGRAPH_WORDS:
+                    continue
+                key = (rel, line)
+                passages.add(key, signature(shingle_hashes(tokens)))
+                texts[key] = (' '.join(' '.join(text_lines).split()), len(tokens))
+    return pages, passages, texts, sizes, redirects
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate pages and passages.')
+    parser.add_argument('sections', nargs='*', help='content dirs (default: all)')
+    parser.add_argument('--threshold', type=float, default=0.5, help='page similarity (0-1)')
+    parser.add_argument('--passage-threshold', type=float, default=0.8,
+                        help='paragraph similarity (0-1)')
+    parser.add_argument('--report', metavar='FILE.md')
+    parser.add_argument('--json', metavar='FILE')
+    args = parser.parse_args()
+
+    unknown = [s for s in args.sections if s not in SECTIONS]
+    if unknown:
+        parser.error(f"not a content section: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    pages, passages, texts, sizes, redirects = scan(args.sections or SECTIONS)
+    page_clusters = [
+        {'pages': keys, 'similarity': round(min(sims), 2), 'words': sum(sizes[k] for k in keys)}
+        for keys, sims in pages.clusters(args.threshold)
+    ]
+    passage_clusters = []
+    for keys, sims in passages.clusters(args.passage_threshold):
+        if len({file for file, _ in keys}) < 2:
+            continue
+        text, n = texts[keys[0]]
+        passage_clusters.append({
+            'text': text,
+            'words': n,
+            'similarity': round(min(sims), 2),
+            'occurrences': [{'file': file, 'line': line} for file, line in keys],
+        })
+    # Most repeated words first: what templating would save
+    passage_clusters.sort(key=lambda c: -c['words'] * (len(c['occurrences']) - 1))
+    elapsed = time.perf_counter() - started
+
+    print(f"Compared {len(pages.signatures)} pages and {len(passages.signatures)} paragraphs "
+          f"in {elapsed:.2f}s ({len(redirects)} redirect stubs skipped)")
+
+    print(f"\n{len(page_clusters)} near-duplicate page clusters (similarity >= {args.threshold}):")
+    for c in page_clusters:
+        print(f"\n  {len(c['pages'])} pages, similarity >= {c['similarity']}")
+        for page in c['pages']:
+            print(f"    {page}")
+
+    print(f"\n{len(passage_clusters)} passages repeated across pages "
+          f"(similarity >= {args.passage_threshold}):")
+    for c in passage_clusters[:20]:
+        print(f"\n  {len(c['occurrences'])}x {c['words']} words: {preview(c['text'])}")
+        for o in c['occurrences'][:5]:
+            print(f"    {o['file']}:{o['line']}")
+        if len(c['occurrences']) > 5:
+            print(f"    ... and {len(c['occurrences']) - 5} more")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'pages': page_clusters, 'passages': passage_clusters,
+                       'redirects': redirects}, f, indent=2)
+            f.write('\n')
+        print(f"\nDeduplication input written to {args.json}")
+
+    if args.report:
+        lines = ['# Near-Duplicate Report', '',
+                 f'{len(page_clusters)} page clusters, {len(passage_clusters)} repeated passages, '
+                 f'{len(redirects)} redirect stubs.', '', '## Page Clusters', '']
+        for i, c in enumerate(page_clusters, 1):
+            lines.append(f"{i}. {len(c['pages'])} pages, similarity ≥ {c['similarity']}")
+            lines.extend(f"   - `{page}`" for page in c['pages'])
+        lines += ['', '## Repeated Passages', '']
+        for i, c in enumerate(passage_clusters, 1):
+            lines.append(f"{i}. {len(c['occurrences'])}× {c['words']} words: {preview(c['text'], 160)}")
+            lines.extend(f"   - `{o['file']}:{o['line']}`" for o in c['occurrences'])
+        with open(args.report, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        print(f"Report written to {os.path.relpath(args.report)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Batched frontmatter patching.
+
+Tools that fix frontmatter fields queue their updates in a PatchSet while
+they run, then apply them all at the end:
+
+    patches = PatchSet()
+    patches.update(path, {'rarity': 'Rare', 'attunement': True})
+    ...
+    changed = patches.commit(dry_run='--dry-run' in sys.argv)
+
+Edits touch only the header: the lines of each updated key are replaced
+and every other line (comments, key order, quoting, the body) is kept
+byte for byte. A key whose current value already equals the update is left
+alone, so files that don't change are never rewritten, and each changed
+file is written once no matter how many updates were queued for it. In
+dry-run mode a unified diff is printed instead of writing.
+
+An update value of None removes the key.
+"""
+
+import difflib
+import json
+import re
+import yaml
+from pathlib import Path
+
+from corpus import FRONTMATTER_RE
+
+KEY_RE = re.compile(r'^([A-Za-z_][\w-]*):')
+
+# Strings that can be written without quotes
+PLAIN_RE = re.compile(r'^[A-Za-z0-9][A-Za-z0-9 ()./+-]*$')
+
+def render_scalar(value):
+    """Render a scalar the way the importers write it."""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    value = str(value)
+    if PLAIN_RE.match(value) and yaml.safe_load(value) == value:
+        return value
+    return json.dumps(value, ensure_ascii=False)
+
+def render_field(key, value):
+    """Render one top-level field as header lines."""
+    if isinstance(value, (dict, list)):
+        if not value:
+            return [f'{key}: {json.dumps(value)}']
+        dumped = yaml.safe_dump({key: value}, sort_keys=False, allow_unicode=True,
+                                default_flow_style=False, width=1000)
+        return dumped.rstrip('\n').split('\n')
+    return [f'{key}: {render_scalar(value)}']
+
+def _field_spans(lines):
+    """Map each top-level key to its (start, end) line range in the header."""
+    spans = {}
+    key = start = None
+    for i, line in enumerate(lines):
+        if key is not None and line[:1] in (' ', '\t', '-'):
+            continue  # nested mapping or list item of the current key
+        if key is not None:
+            spans[key] = (start, i)
+            key = None
+        match = KEY_RE.match(line)
+        if match:
+            key, start = match.group(1), i
+    if key is not None:
+        spans[key] = (start, len(lines))
+    return spans
+
+def patch_frontmatter(content, updates):
+    """
+    Apply {key: value} updates to the frontmatter of one file's content.
+
+    Returns the new content, which is identical to the input when every
+    update already holds.
+    """
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return content
+    header = match.group(1)
+    try:
+        current = yaml.safe_load(header) or {}
+    except yaml.YAMLError:
+        return content
+
+    lines = header.split('\n')
+    spans = _field_spans(lines)
+    replacements = {}
+    appended = []
+    for key, value in updates.items():
+        if value is None:
+            if key in spans:
+                replacements[spans[key]] = []
+            continue
+        if key in current and current[key] == value and type(current[key]) is type(value):
+            continue
+        if key in spans:
+            replacements[spans[key]] = render_field(key, value)
+        else:
+            appended.extend(render_field(key, value))
+
+    if not replacements and not appended:
+        return content
+
+    new_lines = []
+    pos = 0
+    for (start, end), rendered in sorted(replacements.items()):
+        new_lines.extend(lines[pos:start])
+        new_lines.extend(rendered)
+        pos = end
+    new_lines.extend(lines[pos:])
+    new_lines.extend(appended)
+
+    new_header = '\n'.join(new_lines)
+    start, end = match.span(1)
+    return content[:start] + new_header + content[end:]
+
+class PatchSet:
+    """Frontmatter updates queued per file and applied in one write phase."""
+
+    def __init__(self):
+        self.updates = {}
+
+    def update(self, path, updates):
+        """Queue updates for a file. Later updates to the same key win."""
+        self.updates.setdefault(Path(path), {}).update(updates)
+
+    def __len__(self):
+        return len(self.updates)
+
+    def plan(self):
+        """Return [(path, old content, new content)] for files that would change."""
+        changes = []
+        for path, updates in sorted(self.updates.items()):
+            with open(path, 'r', encoding='utf-8') as f:
+                old = f.read()
+            new = patch_frontmatter(old, updates)
+            if new != old:
+                changes.append((path, old, new))
+        return changes
+
+    def diff(self, changes=None):
+        """Unified diff of the planned changes."""
+        out = []
+        for path, old, new in changes if changes is not None else self.plan():
+            out.extend(difflib.unified_diff(
+                old.splitlines(keepends=True), new.splitlines(keepends=True),
+                fromfile=f'a/{path}', tofile=f'b/{path}',
+            ))
+        return ''.join(out)
+
+    def commit(self, dry_run=False):
+        """
+        Write every changed file once, or print the diff when dry_run is set.
+
+        Returns the list of changed paths. The queue is cleared either way.
+        """
+        changes = self.plan()
+        if dry_run:
+            print(self.diff(changes), end='')
+        else:
+            for path, _, new in changes:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(new)
+        self.updates = {}
+        return [path for path, _, _ in changes]
@@ -0,0 +1,324 @@
+"""
+Frontmatter schema checks generated from source.config.ts.
+
+The zod schemas in source.config.ts are the single definition of what each
+collection's frontmatter may contain. Rather than keeping a Python copy in
+sync by hand, this module reads the file and builds the same schemas from
+the subset of zod it uses:
+
+    z.string() z.number() z.boolean() z.enum([...]) z.array(T)
+    z.object({...}) z.union([...]) .optional() .default(v) .min(n)
+    .max(n) .int() .nullable() Schema.extend({...})
+
+and maps each defineDocs() collection dir to its schema. Unsupported zod
+methods raise SchemaError, so the checker fails loudly instead of drifting
+from the build.
+
+Pages are checked the way fumadocs-mdx does at build time: the YAML must
+parse, required keys must be present, and every value must have the right
+type, enum value, range and nested keys. Unknown keys are allowed (zod
+strips them).
+
+    errors = check_content('spellbook', mdx_text)   # [(field, message)]
+    results = check_tree()                          # {path: [(field, message)]}
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import yaml
+
+from corpus import FRONTMATTER_RE, ROOT, YAML_LOADER
+
+CONFIG_FILE = ROOT / 'source.config.ts'
+
+# fumadocs-mdx's frontmatterSchema, which baseSchema extends
+FRONTMATTER_SHAPE = {
+    'title': {'type': 'string'},
+    'description': {'type': 'string', 'optional': True},
+    'icon': {'type': 'string', 'optional': True},
+    'full': {'type': 'boolean', 'optional': True},
+}
+
+# Zod methods that don't change what a value may be
+IGNORED_METHODS = {'describe', 'passthrough', 'strip'}
+
+TOKEN_RE = re.compile(r"""
+    (?P<space>\s+|//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}()\[\],:.;=])
+""", re.VERBOSE | re.DOTALL)
+
+COLLECTION_RE = re.compile(r"dir:\s*'([^']+)',\s*schema:\s*(\w+)")
+
+class SchemaError(Exception):
+    """source.config.ts uses zod the parser doesn't understand."""
+
+def _tokenize(source):
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        match = TOKEN_RE.match(source, pos)
+        if not match:
+            # Anything outside the schema subset (arrows, template strings, ...)
+            tokens.append(('other', source[pos]))
+            pos += 1
+            continue
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        value = match.group()
+        if kind == 'string':
+            value = value[1:-1].encode().decode('unicode_escape')
+        elif kind == 'number':
+            value = float(value) if '.' in value else int(value)
+        tokens.append((kind, value))
+    return tokens
+
+class _Parser:
+    """Recursive descent over `const name = <zod expression>;` statements."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.schemas = {'frontmatterSchema': {'type': 'object', 'shape': FRONTMATTER_SHAPE}}
+
+    def peek(self, offset=0):
+        idx = self.pos + offset
+        return self.tokens[idx] if idx < len(self.tokens) else (None, None)
+
+    def next(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        kind, got = self.next()
+        if got != value:
+            raise SchemaError(f"expected {value!r}, got {got!r}")
+
+    def parse(self):
+        while self.pos < len(self.tokens):
+            if (self.peek() == ('name', 'const') and self.peek(1)[0] == 'name'
+                    and self.peek(2) == ('punct', '=') and self._starts_schema(self.peek(3))):
+                name = self.peek(1)[1]
+                self.pos += 3
+                self.schemas[name] = self.expression()
+            else:
+                self.pos += 1
+        return self.schemas
+
+    def _starts_schema(self, token):
+        return token[0] == 'name' and (token[1] == 'z' or token[1] in self.schemas)
+
+    def expression(self):
+        kind, value = self.next()
+        if kind in ('string', 'number'):
+            return value
+        if (kind, value) == ('name', 'true') or (kind, value) == ('name', 'false'):
+            return value == 'true'
+        if (kind, value) == ('punct', '{'):
+            return self._object_literal()
+        if (kind, value) == ('punct', '['):
+            return self._list_literal()
+        if kind != 'name':
+            raise SchemaError(f"unexpected {value!r}")
+
+        node = None if value == 'z' else dict(self.schemas[value])
+        while self.peek() == ('punct', '.'):
+            self.next()
+            method = self.next()[1]
+            self.expect('(')
+            args = []
+            while self.peek() != ('punct', ')'):
+                args.append(self.expression())
+                if self.peek() == ('punct', ','):
+                    self.next()
+            self.expect(')')
+            node = _apply(node, method, args)
+        return node
+
+    def _object_literal(self):
+        shape = {}
+        while self.peek() != ('punct', '}'):
+            key = self.next()[1]
+            self.expect(':')
+            shape[key] = self.expression()
+            if self.peek() == ('punct', ','):
+                self.next()
+        self.next()
+        return shape
+
+    def _list_literal(self):
+        items = []
+        while self.peek() != ('punct', ']'):
+            items.append(self.expression())
+            if self.peek() == ('punct', ','):
+                self.next()
+        self.next()
+        return items
+
+def _apply(node, method, args):
+    """Apply one zod call to a schema node (node is None right after `z`)."""
+    if node is None:
+        if method in ('string', 'number', 'boolean'):
+            return {'type': method}
+        if method == 'enum':
+            return {'type': 'enum', 'values': list(args[0])}
+        if method == 'array':
+            return {'type': 'array', 'items': args[0]}
+        if method == 'object':
+            return {'type': 'object', 'shape': args[0]}
+        if method == 'union':
+            return {'type': 'union', 'options': list(args[0])}
+        raise SchemaError(f"unsupported zod type z.{method}()")
+
+    node = dict(node)
+    if method == 'optional':
+        node['optional'] = True
+    elif method == 'default':
+        node['optional'] = True
+        node['default'] = args[0]
+    elif method == 'nullable':
+        node['nullable'] = True
+    elif method == 'int':
+        node['int'] = True
+    elif method in ('min', 'max'):
+        node[method] = args[0]
+    elif method == 'extend':
+        node['shape'] = {**node['shape'], **args[0]}
+    elif method not in IGNORED_METHODS:
+        raise SchemaError(f"unsupported zod method .{method}()")
+    return node
+
+def load_schemas(config_file=CONFIG_FILE):
+    """Map each collection dir in source.config.ts to its schema node."""
+    text = config_file.read_text()
+    schemas = _Parser(_tokenize(text)).parse()
+    collections = {}
+    for directory, name in COLLECTION_RE.findall(text):
+        if name not in schemas:
+            raise SchemaError(f"collection {directory} uses unknown schema {name}")
+        collections[directory] = schemas[name]
+    return collections
+
+def _type_name(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, (int, float)):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    if isinstance(value, dict):
+        return 'object'
+    if isinstance(value, date):
+        return 'date'
+    return type(value).__name__
+
+def validate(value, node, path=''):
+    """Return [(path, message)] for every way value fails the schema node."""
+    field = path or '(root)'
+    if value is None and node.get('nullable'):
+        return []
+    kind = node['type']
+    actual = _type_name(value)
+
+    if kind == 'enum':
+        if value not in node['values']:
+            return [(field, f"expected one of {', '.join(map(str, node['values']))}, got {value!r}")]
+        return []
+    if kind == 'union':
+        for option in node['options']:
+            if not validate(value, option, path):
+                return []
+        expected = ' or '.join(o['type'] for o in node['options'])
+        return [(field, f"expected {expected}, got {actual}")]
+    if actual != kind:
+        return [(field, f"expected {kind}, got {actual}")]
+
+    errors = []
+    if kind == 'number':
+        if node.get('int') and value != int(value):
+            errors.append((field, f"expected an integer, got {value}"))
+        if 'min' in node and value < node['min']:
+            errors.append((field, f"must be at least {node['min']}, got {value}"))
+        if 'max' in node and value > node['max']:
+            errors.append((field, f"must be at most {node['max']}, got {value}"))
+    elif kind == 'string':
+        if 'min' in node and len(value) < node['min']:
+            errors.append((field, f"must be at least {node['min']} characters"))
+        if 'max' in node and len(value) > node['max']:
+            errors.append((field, f"must be at most {node['max']} characters"))
+    elif kind == 'array':
+        for i, item in enumerate(value):
+            errors.extend(validate(item, node['items'], f"{path}[{i}]"))
+    elif kind == 'object':
+        for key, child in node['shape'].items():
+            child_path = f"{path}.{key}" if path else key
+            if key not in value:
+                if not child.get('optional'):
+                    errors.append((child_path, 'required'))
+                continue
+            errors.extend(validate(value[key], child, child_path))
+    return errors
+
+def check_content(section, content, schemas=None):
+    """Check one page's frontmatter against its collection schema."""
+    schemas = schemas or load_schemas()
+    if section not in schemas:
+        return []
+    match = FRONTMATTER_RE.match(content)
+    if not match:
+        return [('(frontmatter)', 'missing frontmatter block')]
+    try:
+        data = yaml.load(match.group(1), Loader=YAML_LOADER)
+    except yaml.YAMLError as e:
+        mark = getattr(e, 'problem_mark', None)
+        where = f"line {mark.line + 2}: " if mark else ''
+        problem = getattr(e, 'problem', None) or str(e)
+        return [('(frontmatter)', f"invalid YAML, {where}{problem}")]
+    if data is None:
+        data = {}
+    return validate(data, schemas[section])
+
+_worker_schemas = None
+
+def _check_file(args):
+    global _worker_schemas
+    section, path = args
+    if _worker_schemas is None:
+        _worker_schemas = load_schemas()
+    with open(path, 'r', encoding='utf-8') as f:
+        return path, check_content(section, f.read(), _worker_schemas)
+
+def check_tree(sections=None, workers=None):
+    """Check every .mdx page of the given collections in parallel; {path: errors} for failures."""
+    schemas = load_schemas()
+    jobs = []
+    for section in sections or schemas:
+        for dirpath, _, filenames in os.walk(ROOT / section):
+            jobs.extend((section, os.path.join(dirpath, name))
+                        for name in filenames if name.endswith('.mdx'))
+    jobs.sort()
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        results = map(_check_file, jobs)
+        return {path: errors for path, errors in results if errors}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_check_file, jobs, chunksize=64)
+        return {path: errors for path, errors in results if errors}
+
+def report_page_errors(label, errors):
+    """Print schema errors for one page the way importers and the CLI show them."""
+    for field, message in errors:
+        print(f"  {label}: {field}: {message}")
@@ -0,0 +1,199 @@
+"""
+Heading anchors of every page, for fragment links and page TOCs.
+
+Every heading is slugged the way the site does it (github-slugger, which
+fumadocs uses for heading ids): the heading's text content is lowercased,
+everything but letters, numbers, marks, spaces, hyphens and underscores is
+dropped, each space becomes a hyphen, and repeated slugs on a page get -1,
+-2, ... appended. A trailing [#custom-id] sets the id explicitly, and JSX
+id="..." attributes add anchors too.
+
+The index is cached in .cache/heading-index.json per page with the page's
+hash, so only edited pages are parsed again:
+
+    index = load_index()
+    index['/docs/rules-glossary']['anchors']   # ['ability-check', ...]
+    index['/docs/rules-glossary']['toc']       # [{'title', 'url', 'depth'}]
+    index['/docs/monsters']['links']           # [[line, col, '/docs/...#stat-block']]
+
+write_toc() writes lib/toc/<section>.json ({page ID: toc}) for lib/source.ts,
+so pages can use the precomputed table of contents.
+"""
+
+import json
+import posixpath
+import re
+import unicodedata
+
+from corpus import ROOT, SECTIONS, page_id, split_frontmatter
+from verification_cache import text_hash
+
+CACHE_FILE = ROOT / '.cache' / 'heading-index.json'
+TOC_DIR = ROOT / 'lib' / 'toc'
+# Bump when slugging or extraction rules change
+INDEX_VERSION = 1
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)(?:\s+#+)?\s*$')
+FENCE_RE = re.compile(r'^\s*(```|~~~)')
+CUSTOM_ID_RE = re.compile(r'\s*\[#([^\]]+)\]$')
+JSX_ID_RE = re.compile(r'<[A-Za-z][^>]*?\bid="([^"]+)"')
+MD_LINK_RE = re.compile(r'\]\(([^)\s"]*#[^)\s"]*)(?:\s+"[^"]*")?\)')
+JSX_HREF_RE = re.compile(r'href="([^"]*#[^"]*)"')
+
+# Markup whose text content is what the heading shows
+INLINE_MARKUP = [
+    (re.compile(r'!?\[([^\]]*)\]\([^)]*\)'), r'\1'),
+    (re.compile(r'</?[A-Za-z][^>]*>'), ''),
+    (re.compile(r'`([^`]*)`'), r'\1'),
+    (re.compile(r'(\*\*|__)(.+?)\1'), r'\2'),
+    (re.compile(r'(?<![\w*])[*_](.+?)[*_](?![\w*])'), r'\1'),
+    (re.compile(r'\\(.)'), r'\1'),
+]
+
+def heading_text(raw):
+    """The text content of a heading's markdown source."""
+    for pattern, replacement in INLINE_MARKUP:
+        raw = pattern.sub(replacement, raw)
+    return raw.strip()
+
+def github_slug(text):
+    """github-slugger's slug for text, before deduplication."""
+    text = text.lower()
+    kept = ''.join(c for c in text if c in ' -_' or unicodedata.category(c)[0] in 'LNM')
+    return kept.replace(' ', '-')
+
+class Slugger:
+    """Unique slugs within one page, like github-slugger's BananaSlug."""
+
+    def __init__(self):
+        self.occurrences = {}
+
+    def slug(self, text):
+        base = github_slug(text)
+        slug = base
+        while slug in self.occurrences:
+            self.occurrences[base] += 1
+            slug = f'{base}-{self.occurrences[base]}'
+        self.occurrences[slug] = 0
+        return slug
+
+def parse_page(body, first_line):
+    """(toc, anchors, fragment links) of a page body starting at line first_line."""
+    slugger = Slugger()
+    toc = []
+    anchors = []
+    links = []
+    in_fence = False
+    for offset, line in enumerate(body.split('\n')):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        line_no = first_line + offset
+        heading = HEADING_RE.match(line)
+        if heading:
+            raw = heading.group(2)
+            custom = CUSTOM_ID_RE.search(raw)
+            if custom:
+                raw = raw[:custom.start()]
+            title = heading_text(raw)
+            slug = custom.group(1) if custom else slugger.slug(title)
+            toc.append({'title': title, 'url': f'#{slug}', 'depth': len(heading.group(1))})
+            anchors.append(slug)
+        anchors.extend(JSX_ID_RE.findall(line))
+        for pattern in (MD_LINK_RE, JSX_HREF_RE):
+            for match in pattern.finditer(line):
+                links.append([line_no, match.start(1) + 1, match.group(1)])
+    return toc, anchors, links
+
+def page_route(section, path):
+    """URL of a page file, e.g. /docs/classes/wizard."""
+    page = page_id(path, ROOT / section)
+    return SECTIONS[section] + (f'/{page}' if page else '')
+
+def load_index(rebuild=False):
+    """{route: {'file', 'toc', 'anchors', 'links'}} for every page, reusing cached pages."""
+    cached = {}
+    if not rebuild and CACHE_FILE.exists():
+        with open(CACHE_FILE) as f:
+            data = json.load(f)
+        if data.get('version') == INDEX_VERSION:
+            cached = data['pages']
+
+    pages = {}
+    for section in SECTIONS:
+        for path in sorted((ROOT / section).rglob('*.mdx')):
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+            rel = path.relative_to(ROOT).as_posix()
+            digest = text_hash(content)
+            route = page_route(section, path)
+            if rel in cached and cached[rel]['hash'] == digest:
+                pages[route] = cached[rel]
+                continue
+            _, body = split_frontmatter(content)
+            first_line = content[:len(content) - len(body)].count('\n') + 1
+            toc, anchors, links = parse_page(body, first_line)
+            pages[route] = {'file': rel, 'hash': digest, 'toc': toc,
+                            'anchors': anchors, 'links': links}
+
+    CACHE_FILE.parent.mkdir(exist_ok=True)
+    with open(CACHE_FILE, 'w') as f:
+        json.dump({'version': INDEX_VERSION, 'pages': {p['file']: p for p in pages.values()}}, f)
+    return pages
+
+def resolve_link(href, route, is_index):
+    """(target route, fragment) of a link on the page at route."""
+    path, _, fragment = href.partition('#')
+    if not path:
+        return route, fragment
+    if path.startswith('/'):
+        return path.rstrip('/') or '/', fragment
+    # Relative links resolve from the page's directory, as validate-links.mjs does
+    base = route if is_index else posixpath.dirname(route)
+    return posixpath.normpath(posixpath.join(base, path)), fragment
+
+def broken_fragments(index):
+    """Fragment links whose page exists but has no such anchor, as result dicts."""
+    anchors = {route: set(page['anchors']) for route, page in index.items()}
+    results = []
+    for route, page in index.items():
+        is_index = page['file'].endswith('/index.mdx')
+        for line, column, href in page['links']:
+            if href.startswith(('http://', 'https://', 'mailto:')):
+                continue
+            target, fragment = resolve_link(href, route, is_index)
+            # Missing pages are validate-links.mjs's job; "#" alone is a placeholder
+            if not fragment or target not in anchors or fragment in anchors[target]:
+                continue
+            results.append({'file': page['file'], 'line': line, 'column': column,
+                            'href': href, 'target': target, 'fragment': fragment})
+    return results
+
+def write_toc(index, dry_run=False):
+    """
+    Write lib/toc/<section>.json for every section; returns the files that
+    changed. With dry_run nothing is written, the stale files are returned.
+    """
+    by_section = {section: {} for section in SECTIONS}
+    for route, page in index.items():
+        section = page['file'].split('/', 1)[0]
+        prefix = SECTIONS[section]
+        by_section[section][route[len(prefix) + 1:]] = page['toc']
+
+    if not dry_run:
+        TOC_DIR.mkdir(parents=True, exist_ok=True)
+    changed = []
+    for section, tocs in by_section.items():
+        # One line per page keeps the files compact but diffable
+        lines = [f'  {json.dumps(page)}: {json.dumps(toc, ensure_ascii=False, separators=(",", ":"))}'
+                 for page, toc in sorted(tocs.items()) if toc]
+        text = '{\n' + ',\n'.join(lines) + '\n}\n'
+        path = TOC_DIR / f'{section}.json'
+        if path.exists() and path.read_text(encoding='utf-8') == text:
+            continue
+        if not dry_run:
+            path.write_text(text, encoding='utf-8')
+        changed.append(path)
+    return changed
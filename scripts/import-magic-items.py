@@ -2,24 +2,41 @@
 """
 Import magic items from SRD 5.2.1 markdown.
 Source: https://github.com/springbov/dndsrd5.2_markdown
+
+Usage:
+  python scripts/import-magic-items.py [--input FILE] [--sandbox] [--force]
+                                       [--changelog FILE]
+
+The items file is the 'magic-items-markdown' entry in scripts/sources.json.
+The import is skipped when its checksum hasn't changed since the last
+import, unless --force is given.
+--input reads another file in the same format (e.g. a homebrew submission).
+--sandbox parses each item in a worker with a time and memory budget and
+quarantines items that exceed it (see sandbox.py).
+Every generated page is checked against the magicitems schema in
+source.config.ts before anything is written; if any page fails, the
+failures are reported and magicitems/ is left untouched.
+--changelog takes a changelog from srd-diff.py and regenerates only the
+items it lists as added, changed or renamed, deleting pages of removed ones.
+A changed item is written over its existing page wherever reorganize-wondrous.py
+put it; only new items go to magicitems/<category>/.
 """
 
 import re
 import os
-import urllib.request
-
-# Category mapping to folder names
-CATEGORY_MAP = {
-    'armor': 'armor',
-    'potion': 'potions',
-    'ring': 'rings',
-    'rod': 'rods',
-    'scroll': 'scrolls',
-    'staff': 'staffs',
-    'wand': 'wands',
-    'weapon': 'weapons',
-    'wondrous item': 'wondrous-items',
-}
+import sys
+
+from facets import write_facets
+from frontmatter_schema import check_content, load_schemas, report_page_errors
+from item_info import expand_variants, parse_info_line
+from name_index import normalize_name
+from sandbox import print_quarantine, run_blocks, write_quarantine_report
+from sources import record_import, unchanged_since_import
+from site_meta import rebuild_meta
+from srd_diff import Changelog
+from text_normalize import normalize_source, normalized_text
+
+SOURCES = ['magic-items-markdown']
 
 def clean_name(name):
     """Remove markdown formatting from item name."""
@@ -35,92 +52,71 @@ def slugify(name):
     slug = re.sub(r'-+', '-', slug)
     return slug.strip('-')
 
-def parse_rarity(info_line):
-    """Extract rarity from the info line."""
-    rarities = ['Common', 'Uncommon', 'Rare', 'Very Rare', 'Legendary', 'Artifact']
-    for rarity in rarities:
-        if rarity.lower() in info_line.lower():
-            return rarity
-    return None
-
-def parse_category(info_line):
-    """Extract category from the info line."""
-    info_lower = info_line.lower()
-    for key, folder in CATEGORY_MAP.items():
-        if key in info_lower:
-            return folder
-    return 'wondrous-items'  # Default
-
-def parse_attunement(info_line):
-    """Extract attunement requirement."""
-    if 'requires attunement' in info_line.lower():
-        # Check for specific requirements
-        match = re.search(r'requires attunement by (.+?)\)', info_line, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-        return True
-    return False
-
-def parse_item_type(info_line):
-    """Extract the specific item type (e.g., 'Any Medium or Heavy Armor')."""
-    # Match content in parentheses after category
-    match = re.match(r'\*(\w+)\s*\(([^)]+)\)', info_line)
-    if match:
-        return match.group(2).strip()
-    return None
-
-def parse_items(content):
-    """Parse all magic items from markdown content."""
-    items = []
-
-    # Split on #### headers (item names)
-    parts = re.split(r'\n####\s+', content)
-
-    for part in parts[1:]:  # Skip content before first item
-        lines = part.strip().split('\n')
-        if not lines:
-            continue
-
-        name = clean_name(lines[0].strip())
-
-        # Skip section headers that aren't items
-        if name in ['Magic Item Rules', 'Spells Cast from Items']:
-            continue
-
-        # Find the info line (starts with *)
-        info_line = ''
-        content_start = 1
-        for i, line in enumerate(lines[1:], 1):
-            if line.strip().startswith('*') and line.strip().endswith('*'):
-                info_line = line.strip().strip('*')
-                content_start = i + 1
-                break
-
-        if not info_line:
-            continue
-
-        # Parse metadata
-        rarity = parse_rarity(info_line)
-        category = parse_category(info_line)
-        attunement = parse_attunement(info_line)
-        item_type = parse_item_type('*' + info_line + '*')
+def parse_item(part):
+    """Parse one item (the text after its #### header), or return None."""
+    lines = part.strip().split('\n')
+    if not lines:
+        return None
+
+    name = clean_name(lines[0].strip())
+
+    # Skip section headers that aren't items
+    if name in ['Magic Item Rules', 'Spells Cast from Items']:
+        return None
+
+    # Find the info line (starts with *)
+    info_line = ''
+    content_start = 1
+    for i, line in enumerate(lines[1:], 1):
+        if line.strip().startswith('*') and line.strip().endswith('*'):
+            info_line = line.strip().strip('*')
+            content_start = i + 1
+            break
+
+    if not info_line:
+        return None
+
+    # Parse metadata in one pass over the info line
+    info = parse_info_line(info_line)
+
+    # Get description (everything after info line)
+    description = '\n'.join(lines[content_start:]).strip()
+
+    if not description:
+        return None
+
+    # Per-variant rarities for +1/+2/+3 and "Rarity Varies" items
+    variants = expand_variants(name, info, description)
+
+    return {
+        'name': name,
+        'rarity': info['rarity'] or variants[0]['rarity'],
+        'category': info['folder'],
+        'attunement': info['attunement'],
+        'item_type': info['itemType'],
+        'variants': variants if len(variants) > 1 else [],
+        'description': description,
+    }
 
-        # Get description (everything after info line)
-        description = '\n'.join(lines[content_start:]).strip()
+def parse_items(content, sandboxed=False):
+    """
+    Parse all magic items from markdown content.
 
-        if not description:
-            continue
+    With sandboxed set, each item is parsed under a time and memory budget
+    and items that exceed it are quarantined and reported.
+    """
+    # Split on #### headers (item names)
+    parts = re.split(r'\n####\s+', content)[1:]  # Skip content before first item
 
-        items.append({
-            'name': name,
-            'rarity': rarity,
-            'category': category,
-            'attunement': attunement,
-            'item_type': item_type,
-            'description': description,
-        })
+    if sandboxed:
+        parsed, quarantine = run_blocks(parse_item, parts)
+        print_quarantine(quarantine)
+        if quarantine:
+            print(f"Quarantine report: {write_quarantine_report('magic-items', quarantine)}")
+    else:
+        parsed = [parse_item(part) for part in parts]
 
-    return items
+    return [item for item in parsed if item]
 
 def generate_mdx(item):
     """Generate MDX content for an item."""
@@ -158,6 +154,14 @@ def generate_mdx(item):
         else:
             frontmatter.append(f'attunement: "{item["attunement"]}"')
 
+    if item['variants']:
+        frontmatter.append('variants:')
+        for variant in item['variants']:
+            frontmatter.append(f'  - name: "{variant["name"]}"')
+            frontmatter.append(f'    rarity: {variant["rarity"]}')
+            if variant['bonus'] is not None:
+                frontmatter.append(f'    bonus: {variant["bonus"]}')
+
     frontmatter.append('---')
     frontmatter.append('')
     frontmatter.append(item['description'])
@@ -165,17 +169,34 @@ def generate_mdx(item):
     return '\n'.join(frontmatter)
 
 def main():
-    # Read from local file (download with curl first if needed)
-    local_path = "/tmp/magic-items.md"
-    print(f"Reading from {local_path}...")
-
-    with open(local_path, 'r') as f:
-        content = f.read()
+    from_registry = '--input' not in sys.argv
+    changelog = None
+    if '--changelog' in sys.argv:
+        changelog = Changelog(sys.argv[sys.argv.index('--changelog') + 1], 'item')
+    if not from_registry:
+        local_path = sys.argv[sys.argv.index('--input') + 1]
+        print(f"Reading from {local_path}...")
+        with open(local_path, 'r') as f:
+            content = normalize_source(f.read())
+    elif (not changelog and '--force' not in sys.argv
+            and unchanged_since_import('import-magic-items', SOURCES)):
+        print("magic-items-markdown unchanged since the last import; use --force to re-import")
+        return
+    else:
+        print("Reading magic-items-markdown...")
+        content = normalized_text('magic-items-markdown')
 
     # Parse items
-    items = parse_items(content)
+    items = parse_items(content, sandboxed='--sandbox' in sys.argv)
     print(f"Found {len(items)} magic items")
 
+    base_dir = os.path.join(os.path.dirname(__file__), '..', 'magicitems')
+    current = {}
+    if changelog:
+        items = [item for item in items if changelog.wants(item['name'])]
+        print(f"Regenerating {len(items)} items listed in the changelog")
+        current = changelog.current_pages('magicitems')
+
     # Count by category
     categories = {}
     for item in items:
@@ -186,54 +207,52 @@ def main():
     for cat, count in sorted(categories.items()):
         print(f"  {cat}: {count}")
 
-    # Write items to files
-    base_dir = os.path.join(os.path.dirname(__file__), '..', 'magicitems')
+    # Build and check every page before touching the tree, so a page that
+    # fails the schema check never costs the site its current version
+    schemas = load_schemas()
+    rejected = []
+    pages = {}
 
     for item in items:
-        category_dir = os.path.join(base_dir, item['category'])
-        os.makedirs(category_dir, exist_ok=True)
-
         slug = slugify(item['name'])
-        filepath = os.path.join(category_dir, f'{slug}.mdx')
-
         mdx_content = generate_mdx(item)
 
+        # Check against source.config.ts before the page reaches the build
+        errors = check_content('magicitems', mdx_content, schemas)
+        if errors:
+            report_page_errors(f"{item['category']}/{slug}.mdx", errors)
+            rejected.append(item)
+            continue
+        # Changed items keep their place (e.g. wondrous-items/containers/)
+        filepath = current.get(normalize_name(item['name']))
+        pages[filepath or os.path.join(base_dir, item['category'], f'{slug}.mdx')] = mdx_content
+
+    if rejected:
+        print(f"\n{len(rejected)} items failed the schema check; nothing was written")
+        sys.exit(1)
+
+    if changelog:
+        # Only delete pages of items the changelog removed or renamed
+        for path in changelog.stale_pages('magicitems'):
+            path.unlink()
+            print(f"Removed {path.parent.name}/{path.name}")
+
+    for filepath, mdx_content in pages.items():
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
         with open(filepath, 'w') as f:
             f.write(mdx_content)
+    print(f"\nWrote {len(pages)} magic item files")
 
-    print(f"\nWrote {len(items)} magic item files")
-
-    # Update meta.json files for each category
-    for category in categories:
-        category_dir = os.path.join(base_dir, category)
-        meta_path = os.path.join(category_dir, 'meta.json')
-
-        # Get all item slugs in this category
-        item_slugs = sorted([
-            slugify(item['name'])
-            for item in items
-            if item['category'] == category
-        ])
-
-        # Read existing meta.json to preserve title
-        import json
-        existing_title = category.replace('-', ' ').title()
-        if os.path.exists(meta_path):
-            with open(meta_path) as f:
-                existing = json.load(f)
-                existing_title = existing.get('title', existing_title)
-
-        meta = {
-            'title': existing_title,
-            'pages': item_slugs,
-            'defaultOpen': False
-        }
-
-        with open(meta_path, 'w') as f:
-            json.dump(meta, f, indent=2)
-            f.write('\n')
-
+    # Sidebar order comes from scripts/meta-order.json
+    rebuild_meta('magicitems')
     print("Updated meta.json files")
 
+    write_facets('items')
+    print("Updated lib/facets/items.json")
+    if changelog:
+        return
+    if from_registry:
+        record_import('import-magic-items', SOURCES)
+
 if __name__ == '__main__':
     main()
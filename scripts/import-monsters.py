@@ -1,12 +1,41 @@
 #!/usr/bin/env python3
 """
 Import monsters from the dndsrd5.2_markdown files and generate MDX files.
+
+Usage:
+  python scripts/import-monsters.py [N | --all] [--input FILE] [--sandbox] [--force]
+                                    [--changelog FILE]
+
+The SRD files are the 'monsters-markdown' and 'animals-markdown' entries in
+scripts/sources.json. A full (--all) import is skipped when neither
+checksum changed since the last one, unless --force is given.
+--input reads a single file in the same format (e.g. a homebrew submission)
+instead of the SRD monster and animal files. --sandbox parses each stat
+block in a worker with a time and memory budget and quarantines blocks that
+exceed it (see sandbox.py). Every generated page is checked against the
+bestiary schema in source.config.ts before anything is written; if any
+page fails, the failures are reported and the bestiary is left untouched.
+--changelog takes a changelog from srd-diff.py and regenerates
+only the stat blocks it lists as added, changed or renamed (in place, so
+reorganized dragon, fiend and group folders keep their layout), deleting
+pages of removed ones.
 """
 
 import re
-import json
 from pathlib import Path
 
+from facets import write_facets
+from name_index import normalize_name
+from frontmatter_schema import check_content, load_schemas, report_page_errors
+from sandbox import print_quarantine, run_blocks, write_quarantine_report
+from sources import record_import, unchanged_since_import
+from site_meta import rebuild_meta
+from srd_diff import Changelog
+from stat_block import parse_cr, parse_hp, parse_speed, proficient_saves
+from text_normalize import normalize_source, normalized_text
+
+SOURCES = ['monsters-markdown', 'animals-markdown']
+
 # Creature type to folder mapping
 CREATURE_TYPES = {
     'aberration': 'aberration',
@@ -29,55 +58,19 @@ def slugify(name):
     """Convert monster name to slug for filename."""
     return name.lower().replace("'", "").replace("/", "-").replace(" ", "-").replace(",", "").replace("(", "").replace(")", "")
 
-def parse_speed(speed_line):
-    """Parse speed string like '10 ft., Swim 40 ft.'"""
-    result = {}
-    # Walk speed (first number without prefix)
-    walk_match = re.match(r'(\d+)\s*ft\.', speed_line)
-    if walk_match:
-        result['walk'] = int(walk_match.group(1))
-    # Other speeds
-    for speed_type in ['Fly', 'Swim', 'Burrow', 'Climb']:
-        match = re.search(rf'{speed_type}\s+(\d+)\s*ft\.', speed_line, re.IGNORECASE)
-        if match:
-            result[speed_type.lower()] = int(match.group(1))
-    return result
-
-def parse_hp(hp_line):
-    """Parse HP like '150 (20d10 + 40)'"""
-    match = re.match(r'(\d+)\s*\(([^)]+)\)', hp_line)
-    if match:
-        return {
-            'average': int(match.group(1)),
-            'formula': match.group(2).strip()
-        }
-    return None
-
-def parse_cr(cr_line):
-    """Parse CR like '10 (XP 5,900, or 7,200 in lair)'"""
-    cr_match = re.match(r'([\d/]+)', cr_line)
-    xp_match = re.search(r'XP\s*([\d,]+)', cr_line)
-    cr = cr_match.group(1) if cr_match else None
-    xp = int(xp_match.group(1).replace(',', '')) if xp_match else None
-    return cr, xp
-
 def parse_abilities(stat_table):
     """Parse the ability score table."""
     abilities = {}
-    saves = {}
+    save_values = {}
     # Pattern: | STR | 21 | +5 | +5 |
     for row in stat_table.split('\n'):
         match = re.match(r'\|\s*(STR|DEX|CON|INT|WIS|CHA)\s*\|\s*(\d+)\s*\|\s*([+-]?\d+)\s*\|\s*([+-]?\d+)\s*\|', row)
         if match:
             stat = match.group(1).lower()
-            score = int(match.group(2))
-            save = int(match.group(4))
-            abilities[stat] = score
-            # Only include save if it's different from the modifier (has proficiency)
-            expected_mod = (score - 10) // 2
-            if save != expected_mod:
-                saves[stat] = save
-    return abilities, saves
+            abilities[stat] = int(match.group(2))
+            save_values[stat] = int(match.group(4))
+    # Only include saves that differ from the modifier (have proficiency)
+    return abilities, proficient_saves(abilities, save_values)
 
 def get_creature_type_folder(type_str):
     """Map creature type string to folder name."""
@@ -216,14 +209,20 @@ def parse_monster(text):
 
     return monster
 
-def write_monster_mdx(monster, output_dir, limit_monsters=None):
-    """Write a monster to an MDX file."""
-    folder = get_creature_type_folder(monster['creatureType'])
-    folder_path = output_dir / folder
-    folder_path.mkdir(parents=True, exist_ok=True)
-
-    slug = slugify(monster['name'])
-    filepath = folder_path / f"{slug}.mdx"
+def build_monster_mdx(monster, output_dir, schemas, filepath=None):
+    """
+    The MDX page of a monster (by default at <creature type>/<slug>.mdx).
+
+    Returns (filepath, folder, slug, content), or None when the page fails
+    the bestiary schema in source.config.ts (the errors are printed).
+    """
+    if filepath is None:
+        folder = get_creature_type_folder(monster['creatureType'])
+        slug = slugify(monster['name'])
+        filepath = output_dir / folder / f"{slug}.mdx"
+    else:
+        folder = filepath.parent.relative_to(output_dir).as_posix()
+        slug = filepath.stem
 
     # Build frontmatter
     lines = ['---']
@@ -291,41 +290,57 @@ def write_monster_mdx(monster, output_dir, limit_monsters=None):
     lines.append('')
     lines.append(monster.get('body', ''))
     lines.append('')
+    mdx_content = '\n'.join(lines)
 
-    with open(filepath, 'w') as f:
-        f.write('\n'.join(lines))
+    errors = check_content('bestiary', mdx_content, schemas)
+    if errors:
+        report_page_errors(f"{folder}/{slug}.mdx", errors)
+        return None
 
-    return folder, slug
+    return filepath, folder, slug, mdx_content
 
 # Main execution
 if __name__ == '__main__':
     import sys
 
     # Parse command line args
+    args = sys.argv[1:]
+    input_path = None
+    if '--input' in args:
+        input_path = Path(args.pop(args.index('--input') + 1))
+    changelog = None
+    if '--changelog' in args:
+        changelog = Changelog(args.pop(args.index('--changelog') + 1), 'monster')
+    sandboxed = '--sandbox' in args
+    positional = [a for a in args if not a.startswith('--') or a == '--all']
+
     limit = 10  # Default to 10 monsters for testing
-    if len(sys.argv) > 1:
-        if sys.argv[1] == '--all':
+    if changelog:
+        limit = None
+    elif positional:
+        if positional[0] == '--all':
             limit = None
         else:
-            limit = int(sys.argv[1])
+            limit = int(positional[0])
 
     # Read monster files
     base_dir = Path(__file__).parent.parent
-    monsters_path = base_dir / "pdfs" / "monsters_markdown.md"
-    animals_path = base_dir / "pdfs" / "animals_markdown.md"
     output_dir = base_dir / "bestiary"
 
-    with open(monsters_path, 'r') as f:
-        monsters_content = f.read()
-
-    with open(animals_path, 'r') as f:
-        animals_content = f.read()
+    if input_path:
+        with open(input_path, 'r') as f:
+            texts = [normalize_source(f.read())]
+    else:
+        if (limit is None and not changelog and '--force' not in args
+                and unchanged_since_import('import-monsters', SOURCES)):
+            print("Monster sources unchanged since the last import; use --force to re-import")
+            sys.exit(0)
+        texts = [normalized_text(name) for name in SOURCES]
 
     # Split into individual monster blocks
-    monster_blocks = re.split(r'\n(?=## [A-Z])', monsters_content)
-    animal_blocks = re.split(r'\n(?=## [A-Z])', animals_content)
-
-    all_blocks = monster_blocks + animal_blocks
+    all_blocks = []
+    for text in texts:
+        all_blocks.extend(re.split(r'\n(?=## [A-Z])', text))
 
     # If limiting, pick a diverse set
     if limit:
@@ -352,52 +367,90 @@ if __name__ == '__main__':
                     break
         all_blocks = selected_blocks
 
-    # Clear existing monster files (keep index.mdx)
-    for folder in CREATURE_TYPES.values():
-        folder_path = output_dir / folder
-        if folder_path.exists():
-            for f in folder_path.glob('*.mdx'):
-                f.unlink()
+    removed = {}
+    current = {}
+    if changelog:
+        all_blocks = [b for b in all_blocks
+                      if changelog.wants(b.strip().split('\n')[0].lstrip('#').strip())]
+        print(f"Regenerating {len(all_blocks)} stat blocks listed in the changelog")
+        current = changelog.current_pages('bestiary')
 
-    # Also remove old placeholder files at root
-    for f in output_dir.glob('*.mdx'):
-        if f.name != 'index.mdx':
-            f.unlink()
-
-    # Parse and write monsters
+    # Build and check every page before touching the tree, so a page that
+    # fails the schema check never costs the site its current version
     by_folder = {}
+    pages = {}
     count = 0
-
-    for block in all_blocks:
+    rejected = 0
+    schemas = load_schemas()
+
+    if sandboxed:
+        parsed, quarantine = run_blocks(parse_monster, all_blocks)
+        print_quarantine(quarantine)
+        if quarantine:
+            print(f"Quarantine report: {write_quarantine_report('monsters', quarantine)}")
+    else:
+        parsed = (parse_monster(block) for block in all_blocks)
+
+    for monster in parsed:
         if limit and count >= limit:
             break
 
-        monster = parse_monster(block)
         if monster:
-            folder, slug = write_monster_mdx(monster, output_dir)
+            built = build_monster_mdx(monster, output_dir, schemas,
+                                      current.get(normalize_name(monster['name'])))
+            if not built:
+                rejected += 1
+                continue
+            filepath, folder, slug, mdx_content = built
+            pages[filepath] = mdx_content
             if folder not in by_folder:
                 by_folder[folder] = []
             by_folder[folder].append(slug)
             count += 1
             print(f"  {monster['name']} -> {folder}/{slug}.mdx")
 
-    # Write meta.json for each folder
-    for folder, slugs in by_folder.items():
-        folder_path = output_dir / folder
-        meta = {
-            'title': folder.capitalize(),
-            'pages': sorted(slugs),
-            'defaultOpen': False
-        }
-        with open(folder_path / 'meta.json', 'w') as f:
-            json.dump(meta, f, indent=2)
-
-    # Update root meta.json
-    root_meta = {
-        'title': 'Bestiary',
-        'pages': ['index'] + sorted(by_folder.keys())
-    }
-    with open(output_dir / 'meta.json', 'w') as f:
-        json.dump(root_meta, f, indent=2)
+    if rejected:
+        print(f"\n{rejected} monsters failed the schema check; nothing was written")
+        sys.exit(1)
+
+    if changelog:
+        # Only delete pages of monsters the changelog removed or renamed
+        for f in changelog.stale_pages('bestiary'):
+            removed.setdefault(f.parent, set()).add(f.stem)
+            f.unlink()
+            print(f"Removed {f.relative_to(output_dir)}")
+    else:
+        # Delete monster pages the import no longer produces (keep index.mdx)
+        for folder in CREATURE_TYPES.values():
+            folder_path = output_dir / folder
+            if folder_path.exists():
+                for f in folder_path.glob('*.mdx'):
+                    if f.name != 'index.mdx' and f not in pages:
+                        f.unlink()
+
+        # Also remove old placeholder files at root
+        for f in output_dir.glob('*.mdx'):
+            if f.name != 'index.mdx':
+                f.unlink()
+
+    for filepath, mdx_content in pages.items():
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'w') as f:
+            f.write(mdx_content)
+
+    # Sidebar order comes from scripts/meta-order.json
+    rebuild_meta('bestiary')
+
+    if changelog:
+        dropped = sum(map(len, removed.values()))
+        write_facets('monsters')
+        print(f"\nDone! Regenerated {count} monsters, removed {dropped}.")
+        sys.exit(0)
+
+    write_facets('monsters')
+    print("Updated lib/facets/monsters.json")
+
+    if limit is None and not input_path:
+        record_import('import-monsters', SOURCES)
 
     print(f"\nDone! Wrote {count} monsters across {len(by_folder)} creature types.")
@@ -1,17 +1,56 @@
 #!/usr/bin/env python3
 """
 Import spells from the dndsrd5.2_markdown spells file and generate MDX files.
+
+Usage:
+  python scripts/import-spells.py [--input FILE] [--sandbox] [--force] [--changelog FILE]
+
+The spells file is the 'spells-markdown' entry in scripts/sources.json. The
+import is skipped when its checksum hasn't changed since the last import,
+unless --force is given.
+--input reads another file in the same format (e.g. a homebrew submission).
+--sandbox parses each spell in a worker with a time and memory budget and
+quarantines spells that exceed it (see sandbox.py).
+Every generated page is checked against the spellbook schema in
+source.config.ts before anything is written; if any page fails, the
+failures are reported and the spellbook is left untouched.
+--changelog takes a changelog from srd-diff.py and regenerates only the
+spells it lists as added, changed or renamed, deleting pages of removed
+ones; other pages are left alone. meta.json files are rebuilt with the
+rules in scripts/meta-order.json (see site_meta.py).
 """
 
 import re
 import os
-import json
+import sys
 from pathlib import Path
 
+from facets import write_facets
+from frontmatter_schema import check_content, load_schemas, report_page_errors
+from sandbox import print_quarantine, run_blocks, write_quarantine_report
+from sources import record_import, unchanged_since_import
+from spell_effects import extract_effects, effect_frontmatter_lines
+from site_meta import rebuild_meta
+from srd_diff import Changelog
+from text_normalize import normalize_source, normalized_text
+
+SOURCES = ['spells-markdown']
+
 # Read the markdown file
-spells_path = Path(__file__).parent.parent / "pdfs" / "spells_markdown.md"
-with open(spells_path, 'r') as f:
-    content = f.read()
+sandboxed = '--sandbox' in sys.argv
+from_registry = '--input' not in sys.argv
+changelog = None
+if '--changelog' in sys.argv:
+    changelog = Changelog(sys.argv[sys.argv.index('--changelog') + 1], 'spell')
+if not from_registry:
+    with open(sys.argv[sys.argv.index('--input') + 1], 'r') as f:
+        content = normalize_source(f.read())
+elif ('--force' not in sys.argv and not changelog
+      and unchanged_since_import('import-spells', SOURCES)):
+    print("spells-markdown unchanged since the last import; use --force to re-import")
+    exit(0)
+else:
+    content = normalized_text('spells-markdown')
 
 # Find where spell descriptions start (after "## Spell Descriptions")
 spell_section_match = re.search(r'## Spell Descriptions\s+### [A-Z] Spells\s+', content)
@@ -77,9 +116,11 @@ SCHOOLS = {
     'Transmutation': 'transmutation',
 }
 
-# Find all spells
-spells = []
-for match in spell_pattern.finditer(spell_content):
+def parse_spell(block):
+    """Parse one '#### Spell Name' block, or return None if it isn't a spell."""
+    match = spell_pattern.match(block)
+    if not match:
+        return None
     name = match.group(1).strip()
     level_str = match.group(2)
     level = int(level_str) if level_str else 0  # Cantrip = 0
@@ -133,9 +174,26 @@ for match in spell_pattern.finditer(spell_content):
     if higher_level:
         spell['higherLevel'] = higher_level
 
-    spells.append(spell)
+    # Structured effects (damage, saves, area, conditions, costs, scaling)
+    spell['effects'] = extract_effects(description, higher_level, components.get('material'))
+
+    return spell
+
+# Split into one block per spell header and parse each
+blocks = re.split(r'\n(?=#### )', spell_content)
+if sandboxed:
+    parsed, quarantine = run_blocks(parse_spell, blocks)
+    print_quarantine(quarantine)
+    if quarantine:
+        print(f"Quarantine report: {write_quarantine_report('spells', quarantine)}")
+else:
+    parsed = [parse_spell(block) for block in blocks]
+spells = [spell for spell in parsed if spell]
 
 print(f"Parsed {len(spells)} spells")
+if changelog:
+    spells = [spell for spell in spells if changelog.wants(spell['name'])]
+    print(f"Regenerating {len(spells)} spells listed in the changelog")
 
 # Group by school
 by_school = {}
@@ -148,26 +206,19 @@ for spell in spells:
 # Output directory
 output_dir = Path(__file__).parent.parent / "spellbook"
 
-# Clear existing spell files (but keep index.mdx and meta.json at root)
-for school_dir in output_dir.iterdir():
-    if school_dir.is_dir():
-        for f in school_dir.glob('*.mdx'):
-            f.unlink()
-        print(f"Cleared {school_dir.name}/")
-
-# Write MDX files for each school
+# Build and check every page before touching the tree, so a page that
+# fails the schema check never costs the site its current version
+schemas = load_schemas()
+rejected = []
+pages = {}
 for school, school_spells in by_school.items():
     school_dir = output_dir / school
-    school_dir.mkdir(parents=True, exist_ok=True)
 
     # Sort spells alphabetically
     school_spells.sort(key=lambda s: s['name'])
 
-    spell_slugs = []
-
     for spell in school_spells:
         slug = slugify(spell['name'])
-        spell_slugs.append(slug)
         filename = slug + '.mdx'
         filepath = school_dir / filename
 
@@ -191,23 +242,54 @@ for school, school_spells in by_school.items():
             lines.append(f"  - {cls}")
         if spell.get('higherLevel'):
             lines.append(f"higherLevel: {escape_yaml_string(spell['higherLevel'])}")
+        lines.extend(effect_frontmatter_lines(spell['effects']))
         lines.append('---')
         lines.append('')
         lines.append(spell['description'])
         lines.append('')
+        mdx_content = '\n'.join(lines)
 
-        with open(filepath, 'w') as f:
-            f.write('\n'.join(lines))
+        errors = check_content('spellbook', mdx_content, schemas)
+        if errors:
+            report_page_errors(f"{school}/{filename}", errors)
+            rejected.append(spell['name'])
+            continue
+        pages[filepath] = mdx_content
 
-    # Write meta.json for this school
-    meta_path = school_dir / 'meta.json'
-    meta = {
-        'title': school.capitalize(),
-        'pages': spell_slugs
-    }
-    with open(meta_path, 'w') as f:
-        json.dump(meta, f, indent=2)
+if rejected:
+    print(f"\n{len(rejected)} spells failed the schema check; nothing was written")
+    sys.exit(1)
 
+if changelog:
+    # Only delete pages of spells the changelog removed or renamed
+    for f in changelog.stale_pages('spellbook'):
+        f.unlink()
+        print(f"Removed {f.parent.name}/{f.name}")
+else:
+    # Delete spell pages the import no longer produces (index pages and
+    # meta.json are kept)
+    for school_dir in output_dir.iterdir():
+        if school_dir.is_dir():
+            for f in school_dir.glob('*.mdx'):
+                if f.name != 'index.mdx' and f not in pages:
+                    f.unlink()
+                    print(f"Removed {school_dir.name}/{f.name}")
+
+for filepath, mdx_content in pages.items():
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, 'w') as f:
+        f.write(mdx_content)
+for school, school_spells in by_school.items():
     print(f"  {school}: {len(school_spells)} spells")
 
-print(f"\nDone! Wrote {len(spells)} spell files across {len(by_school)} schools.")
+# Sidebar order comes from scripts/meta-order.json
+rebuild_meta('spellbook')
+print("Updated meta.json files")
+
+write_facets('spells')
+print("Updated lib/facets/spells.json")
+
+if from_registry and not changelog:
+    record_import('import-spells', SOURCES)
+
+print(f"\nDone! Wrote {len(pages)} spell files across {len(by_school)} schools.")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Index heading anchors, check #fragment links and write page TOCs.
+
+validate-links.mjs checks that link paths resolve; this checks the part
+after the #. Every heading of every page is slugged the way the site does
+(see heading_index.py), and each [text](/docs/page#fragment), relative or
+same-page (#fragment) link and href="...#fragment" is looked up in the
+target page's anchors. The per-page tables of contents are written to
+lib/toc/<section>.json, only when they changed; they are committed, and CI
+(.github/workflows/heading-check.yml) runs --check so they can't go stale.
+
+Usage:
+  python scripts/index-headings.py [--check] [--rebuild] [--json REPORT]
+
+--check leaves lib/toc alone and reports TOC files that are stale.
+--rebuild parses every page again instead of reusing
+.cache/heading-index.json. --json writes the broken links; use - for
+stdout. Exits 1 when a fragment link is broken, or with --check when a TOC
+file is stale.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from corpus import ROOT
+from heading_index import broken_fragments, load_index, write_toc
+
+def main():
+    parser = argparse.ArgumentParser(description='Check #fragment links and write page TOCs.')
+    parser.add_argument('--check', action='store_true', help="don't write lib/toc, fail if it is stale")
+    parser.add_argument('--rebuild', action='store_true', help='parse every page again')
+    parser.add_argument('--json', metavar='REPORT')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = load_index(args.rebuild)
+    broken = broken_fragments(index)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        text = json.dumps(broken, indent=2)
+        if args.json == '-':
+            print(text)
+            return 1 if broken else 0
+        with open(args.json, 'w') as f:
+            f.write(text + '\n')
+
+    anchors = sum(len(page['anchors']) for page in index.values())
+    links = sum(len(page['links']) for page in index.values())
+    print(f"Indexed {anchors} anchors on {len(index)} pages, "
+          f"checked {links} fragment links in {elapsed:.2f}s")
+
+    stale = write_toc(index, dry_run=args.check)
+    for path in stale:
+        print(f"{'Stale' if args.check else 'Updated'} {path.relative_to(ROOT)}")
+
+    for b in broken:
+        print(f"{b['file']}:{b['line']}:{b['column']}: no #{b['fragment']} on {b['target']} ({b['href']})")
+    if broken:
+        print(f"\n✗ {len(broken)} broken fragment link{'s' if len(broken) != 1 else ''}")
+        return 1
+    print("✓ All fragment links point at existing anchors")
+    if args.check and stale:
+        print("✗ lib/toc is stale; run python scripts/index-headings.py")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
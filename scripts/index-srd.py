@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Build (or show) the SRD section and entity span index.
+
+Usage:
+  python scripts/index-srd.py [source] [--rebuild] [--entities]
+
+source is a name from scripts/sources.json (default: srd-text). The index
+is cached in .cache/ with the source checksum, so tools normally build it
+on first use; this script shows what was found.
+"""
+
+import sys
+from collections import Counter
+
+from srd_index import SrdIndex
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    source = args[0] if args else 'srd-text'
+    srd = SrdIndex.load(source, rebuild='--rebuild' in sys.argv)
+
+    print(f"Chapters in {source}:")
+    for name, (start, end) in sorted(srd.chapters.items(), key=lambda c: c[1]):
+        counts = Counter(e.kind for e in srd.entities(chapter=name))
+        summary = ', '.join(f"{n} {kind}s" for kind, n in counts.most_common())
+        print(f"  {name:15} bytes {start}-{end}  {summary}")
+
+    outside = [e for e in srd.entities() if e.chapter is None]
+    if outside:
+        print(f"\n{len(outside)} entities outside any chapter")
+
+    if '--entities' in sys.argv:
+        for e in srd.entities():
+            print(f"  {e.chapter or '-':15} {e.kind:8} {e.name}")
+
+if __name__ == '__main__':
+    main()
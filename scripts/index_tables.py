@@ -0,0 +1,251 @@
+"""
+Summary tables on index pages, kept in sync with the pages they list.
+
+A summary table is a markdown table on an index.mdx whose first column
+links to pages, like the CR/AC/HP tables of the bestiary groups or the
+rarity tables of the wondrous item categories:
+
+    | Devil | CR | AC | HP |
+    |-------|-----|----|----|
+    | [Bone Devil](bone) | 9 | 16 | 161 |
+
+Cells of the columns in COLUMNS are filled from the linked page's
+frontmatter (or, for Items, from the number of pages in the linked folder);
+every other cell is left as written. Link text that differs from the page
+title only in case ("Deck Of Illusions", made from the slug) is replaced
+with the title; shortened names ("Warrior") are kept. A table with
+no rows is filled with every page in the index's folder.
+
+Each index records which pages feed its tables, the values it last wrote
+for them and the pages of its folder, in .cache/index-tables.json. A run
+parses the corpus once and regenerates only the indexes whose member
+values changed, whose folder gained or lost a page, or whose own text
+changed since:
+
+    pages = load_pages()
+    for update in update_tables(pages):
+        print(update['file'], update['changed'])
+"""
+
+import json
+import re
+from fractions import Fraction
+
+from corpus import ROOT, SECTIONS, iter_pages, split_frontmatter
+from heading_index import page_route, resolve_link
+from reorganization import slug_title
+from verification_cache import text_hash
+
+CACHE_FILE = ROOT / '.cache' / 'index-tables.json'
+# Bump when column rules or the cache entries change
+TABLES_VERSION = 2
+
+TABLE_ROW_RE = re.compile(r'^\s*\|.*\|\s*$')
+SEPARATOR_RE = re.compile(r'^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$')
+LINK_CELL_RE = re.compile(r'^\[([^\]]+)\]\(([^)\s]+)\)$')
+EMPTY_CELL = '—'
+
+def _hp(data):
+    hp = data.get('hp')
+    return hp.get('average') if isinstance(hp, dict) else hp
+
+# Header (lowercase) -> value of a linked page, from its frontmatter
+COLUMNS = {
+    'cr': lambda data: data.get('cr'),
+    'ac': lambda data: data.get('ac'),
+    'hp': _hp,
+    'rarity': lambda data: data.get('rarity'),
+    'type': lambda data: data.get('creatureType'),
+}
+# Header (lowercase) -> number of pages under a linked folder
+COUNT_COLUMNS = {'items'}
+
+def load_pages():
+    """{route: {'file', 'data', 'index', 'hash'}} for every page of the corpus."""
+    pages = {}
+    for section in SECTIONS:
+        for _, path, data, body in iter_pages(section, include_index=True):
+            pages[page_route(section, path)] = {
+                'file': path.relative_to(ROOT).as_posix(),
+                'data': data,
+                'index': path.name == 'index.mdx',
+                'hash': text_hash(body),
+            }
+    return pages
+
+def _render(value):
+    if value is None or value == '':
+        return None
+    return str(value)
+
+def _split_cells(row):
+    return [cell.strip() for cell in re.split(r'(?<!\\)\|', row.strip()[1:-1])]
+
+def _join_cells(cells):
+    return '| ' + ' | '.join(cells) + ' |'
+
+def _cr_order(value):
+    try:
+        return Fraction(str(value))
+    except (ValueError, ZeroDivisionError):
+        return Fraction(999)
+
+class _Tables:
+    """Values of linked pages for the tables of one index page."""
+
+    def __init__(self, route, pages):
+        self.route = route
+        self.pages = pages
+
+    def target(self, href):
+        target, _ = resolve_link(href, self.route, True)
+        return target if target in self.pages else None
+
+    def value(self, target, column):
+        if column in COUNT_COLUMNS:
+            if not self.pages[target]['index']:
+                return None
+            prefix = target + '/'
+            return str(sum(1 for r, p in self.pages.items()
+                           if r.startswith(prefix) and not p['index']))
+        return _render(COLUMNS[column](self.pages[target]['data']))
+
+    def members(self):
+        """Routes of the pages directly in this index's folder."""
+        prefix = self.route.rstrip('/') + '/'
+        return [r for r, p in self.pages.items()
+                if r.startswith(prefix) and '/' not in r[len(prefix):] and not p['index']]
+
+def regenerate(content, route, pages):
+    """(new content, {target route: {column: value}}) for one index page."""
+    tables = _Tables(route, pages)
+    lines = content.split('\n')
+    deps = {}
+    out = []
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        is_table = (TABLE_ROW_RE.match(line) and i + 1 < len(lines)
+                    and SEPARATOR_RE.match(lines[i + 1]))
+        if not is_table:
+            out.append(line)
+            i += 1
+            continue
+        headers = [h.lower() for h in _split_cells(line)]
+        columns = [(n, h) for n, h in enumerate(headers) if n and (h in COLUMNS or h in COUNT_COLUMNS)]
+        out += [line, lines[i + 1]]
+        i += 2
+        start = i
+        while i < len(lines) and TABLE_ROW_RE.match(lines[i]):
+            i += 1
+        rows = lines[start:i]
+        if not rows and columns:
+            rows = _fill_rows(tables, headers, columns)
+        for row in rows:
+            cells = _split_cells(row)
+            link = LINK_CELL_RE.match(cells[0]) if cells else None
+            target = tables.target(link.group(2)) if link else None
+            if target is None or not columns:
+                out.append(row)
+                continue
+            new_cells = list(cells)
+            title = pages[target]['data'].get('title')
+            if title and link.group(1) != title and link.group(1).lower() == str(title).lower():
+                new_cells[0] = f'[{title}]({link.group(2)})'
+            values = deps.setdefault(target, {})
+            for n, header in columns:
+                value = tables.value(target, header)
+                values[header] = value
+                if value is not None and n < len(new_cells):
+                    new_cells[n] = value
+            out.append(_join_cells(new_cells) if new_cells != cells else row)
+    return '\n'.join(out), deps
+
+def _fill_rows(tables, headers, columns):
+    """Rows for every page in the folder, for a table that has none yet."""
+    members = tables.members()
+    if 'cr' in headers:
+        members.sort(key=lambda r: (_cr_order(tables.pages[r]['data'].get('cr')), r))
+    else:
+        members.sort(key=lambda r: tables.pages[r]['data'].get('title') or r)
+    rows = []
+    for route in members:
+        data = tables.pages[route]['data']
+        slug = route.rsplit('/', 1)[-1]
+        cells = [f"[{data.get('title') or slug_title(slug)}]({slug})"] + [EMPTY_CELL] * (len(headers) - 1)
+        for n, header in columns:
+            cells[n] = tables.value(route, header) or EMPTY_CELL
+        rows.append(_join_cells(cells))
+    return rows
+
+def missing_members(content, route, pages):
+    """Pages of the index's folder that none of its summary tables link to."""
+    tables = _Tables(route, pages)
+    linked = set()
+    for line in content.split('\n'):
+        if TABLE_ROW_RE.match(line):
+            link = LINK_CELL_RE.match(_split_cells(line)[0])
+            if link:
+                linked.add(tables.target(link.group(2)))
+    if not linked & set(tables.members()):
+        return []
+    return [r for r in tables.members() if r not in linked]
+
+def _stale_reason(entry, route, pages):
+    """Why a recorded index needs regenerating, or None."""
+    if entry.get('hash') != pages[route]['hash']:
+        return 'index edited'
+    tables = _Tables(route, pages)
+    members = sorted(tables.members())
+    if entry.get('members') != members:
+        added = [pages[r]['file'] for r in members if r not in entry.get('members', [])]
+        return f"pages added: {', '.join(added)}" if added else 'pages removed'
+    changed = []
+    for target, values in entry['deps'].items():
+        if target not in pages:
+            changed.append(target)
+            continue
+        if any(tables.value(target, column) != value for column, value in values.items()):
+            changed.append(target)
+    return ', '.join(pages[t]['file'] if t in pages else t for t in changed) or None
+
+def update_tables(pages, rebuild=False, write=True):
+    """
+    Regenerate the summary tables of stale indexes; returns one dict per
+    index that was looked at ({'file', 'reason', 'changed', 'missing'}).
+    """
+    cache = {}
+    if not rebuild and CACHE_FILE.exists():
+        with open(CACHE_FILE) as f:
+            data = json.load(f)
+        if data.get('version') == TABLES_VERSION:
+            cache = data['indexes']
+
+    updates = []
+    indexes = {}
+    for route, page in pages.items():
+        if not page['index']:
+            continue
+        entry = cache.get(page['file'])
+        reason = 'new index' if entry is None else _stale_reason(entry, route, pages)
+        if reason is None:
+            indexes[page['file']] = entry
+            continue
+        path = ROOT / page['file']
+        content = path.read_text(encoding='utf-8')
+        new_content, deps = regenerate(content, route, pages)
+        changed = new_content != content
+        if write:
+            if changed:
+                path.write_text(new_content, encoding='utf-8')
+            _, body = split_frontmatter(new_content)
+            indexes[page['file']] = {'hash': text_hash(body), 'deps': deps,
+                                     'members': sorted(_Tables(route, pages).members())}
+        updates.append({'file': page['file'], 'reason': reason, 'changed': changed,
+                        'missing': [pages[r]['file'] for r in missing_members(new_content, route, pages)]})
+
+    if write:
+        CACHE_FILE.parent.mkdir(exist_ok=True)
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({'version': TABLES_VERSION, 'indexes': indexes}, f)
+    return updates
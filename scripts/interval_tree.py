@@ -0,0 +1,102 @@
+"""
+Static interval tree over half-open [start, end) spans.
+
+Intervals are sorted by start and viewed as an implicit balanced binary
+tree (each subrange's midpoint is its root). Every node stores the largest
+end in its subtree, so a query skips any subtree that ends before the query
+starts and any right subtree that starts after it ends. An overlap query
+costs O(log n + k) for k results.
+
+    tree = IntervalTree([(0, 120, 'spellbook/evocation/fireball'), ...])
+    tree.overlapping(100, 200)   # [(0, 120, 'spellbook/evocation/fireball')]
+
+Spans from different source documents live in separate trees (see
+IntervalForest), so adding documents doesn't slow down queries on one.
+"""
+
+class IntervalTree:
+    """Overlap queries over a fixed set of (start, end, payload) intervals."""
+
+    def __init__(self, intervals=()):
+        items = sorted((s, e, p) for s, e, p in intervals if e > s)
+        self.starts = [s for s, _, _ in items]
+        self.ends = [e for _, e, _ in items]
+        self.payloads = [p for _, _, p in items]
+        self.max_end = [0] * len(items)
+        self._build(0, len(items))
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return 0
+        mid = (lo + hi) // 2
+        self.max_end[mid] = max(self.ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        return self.max_end[mid]
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        return iter(zip(self.starts, self.ends, self.payloads))
+
+    def overlapping(self, start, end):
+        """Intervals that share at least one byte with [start, end), in start order."""
+        found = []
+        self._query(0, len(self.starts), start, end, found)
+        return [(self.starts[i], self.ends[i], self.payloads[i]) for i in found]
+
+    def _query(self, lo, hi, start, end, found):
+        if lo >= hi:
+            return
+        mid = (lo + hi) // 2
+        if self.max_end[mid] <= start:
+            return
+        self._query(lo, mid, start, end, found)
+        if self.starts[mid] < end:
+            if self.ends[mid] > start:
+                found.append(mid)
+            self._query(mid + 1, hi, start, end, found)
+
+    def merged(self):
+        """The union of all intervals as sorted, non-overlapping (start, end) pairs."""
+        spans = []
+        for start, end in zip(self.starts, self.ends):
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+        return [tuple(span) for span in spans]
+
+    def gaps(self, start, end):
+        """Sub-spans of [start, end) that no interval covers."""
+        gaps = []
+        pos = start
+        for s, e in self.merged():
+            if e <= pos:
+                continue
+            if s >= end:
+                break
+            if s > pos:
+                gaps.append((pos, s))
+            pos = max(pos, e)
+        if pos < end:
+            gaps.append((pos, end))
+        return gaps
+
+    def covered(self, start, end):
+        """Number of bytes of [start, end) covered by at least one interval."""
+        return (end - start) - sum(e - s for s, e in self.gaps(start, end))
+
+class IntervalForest:
+    """One IntervalTree per source document."""
+
+    def __init__(self, intervals=()):
+        by_source = {}
+        for source, start, end, payload in intervals:
+            by_source.setdefault(source, []).append((start, end, payload))
+        self.trees = {source: IntervalTree(spans) for source, spans in by_source.items()}
+
+    def tree(self, source):
+        return self.trees.get(source) or IntervalTree()
+
+    def overlapping(self, source, start, end):
+        return self.tree(source).overlapping(start, end)
@@ -0,0 +1,153 @@
+"""
+Rule-based magic item classifier.
+
+A layout maps subcategory keys to rules. Each rule is either a name keyword
+matched against the item slug ('boots', 'winged-boots') or a frontmatter
+rule written as 'field:value' ('itemType:shield', 'attunement:true').
+All rules of a layout are compiled into one Aho-Corasick automaton over
+word tokens, so classifying an item is a single pass over its tokens no
+matter how many rules there are.
+
+Matches are whole words (after light plural folding), so 'stone' matches
+'sending-stones' but not 'keystone'. When rules from several subcategories
+match, the winner is picked by rule priority, then by position (the head
+noun comes first in item names: 'necklace-of-prayer-beads'), then by
+length. Every such tie-break is reported as an ambiguity.
+"""
+
+import re
+from collections import deque
+
+# Frontmatter fields that rules can refer to
+RULE_FIELDS = ['category', 'itemType', 'attunement', 'rarity']
+
+BOUNDARY = '|'
+
+def normalize_token(word):
+    """Lowercase and fold simple plurals ('boots' -> 'boot', but 'glass' stays)."""
+    word = word.lower()
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+def _words(text):
+    return [normalize_token(w) for w in re.findall(r'[a-z0-9+]+', str(text).lower())]
+
+def item_tokens(slug, frontmatter=None):
+    """Token stream for an item: slug words, then 'field:word' tokens per field."""
+    tokens = _words(slug)
+    frontmatter = frontmatter or {}
+    for field in RULE_FIELDS:
+        value = frontmatter.get(field)
+        if value is None or value is False:
+            value = 'false' if field == 'attunement' else None
+        elif value is True:
+            value = 'true'
+        if value is None:
+            continue
+        tokens.append(BOUNDARY)
+        if field == 'attunement' and value not in ('true', 'false'):
+            # "Requires attunement by a Wizard" still counts as attunement:true
+            tokens.append('attunement:true')
+        tokens.extend(f"{field.lower()}:{w}" for w in _words(value))
+    return tokens
+
+def rule_tokens(rule):
+    """Tokens for a rule string: 'winged-boots' or 'itemType:half plate'."""
+    if ':' in rule:
+        field, value = rule.split(':', 1)
+        return tuple(f"{field.lower()}:{w}" for w in _words(value))
+    return tuple(_words(rule))
+
+class Automaton:
+    """Aho-Corasick automaton over token sequences."""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+
+    def add(self, tokens, payload):
+        state = 0
+        for token in tokens:
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        self.out[state].append((len(tokens), payload))
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and token not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(token, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+        return self
+
+    def search(self, tokens):
+        """Yield (start, length, payload) for every match."""
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for length, payload in self.out[state]:
+                yield i - length + 1, length, payload
+
+class ItemClassifier:
+    """
+    Classify items into the subcategories of one layout.
+
+    layout is {key: {'title': ..., 'rules': [...], 'priority': int}}.
+    Items that match no rule go to the default key.
+    """
+
+    def __init__(self, layout, default='misc'):
+        self.layout = layout
+        self.default = default
+        self.automaton = Automaton()
+        for key, spec in layout.items():
+            for rule in spec.get('rules', []):
+                self.automaton.add(rule_tokens(rule), (key, rule, spec.get('priority', 0)))
+        self.automaton.build()
+
+    def classify(self, slug, frontmatter=None):
+        """
+        Return (key, matches, ambiguous) for one item.
+
+        matches is a list of (key, rule) pairs, best first; ambiguous is
+        True when rules from more than one subcategory matched.
+        """
+        found = []
+        for start, length, (key, rule, priority) in self.automaton.search(item_tokens(slug, frontmatter)):
+            found.append(((-priority, start, -length), key, rule))
+        if not found:
+            return self.default, [], False
+
+        found.sort()
+        keys = {key for _, key, _ in found}
+        return found[0][1], [(key, rule) for _, key, rule in found], len(keys) > 1
+
+    def classify_all(self, items):
+        """
+        Classify (slug, frontmatter) pairs.
+
+        Returns ({key: [slugs]}, ambiguities) where ambiguities is a list of
+        (slug, chosen key, [(key, rule), ...]).
+        """
+        groups = {key: [] for key in self.layout}
+        groups.setdefault(self.default, [])
+        ambiguities = []
+        for slug, frontmatter in items:
+            key, matches, ambiguous = self.classify(slug, frontmatter)
+            groups.setdefault(key, []).append(slug)
+            if ambiguous:
+                ambiguities.append((slug, key, matches))
+        return groups, ambiguities
@@ -0,0 +1,183 @@
+"""
+Single-pass parser for magic item info lines.
+
+An info line is the italic line under an item heading, e.g.
+
+    Wondrous Item, Uncommon (Requires Attunement)
+    Weapon (Any Simple or Martial), Uncommon (+1), Rare (+2), or Very Rare (+3)
+    Potion, Rarity Varies
+    Ring, Rare (Requires Attunement by a Spellcaster)
+
+parse_info_line() tokenizes the line once with a single compiled regex and
+returns category, item type, rarity, per-variant rarities and attunement
+together. Multi-word tokens ("Very Rare", "Wondrous Item") are matched before
+their substrings, so token order never depends on list order.
+
+expand_variants() turns "+1, +2, or +3" and "Rarity Varies" items into one
+record per variant, each with its own rarity. page_variants() does the same
+for a magicitems/ page, from its frontmatter and body.
+"""
+
+import re
+
+RARITIES = ['Common', 'Uncommon', 'Rare', 'Very Rare', 'Legendary', 'Artifact']
+
+# Info-line category -> magicitems/ folder
+CATEGORY_FOLDERS = {
+    'Armor': 'armor',
+    'Potion': 'potions',
+    'Ring': 'rings',
+    'Rod': 'rods',
+    'Scroll': 'scrolls',
+    'Staff': 'staffs',
+    'Wand': 'wands',
+    'Weapon': 'weapons',
+    'Wondrous Item': 'wondrous-items',
+}
+
+TOKEN_RE = re.compile(r'''
+    (?P<attune>\(\s*requires\s+attunement(?:\s+by\s+(?:an?\s+)?(?P<attune_by>[^)]+?))?\s*\))
+  | (?P<bonus>\(\s*\+(?P<bonus_n>\d)\s*\))
+  | (?P<paren>\((?P<paren_text>[^)]*)\))
+  | (?P<varies>\brarity\s+varies\b)
+  | (?P<rarity>\bvery\s+rare\b|\buncommon\b|\bcommon\b|\brare\b|\blegendary\b|\bartifact\b)
+  | (?P<category>\bwondrous\s+item\b|\barmor\b|\bpotion\b|\bring\b|\brod\b|\bscroll\b|\bstaff\b|\bwand\b|\bweapon\b)
+  | (?P<skip>[\s,*_]+|\bor\b)
+  | (?P<other>[^\s,()]+)
+''', re.IGNORECASE | re.VERBOSE)
+
+_RARITY_NAMES = {r.lower(): r for r in RARITIES}
+_CATEGORY_NAMES = {c.lower(): c for c in CATEGORY_FOLDERS}
+
+# "Armor, +1, +2, or +3" / "Wand of the War Mage, +1, +2, or +3"
+BONUS_FAMILY_RE = re.compile(r',\s*\+1,\s*\+2,\s*or\s*\+3$')
+
+def _canonical(text, names):
+    return names[re.sub(r'\s+', ' ', text.lower())]
+
+def parse_info_line(info_line):
+    """
+    Parse an item info line into a dict with keys:
+
+        category     display category ("Wondrous Item"), or None
+        folder       magicitems/ folder ("wondrous-items")
+        itemType     parenthesized subtype after the category, or None
+        rarity       the item's rarity, or the lowest variant rarity
+        variants     [{'bonus': 1, 'rarity': 'Uncommon'}, ...] for +N families
+        rarityVaries True for "Rarity Varies" items
+        attunement   False, True, or the requirement string
+    """
+    info = {
+        'category': None,
+        'folder': 'wondrous-items',
+        'itemType': None,
+        'rarity': None,
+        'variants': [],
+        'rarityVaries': False,
+        'attunement': False,
+    }
+    last = None  # kind of the previous meaningful token
+
+    for match in TOKEN_RE.finditer(info_line.strip().strip('*_')):
+        kind = match.lastgroup
+        if kind in ('skip', 'attune_by', 'bonus_n', 'paren_text'):
+            continue
+        if kind == 'category' and info['category'] is None:
+            info['category'] = _canonical(match.group('category'), _CATEGORY_NAMES)
+            info['folder'] = CATEGORY_FOLDERS[info['category']]
+        elif kind == 'paren' and last == 'category' and info['itemType'] is None:
+            info['itemType'] = match.group('paren_text').strip()
+        elif kind == 'rarity':
+            rarity = _canonical(match.group('rarity'), _RARITY_NAMES)
+            info['variants'].append({'bonus': None, 'rarity': rarity})
+        elif kind == 'bonus' and last == 'rarity':
+            info['variants'][-1]['bonus'] = int(match.group('bonus_n'))
+        elif kind == 'varies':
+            info['rarityVaries'] = True
+        elif kind == 'attune':
+            by = match.group('attune_by')
+            info['attunement'] = by.strip() if by else True
+        last = kind
+
+    if info['variants']:
+        info['rarity'] = info['variants'][0]['rarity']
+    # A single plain rarity isn't a variant list
+    if len(info['variants']) == 1 and info['variants'][0]['bonus'] is None:
+        info['variants'] = []
+    return info
+
+def _table_variants(name, description):
+    """Read (variant name, rarity) rows from a markdown table with a Rarity column."""
+    variants = []
+    rarity_col = name_col = None
+    prefix = name.split()[0].lower().rstrip('s')
+    for line in description.split('\n'):
+        line = line.strip()
+        if not line.startswith('|'):
+            rarity_col = None
+            continue
+        cells = [c.strip() for c in line.strip('|').split('|')]
+        if rarity_col is None:
+            lowered = [c.lower() for c in cells]
+            if 'rarity' in lowered:
+                rarity_col = lowered.index('rarity')
+                # First column that is neither a die roll nor the rarity
+                name_col = next(
+                    (i for i, c in enumerate(lowered) if i != rarity_col and not re.fullmatch(r'\d*d\d+', c)),
+                    0,
+                )
+            continue
+        if set(''.join(cells)) <= set('-: '):
+            continue  # separator row
+        if rarity_col < len(cells) and cells[rarity_col].lower() in _RARITY_NAMES:
+            label = cells[name_col]
+            # "Anchor" -> "Feather Token (Anchor)", but keep "Potion of Healing (greater)"
+            if not label.lower().startswith(prefix):
+                label = f"{name} ({label})"
+            variants.append((label, _canonical(cells[rarity_col], _RARITY_NAMES)))
+    return variants
+
+def expand_variants(name, info, description=''):
+    """
+    Expand an item into per-variant records.
+
+    Returns a list of {'name', 'rarity', 'bonus'} dicts: one per +N variant,
+    one per row of a rarity table for "Rarity Varies" items, or a single
+    record for ordinary items.
+    """
+    bonus_variants = [v for v in info['variants'] if v['bonus'] is not None]
+    if bonus_variants:
+        base = BONUS_FAMILY_RE.sub('', name)
+        return [
+            {'name': f"{base}, +{v['bonus']}", 'rarity': v['rarity'], 'bonus': v['bonus']}
+            for v in bonus_variants
+        ]
+
+    if info['rarityVaries'] or not info['rarity']:
+        rows = _table_variants(name, description)
+        if rows:
+            return [{'name': row_name, 'rarity': rarity, 'bonus': None} for row_name, rarity in rows]
+
+    return [{'name': name, 'rarity': info['rarity'], 'bonus': None}]
+
+def page_variants(data, body=''):
+    """
+    Per-variant records of a magicitems/ page, as expand_variants() returns
+    them. The `variants` frontmatter written by import-magic-items.py is
+    used when present. Otherwise they are derived from the page: a "+1, +2,
+    or +3" family steps up one rarity per bonus from the page's rarity (as
+    every such family in the SRD does), and an item without a rarity reads
+    its variants from the rarity table in its body.
+    """
+    if data.get('variants'):
+        return [{'name': v.get('name'), 'rarity': v.get('rarity'), 'bonus': v.get('bonus')}
+                for v in data['variants']]
+
+    title = data.get('title') or ''
+    rarity = data.get('rarity')
+    info = {'rarity': rarity, 'variants': [], 'rarityVaries': not rarity}
+    if rarity in RARITIES and BONUS_FAMILY_RE.search(title):
+        lowest = RARITIES.index(rarity)
+        if lowest + 2 < len(RARITIES):
+            info['variants'] = [{'bonus': n, 'rarity': RARITIES[lowest + n - 1]} for n in (1, 2, 3)]
+    return expand_variants(title, info, body)
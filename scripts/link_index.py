@@ -0,0 +1,206 @@
+"""
+Reverse link index: which pages link to a route, and where.
+
+Every internal link of every page ([text](/bestiary/fiend/imp), relative
+[text](bone-devil) and href="..." props, with or without a #fragment) is
+resolved to the route it points at the way validate-links.mjs does. Links
+in code fences and `inline code` are examples and are skipped. The index
+is kept in .cache/link-index.json, both ways round: the links of each
+page, and for each target route the pages, lines and columns that link to
+it. A refresh stats every page and parses only those whose size or mtime
+changed:
+
+    links = LinkIndex.load()
+    links.inbound['/bestiary/fiend/devils/imp']   # [['bestiary/fiend/devils/index.mdx', 17, 9, 'imp']]
+
+Before pages move, rewrite_links() fixes exactly the links that the move
+would break, each affected file written once: links to a moved page, and
+relative links on a moved page whose base directory changes. Absolute links
+stay absolute, relative ones are made relative to their page's new place,
+and fragments are kept:
+
+    links = LinkIndex.load()
+    moves = [(old_path, new_path), ...]
+    rewritten = rewrite_links(links, moves)
+    ...move the pages...
+"""
+
+import json
+import os
+import posixpath
+import re
+
+from corpus import ROOT, SECTIONS
+from heading_index import FENCE_RE, page_route, resolve_link
+
+CACHE_FILE = ROOT / '.cache' / 'link-index.json'
+# Bump when link extraction or resolution changes
+INDEX_VERSION = 2
+
+MD_LINK_RE = re.compile(r'\]\(([^)\s"]+)(?:\s+"[^"]*")?\)')
+JSX_HREF_RE = re.compile(r'href="([^"]+)"')
+EXTERNAL_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|#)', re.IGNORECASE)
+ASSET_RE = re.compile(r'\.(png|jpg|jpeg|gif|svg|webp|ico|pdf|css|js)$', re.IGNORECASE)
+CODE_SPAN_RE = re.compile(r'`[^`]*`')
+
+def file_route(rel):
+    """(route, is_index) of a page file given relative to ROOT."""
+    section = rel.split('/', 1)[0]
+    return page_route(section, ROOT / rel), rel.endswith('/index.mdx')
+
+def page_links(content, route, is_index):
+    """
+    [line, column, href, target route] of every internal link in a page.
+    Code fences and inline code are skipped, so examples aren't rewritten.
+    """
+    links = []
+    in_fence = False
+    for line_no, line in enumerate(content.split('\n'), 1):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+        # Mask code spans with NULs so columns stay right
+        line = CODE_SPAN_RE.sub(lambda m: '\0' * len(m.group()), line)
+        for pattern in (MD_LINK_RE, JSX_HREF_RE):
+            for match in pattern.finditer(line):
+                href = match.group(1)
+                if EXTERNAL_RE.match(href) or ASSET_RE.search(href.partition('#')[0]):
+                    continue
+                target, _ = resolve_link(href, route, is_index)
+                links.append([line_no, match.start(1) + 1, href, target])
+    return links
+
+class LinkIndex:
+    """Links of every page, and the pages linking to every route."""
+
+    def __init__(self, pages=None):
+        # {file: {'route', 'size', 'mtime', 'links'}}
+        self.pages = pages or {}
+        self.inbound = {}
+        self._invert()
+
+    @classmethod
+    def load(cls, rebuild=False):
+        """The index from .cache/link-index.json, refreshed and saved."""
+        pages = {}
+        if not rebuild and CACHE_FILE.exists():
+            with open(CACHE_FILE) as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                pages = data['pages']
+        index = cls(pages)
+        if index.refresh():
+            index.save()
+        return index
+
+    def refresh(self):
+        """Reparse pages added or changed on disk and drop deleted ones; returns the files parsed or dropped."""
+        seen = set()
+        parsed = []
+        for section in SECTIONS:
+            for dirpath, dirnames, filenames in os.walk(ROOT / section):
+                dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+                for name in filenames:
+                    if not name.endswith('.mdx'):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    rel = os.path.relpath(path, ROOT).replace(os.sep, '/')
+                    seen.add(rel)
+                    st = os.stat(path)
+                    entry = self.pages.get(rel)
+                    if entry and entry['size'] == st.st_size and entry['mtime'] == st.st_mtime_ns:
+                        continue
+                    self._parse(rel, st)
+                    parsed.append(rel)
+        gone = [rel for rel in self.pages if rel not in seen]
+        for rel in gone:
+            del self.pages[rel]
+        if parsed or gone:
+            self._invert()
+        return parsed + gone
+
+    def _parse(self, rel, st=None):
+        st = st or os.stat(ROOT / rel)
+        route, is_index = file_route(rel)
+        content = (ROOT / rel).read_text(encoding='utf-8')
+        self.pages[rel] = {'route': route, 'size': st.st_size, 'mtime': st.st_mtime_ns,
+                           'links': page_links(content, route, is_index)}
+
+    def _invert(self):
+        self.inbound = {}
+        for rel, page in sorted(self.pages.items()):
+            for line, column, href, target in page['links']:
+                self.inbound.setdefault(target, []).append([rel, line, column, href])
+
+    def routes(self):
+        return {page['route'] for page in self.pages.values()}
+
+    def save(self):
+        CACHE_FILE.parent.mkdir(exist_ok=True)
+        with open(CACHE_FILE, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'pages': self.pages, 'inbound': self.inbound}, f)
+
+def _relative_href(target, base, old_href):
+    rel = posixpath.relpath(target, base)
+    if old_href.startswith('./') and not rel.startswith('../'):
+        rel = './' + rel
+    return rel
+
+def planned_rewrites(links, moves):
+    """
+    {file: [(line, column, old href, new href)]} for the links that the
+    moves ([(old path, new path)] of page files) would break. Files are
+    named by where they are before the move.
+    """
+    files = {}
+    for old, new in moves:
+        files[os.path.relpath(old, ROOT).replace(os.sep, '/')] = os.path.relpath(new, ROOT).replace(os.sep, '/')
+    routes = {file_route(old)[0]: file_route(new)[0] for old, new in files.items()}
+    existing = links.routes()
+
+    # Pages linking to a moved page, and the moved pages themselves
+    sources = {rel for route in routes for rel, *_ in links.inbound.get(route, [])}
+    sources |= set(files) & set(links.pages)
+
+    rewrites = {}
+    for rel in sorted(sources):
+        new_route, is_index = file_route(files.get(rel, rel))
+        base = new_route if is_index else posixpath.dirname(new_route)
+        for line, column, href, target in links.pages[rel]['links']:
+            # Links that were already broken are left for validate-links.mjs
+            if target not in existing:
+                continue
+            new_target = routes.get(target, target)
+            path, hash_, fragment = href.partition('#')
+            if resolve_link(path, new_route, is_index)[0] == new_target:
+                continue
+            if path.startswith('/'):
+                new_path = new_target
+            else:
+                new_path = _relative_href(new_target, base, path)
+            rewrites.setdefault(rel, []).append((line, column, href, new_path + hash_ + fragment))
+    return rewrites
+
+def rewrite_links(links, moves):
+    """
+    Rewrite the links that moves would break, before the pages are moved;
+    returns {file: number of links rewritten}.
+    """
+    done = {}
+    for rel, edits in planned_rewrites(links, moves).items():
+        path = ROOT / rel
+        lines = path.read_text(encoding='utf-8').split('\n')
+        count = 0
+        # Right to left, so earlier columns on a line stay valid
+        for line, column, old, new in sorted(edits, reverse=True):
+            text = lines[line - 1]
+            start = column - 1
+            if text[start:start + len(old)] != old:
+                raise RuntimeError(f"{rel}:{line}: expected {old!r}, the link index is stale")
+            lines[line - 1] = text[:start] + new + text[start + len(old):]
+            count += 1
+        path.write_text('\n'.join(lines), encoding='utf-8')
+        done[rel] = count
+    return done
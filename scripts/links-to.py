@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+List the pages that link to a page, from the reverse link index.
+
+The index (see link_index.py) is refreshed first: pages are stat'ed and
+only the ones edited since the last run are parsed again, so a lookup
+doesn't grep the corpus.
+
+Usage:
+  python scripts/links-to.py TARGET ... [--rebuild]
+
+TARGET is a route (/bestiary/fiend/devils/imp) or a page file
+(bestiary/fiend/devils/imp.mdx). --rebuild ignores .cache/link-index.json
+and parses every page. Exits 1 if a target has no page.
+"""
+
+import argparse
+import sys
+import time
+
+from link_index import LinkIndex, file_route
+
+def main():
+    parser = argparse.ArgumentParser(description='List the links to a page.')
+    parser.add_argument('targets', nargs='+', help='routes or page files')
+    parser.add_argument('--rebuild', action='store_true', help='parse every page again')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    links = LinkIndex.load(args.rebuild)
+    elapsed = time.perf_counter() - started
+
+    routes = links.routes()
+    status = 0
+    for target in args.targets:
+        route = file_route(target)[0] if target.endswith('.mdx') else target.rstrip('/') or '/'
+        if route not in routes:
+            print(f"{target}: no such page")
+            status = 1
+            continue
+        inbound = links.inbound.get(route, [])
+        print(f"{route} ({len(inbound)} link{'s' if len(inbound) != 1 else ''}):")
+        for rel, line, column, href in inbound:
+            print(f"  {rel}:{line}:{column}  {href}")
+
+    print(f"\nIndexed {len(links.pages)} pages in {elapsed:.2f}s")
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Lint pages against the conventions in content/style-guide.mdx.
+
+Headings (no body H1, no skipped levels, Title Case, no trailing
+punctuation), bold lead-ins (**Name.**), table shape (edge pipes, separator
+row, column counts, em dash for empty cells), en dashes in numeric ranges,
+whitespace and frontmatter titles. All rules run in one read of each page,
+pages in parallel; see content_lint.py for the rule list.
+
+Usage:
+  python scripts/lint-content.py [SECTION | FILE.mdx ...] [--rule RULE]
+                                 [--fix] [--workers N] [--format text|json]
+
+SECTION is a content dir (content, spellbook, bestiary, magicitems; default
+all). --rule limits the run to one rule or rule family (heading, table/...)
+and can be repeated. --fix applies the fixes rules offer and reports what
+is left. Exits 1 when errors remain.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from content_lint import RULES, lint_tree, page_files
+from corpus import SECTIONS
+
+def main():
+    parser = argparse.ArgumentParser(description='Lint pages against the style guide.')
+    parser.add_argument('targets', nargs='*', help='section dirs or .mdx files (default: all)')
+    parser.add_argument('--rule', action='append', help='rule or rule family to check')
+    parser.add_argument('--fix', action='store_true', help='apply fixes')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args()
+
+    rules = None
+    if args.rule:
+        rules = {r for r in RULES if any(r == sel or r.startswith(sel.rstrip('/') + '/')
+                                         for sel in args.rule)}
+        if not rules:
+            parser.error(f"no rule matches {', '.join(args.rule)} (rules: {', '.join(RULES)})")
+
+    sections = [t for t in args.targets if not t.endswith('.mdx')]
+    unknown = [s for s in sections if s not in SECTIONS]
+    if unknown:
+        parser.error(f"not a content section: {', '.join(unknown)}")
+    files = [str(Path(t).resolve()) for t in args.targets if t.endswith('.mdx')]
+    if sections or not files:
+        files += page_files(sections or None)
+
+    started = time.perf_counter()
+    results, fixed = lint_tree(files, rules, args.fix, args.workers)
+    elapsed = time.perf_counter() - started
+    errors = [r for r in results if r['level'] == 'error']
+
+    if args.format == 'json':
+        print(json.dumps({'checked': len(files), 'fixed': fixed, 'results': results}, indent=2))
+        return 1 if errors else 0
+
+    for r in results:
+        fixable = ' (fixable)' if 'fix' in r else ''
+        print(f"{r['file']}:{r['line']}:{r['column']}: {r['level']} [{r['rule']}] {r['message']}{fixable}")
+
+    counts = Counter(r['rule'] for r in results)
+    if counts:
+        print()
+        for rule, n in counts.most_common():
+            print(f"  {n:5}  {rule}")
+    if fixed:
+        print(f"\nApplied {fixed} fixes")
+    summary = f"{len(files)} pages in {elapsed:.2f}s"
+    if results:
+        print(f"\n{len(results)} problems ({len(errors)} errors) in {summary}")
+    else:
+        print(f"✓ All pages follow the style guide ({summary})")
+    return 1 if errors else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Manage the import source registry (scripts/sources.json).
+
+Usage:
+  python scripts/manage-sources.py list
+  python scripts/manage-sources.py verify
+  python scripts/manage-sources.py register NAME PATH [--format F] [--member M]
+
+list shows every source and whether it is present; verify recomputes
+checksums and compares them with the pinned ones; register points a source
+at a file or archive member and pins its checksum.
+"""
+
+import argparse
+import sys
+
+from sources import FORMATS, SourceError, get_source, load_registry, register, source_digest
+
+def cmd_list(args):
+    for name in load_registry():
+        entry = get_source(name)
+        location = entry['path'] + (f" :: {entry['member']}" if entry.get('member') else '')
+        status = 'ok' if entry['abspath'].exists() else 'missing'
+        pinned = (entry.get('sha256') or 'unpinned')[:12]
+        print(f"{name:22} {entry['format']:5} {pinned:12} {status:8} {location}")
+
+def cmd_verify(args):
+    failed = 0
+    for name in load_registry():
+        entry = get_source(name)
+        try:
+            digest = source_digest(name)
+        except SourceError as e:
+            print(f"MISSING  {e}")
+            failed += 1
+            continue
+        if not entry.get('sha256'):
+            print(f"UNPINNED {name} ({digest[:12]})")
+        elif entry['sha256'] != digest:
+            print(f"CHANGED  {name} (registry {entry['sha256'][:12]}, file {digest[:12]})")
+            failed += 1
+        else:
+            print(f"OK       {name}")
+    sys.exit(1 if failed else 0)
+
+def cmd_register(args):
+    try:
+        entry = register(args.name, args.path, args.format, args.member)
+    except SourceError as e:
+        print(e)
+        sys.exit(1)
+    print(f"Registered {args.name}: {entry['path']} ({entry['format']}) {entry['sha256']}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the import source registry.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('list')
+    sub.add_parser('verify')
+    reg = sub.add_parser('register')
+    reg.add_argument('name')
+    reg.add_argument('path')
+    reg.add_argument('--format', choices=FORMATS)
+    reg.add_argument('--member', help='file inside a zip or tar archive')
+    args = parser.parse_args()
+
+    {'list': cmd_list, 'verify': cmd_verify, 'register': cmd_register}[args.command](args)
+
+if __name__ == '__main__':
+    main()
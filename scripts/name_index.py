@@ -0,0 +1,104 @@
+"""
+Fuzzy name index for pairing corpus entries with SRD entries.
+
+Names are normalized (case, accents, punctuation, "+1, +2, or +3" spacing)
+and indexed by character trigrams in an inverted index. A lookup only scores
+the SRD names that share at least one trigram with the query, so matching
+every corpus page against the SRD stays far below difflib's all-pairs cost.
+
+    index = NameIndex(srd_items)          # {name: payload}
+    match = index.resolve("Armor +1, +2 or +3")
+    match.name, match.score, match.exact  # ('Armor, +1, +2, or +3', 1.0, True)
+"""
+
+import re
+import unicodedata
+from collections import Counter, namedtuple
+
+Match = namedtuple('Match', ['name', 'payload', 'score', 'exact'])
+
+# Minimum Dice coefficient for a fuzzy match to count
+DEFAULT_THRESHOLD = 0.6
+
+def normalize_name(name):
+    """Normalize a name for comparison: 'Will-o'-Wisp' -> 'will o wisp'."""
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = name.lower().replace('’', "'")
+    name = re.sub(r"[*_`]", '', name)
+    name = re.sub(r"'", '', name)
+    name = re.sub(r'[^a-z0-9+]+', ' ', name)
+    return name.strip()
+
+def trigrams(normalized):
+    """Character trigrams of a normalized name, padded at word edges."""
+    padded = f"  {normalized} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+class NameIndex:
+    """Exact and trigram lookup over a {name: payload} mapping."""
+
+    def __init__(self, entries=None, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.names = []
+        self.payloads = []
+        self.exact = {}
+        self.grams = {}
+        self.sizes = []
+        for name, payload in (entries or {}).items():
+            self.add(name, payload)
+
+    def add(self, name, payload=None):
+        """Add a name. Aliases can be added by calling add() with the same payload."""
+        normalized = normalize_name(name)
+        idx = len(self.names)
+        self.names.append(name)
+        self.payloads.append(payload)
+        self.exact.setdefault(normalized, idx)
+        grams = set(trigrams(normalized))
+        self.sizes.append(len(grams))
+        for gram in grams:
+            self.grams.setdefault(gram, []).append(idx)
+
+    def lookup(self, query, limit=3):
+        """Return up to `limit` Matches for a query, best first."""
+        normalized = normalize_name(query)
+        if normalized in self.exact:
+            idx = self.exact[normalized]
+            return [Match(self.names[idx], self.payloads[idx], 1.0, True)]
+
+        grams = set(trigrams(normalized))
+        shared = Counter()
+        for gram in grams:
+            for idx in self.grams.get(gram, ()):
+                shared[idx] += 1
+
+        scored = []
+        for idx, count in shared.items():
+            # Dice coefficient over trigram sets
+            score = 2 * count / (len(grams) + self.sizes[idx])
+            scored.append((score, idx))
+        scored.sort(key=lambda s: (-s[0], self.names[s[1]]))
+        return [Match(self.names[idx], self.payloads[idx], round(score, 3), False)
+                for score, idx in scored[:limit]]
+
+    def resolve(self, *queries):
+        """
+        Return the best Match for the first query that clears the threshold.
+
+        Pass alternate names (e.g. a path-derived name after the title) as
+        further queries; an exact hit on any of them wins over fuzzy hits.
+        """
+        best = None
+        for query in queries:
+            if not query:
+                continue
+            matches = self.lookup(query, limit=1)
+            if not matches:
+                continue
+            match = matches[0]
+            if match.exact:
+                return match
+            if match.score >= self.threshold and (best is None or match.score > best.score):
+                best = match
+        return best
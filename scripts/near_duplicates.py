@@ -0,0 +1,157 @@
+"""
+Near-duplicate detection over page bodies with MinHash and LSH.
+
+Each document (a page body, or one paragraph of it) becomes the set of its
+word shingles (SHINGLE_SIZE words, normalized like body_verify.py). Its
+MinHash signature is computed with one permutation hashing: every shingle
+is hashed once, the hash's low bits pick one of NUM_BINS bins and the rest
+is kept if it is the smallest seen in that bin. Empty bins borrow from the
+next filled bin (rotation densification), so short documents still compare
+correctly. The cost is one hash per shingle instead of one per shingle and
+permutation.
+
+Signatures are split into BANDS bands of ROWS values. Documents sharing any
+band land in the same LSH bucket and become candidate pairs; the share of
+equal signature values estimates their Jaccard similarity, and pairs at or
+above the threshold are merged into clusters with union-find. Only
+candidates are compared, so the run is roughly linear in the corpus size.
+
+    index = LshIndex()
+    for key, words in documents:
+        index.add(key, signature(shingle_hashes(words)))
+    for cluster in index.clusters(0.5): ...
+"""
+
+import hashlib
+import re
+from collections import defaultdict
+
+from body_verify import WORD_RE, normalize, page_lines
+
+SHINGLE_SIZE = 4
+NUM_BINS = 128
+BIN_BITS = 7  # log2(NUM_BINS)
+# 32 bands of 4 rows: pairs around Jaccard 0.42 collide half the time
+BANDS = 32
+ROWS = 4
+# Offset added per bin skipped when an empty bin borrows a value
+DENSIFY_STEP = 1 << (64 - BIN_BITS)
+EMPTY = 1 << 64
+# Buckets larger than this are linked as a star instead of all pairs
+MAX_BUCKET = 64
+
+# Paragraphs shorter than this are headings, captions and table rows
+MIN_PARAGRAPH_WORDS = 20
+SKIP_BLOCK_RE = re.compile(r'^\s*(?:\||import\s|export\s|<[A-Za-z/]|```|---\s*$)')
+
+def words(text_lines):
+    """Normalized words of plain-text lines."""
+    return WORD_RE.findall(normalize(' '.join(text_lines)))
+
+def shingle_hashes(tokens):
+    """64-bit hashes of the word shingles of a token list (stable across runs)."""
+    hashes = set()
+    for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1)):
+        shingle = ' '.join(tokens[i:i + SHINGLE_SIZE]).encode('utf-8')
+        hashes.add(int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), 'big'))
+    return hashes
+
+def signature(hashes):
+    """Densified one-permutation MinHash signature of a set of shingle hashes."""
+    sig = [EMPTY] * NUM_BINS
+    for h in hashes:
+        b = h & (NUM_BINS - 1)
+        v = h >> BIN_BITS
+        if v < sig[b]:
+            sig[b] = v
+    if all(v == EMPTY for v in sig):
+        return sig
+    for i in range(NUM_BINS):
+        step = 1
+        while sig[i] == EMPTY:
+            borrowed = sig[(i + step) % NUM_BINS]
+            if borrowed < DENSIFY_STEP:
+                sig[i] = borrowed + step * DENSIFY_STEP
+            step += 1
+    return sig
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+class LshIndex:
+    """Banded LSH buckets over MinHash signatures."""
+
+    def __init__(self):
+        self.signatures = {}
+        self.buckets = defaultdict(list)
+
+    def add(self, key, sig):
+        self.signatures[key] = sig
+        for band in range(BANDS):
+            rows = tuple(sig[band * ROWS:(band + 1) * ROWS])
+            self.buckets[(band, rows)].append(key)
+
+    def candidate_pairs(self):
+        pairs = set()
+        for keys in self.buckets.values():
+            if len(keys) < 2:
+                continue
+            if len(keys) > MAX_BUCKET:
+                # Boilerplate buckets: a star around the first key keeps the
+                # cluster connected without comparing every pair
+                others = [(keys[0], b) for b in keys[1:]]
+            else:
+                others = [(a, b) for i, a in enumerate(keys) for b in keys[i + 1:]]
+            pairs.update((a, b) if a < b else (b, a) for a, b in others)
+        return pairs
+
+    def similar_pairs(self, threshold):
+        """{(a, b): estimated similarity} for candidate pairs at or above threshold."""
+        found = {}
+        for a, b in self.candidate_pairs():
+            sim = similarity(self.signatures[a], self.signatures[b])
+            if sim >= threshold:
+                found[(a, b)] = sim
+        return found
+
+    def clusters(self, threshold):
+        """Clusters of keys linked by similar pairs, as (sorted keys, pair similarities)."""
+        pairs = self.similar_pairs(threshold)
+        parent = {}
+
+        def find(k):
+            while parent.get(k, k) != k:
+                k = parent[k]
+            return k
+
+        for a, b in pairs:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+        groups = defaultdict(list)
+        for key in {k for pair in pairs for k in pair}:
+            groups[find(key)].append(key)
+        result = []
+        for keys in groups.values():
+            members = set(keys)
+            sims = [s for (a, b), s in pairs.items() if a in members]
+            result.append((sorted(keys), sims))
+        result.sort(key=lambda c: (-len(c[0]), c[0]))
+        return result
+
+def paragraphs(body, first_line):
+    """(line number, plain text lines) of each prose paragraph of a page body."""
+    blocks = []
+    current = []
+    start = first_line
+    for offset, line in enumerate(body.split('\n') + ['']):
+        if line.strip():
+            if not current:
+                start = first_line + offset
+            current.append(line)
+            continue
+        if current and not SKIP_BLOCK_RE.match(current[0]):
+            blocks.append((start, page_lines('\n'.join(current))))
+        current = []
+    return blocks
@@ -0,0 +1,121 @@
+"""
+SRD byte spans each page was derived from.
+
+Spell, monster and magic item pages whose name matches an SRD entity
+exactly cover that entity's whole span, stat block and header lines
+included. Every other page (and any fuzzy name pairing, which could claim
+the wrong entity) is located by its sentences:
+each SRD line is indexed by the hashes of its normalized sentences (see
+body_verify.py), page sentences that occur exactly once in the SRD anchor
+the lines they come from, and runs of anchored lines a few lines apart
+become spans.
+
+Spans are cached per page in .cache/srd-coverage-<source>.json with the
+page's hash and the source checksum, so only edited pages are located
+again.
+
+    spans = page_spans('srd-text')   # {'content/feats': [(start, end), ...]}
+"""
+
+import json
+from collections import Counter
+
+from bestiary_names import get_monster_name
+from body_verify import page_lines, sentences
+from corpus import ROOT, SECTIONS, iter_pages
+from name_index import NameIndex
+from sources import source_digest
+from srd_index import SrdIndex, iter_lines
+from verification_cache import file_hash
+
+CACHE_DIR = ROOT / '.cache'
+# Bump when pairing or anchoring rules change
+SPANS_VERSION = 2
+# Anchored lines at most this many lines apart belong to the same span
+MAX_GAP_LINES = 3
+# A lone shared sentence (boilerplate like "Make a ranged spell attack against
+# the target.") doesn't make a span
+MIN_ANCHORS = 2
+
+# section: (entity kind, SRD chapters) for sections paired with SRD entities
+SECTION_KINDS = {
+    'spellbook': ('spell', ['spells']),
+    'magicitems': ('item', ['magic-items']),
+    'bestiary': ('monster', ['monsters', 'animals']),
+}
+
+def page_names(section, page, data):
+    """Names to try when pairing a page with an SRD entity."""
+    if section == 'bestiary':
+        return get_monster_name(f'bestiary/{page}.mdx'), data.get('title')
+    return (data.get('title'),)
+
+def entity_index(srd, section):
+    """NameIndex over the SRD entities a section's pages pair with."""
+    kind, chapters = SECTION_KINDS[section]
+    entities = {}
+    for chapter in chapters:
+        for entity in srd.entities(kind=kind, chapter=chapter):
+            entities.setdefault(entity.name, entity)
+    return NameIndex(entities)
+
+class SentenceAnchors:
+    """Lines of an SRD source indexed by the sentences that occur once in it."""
+
+    def __init__(self, srd):
+        self.lines = []
+        occurrences = {}
+        counts = Counter()
+        for offset, line in iter_lines(srd.buffer):
+            idx = len(self.lines)
+            self.lines.append((offset, offset + len(line)))
+            for sentence in sentences([line.decode('utf-8', 'replace')]):
+                counts[sentence] += 1
+                occurrences[sentence] = idx
+        self.unique = {s: idx for s, idx in occurrences.items() if counts[s] == 1}
+
+    def spans(self, body):
+        """Byte spans of the SRD lines a page body's sentences come from."""
+        anchored = sorted({self.unique[s] for s in sentences(page_lines(body)) if s in self.unique})
+        groups = []
+        for idx in anchored:
+            if groups and idx - groups[-1][-1] <= MAX_GAP_LINES:
+                groups[-1].append(idx)
+            else:
+                groups.append([idx])
+        return [(self.lines[g[0]][0], self.lines[g[-1]][1]) for g in groups if len(g) >= MIN_ANCHORS]
+
+def page_spans(source='srd-text', rebuild=False):
+    """{'section/page': [(start, end)]} for every page that overlaps the source."""
+    digest = source_digest(source)
+    cache_file = CACHE_DIR / f'srd-coverage-{source}.json'
+    cached = {}
+    if not rebuild and cache_file.exists():
+        with open(cache_file) as f:
+            data = json.load(f)
+        if data.get('sha256') == digest and data.get('version') == SPANS_VERSION:
+            cached = data['pages']
+
+    srd = SrdIndex.load(source)
+    anchors = None
+    pages = {}
+    for section in SECTIONS:
+        index = entity_index(srd, section) if section in SECTION_KINDS else None
+        for page, path, data, body in iter_pages(section, include_index=True):
+            key = f'{section}/{page or "index"}'
+            page_hash = file_hash(path)
+            if key in cached and cached[key]['pageHash'] == page_hash:
+                pages[key] = cached[key]
+                continue
+            match = index.resolve(*page_names(section, page, data)) if index else None
+            if match and match.exact:
+                spans = [(match.payload.start, match.payload.end)]
+            else:
+                anchors = anchors or SentenceAnchors(srd)
+                spans = anchors.spans(body)
+            pages[key] = {'pageHash': page_hash, 'spans': spans}
+
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(cache_file, 'w') as f:
+        json.dump({'version': SPANS_VERSION, 'sha256': digest, 'pages': pages}, f)
+    return {key: [tuple(s) for s in entry['spans']] for key, entry in pages.items() if entry['spans']}
@@ -0,0 +1,298 @@
+"""
+Random tables compiled into alias-method samplers.
+
+Two kinds of table can be compiled:
+
+- dN tables in a markdown page: a table whose first header cell is a die
+  ("d100", "1d8") and whose rows start with a roll or a range ("01–20",
+  "91–00", "7"). Each row is weighted by the size of its range.
+- Magic item queries such as "Rare, non-attunement, category Potion",
+  matched against magicitems/ frontmatter. +1/+2/+3 families and rarity
+  tables are expanded into their variants first, so a Rare query can roll
+  "Armor, +1".
+
+Compiled tables are Walker/Vose alias samplers, so each roll costs one
+random number and one table lookup regardless of table size, and
+sample(n) produces n rolls in a single call for treasure generation and
+simulation.
+
+Compiled tables are cached in .cache/random-tables.pickle, keyed on the
+size and modification time of their source pages, and rebuilt only when a
+source page changes.
+"""
+
+import os
+import pickle
+import random
+import re
+from collections import namedtuple
+from pathlib import Path
+
+from corpus import ROOT, iter_pages, split_frontmatter
+from item_info import RARITIES, page_variants
+
+CACHE_FILE = ROOT / '.cache' / 'random-tables.pickle'
+# Bump when the compiled format or the item records change
+CACHE_VERSION = 2
+
+DIE_RE = re.compile(r'^(\d*)d(\d+)$', re.IGNORECASE)
+ROLL_RE = re.compile(r'^(\d+)(?:\s*[–-]\s*(\d+))?$')
+HEADING_RE = re.compile(r'^#{1,6}\s+(.+?)\s*$')
+
+Row = namedtuple('Row', ['low', 'high', 'result'])
+
+class AliasSampler:
+    """O(1) sampling from a discrete distribution (Vose's alias method)."""
+
+    def __init__(self, outcomes, weights):
+        if not outcomes:
+            raise ValueError("cannot sample from an empty table")
+        if len(outcomes) != len(weights):
+            raise ValueError("outcomes and weights differ in length")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("weights must sum to more than zero")
+
+        n = len(outcomes)
+        self.outcomes = list(outcomes)
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in large + small:
+            self.prob[i] = 1.0
+
+    def __len__(self):
+        return len(self.outcomes)
+
+    def sample_index(self, rng=random):
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def sample(self, n=1, rng=None):
+        """Return a list of n outcomes."""
+        rng = rng or random.Random()
+        prob, alias, outcomes = self.prob, self.alias, self.outcomes
+        size = len(prob)
+        draw = rng.random
+        results = []
+        for _ in range(n):
+            u = draw() * size
+            i = int(u)
+            results.append(outcomes[i] if u - i < prob[i] else outcomes[alias[i]])
+        return results
+
+class RandomTable:
+    """A compiled table: its rows plus a sampler over them."""
+
+    def __init__(self, name, die, columns, rows):
+        self.name = name
+        self.die = die
+        self.columns = columns
+        self.rows = rows
+        self.sampler = AliasSampler(rows, [row.high - row.low + 1 for row in rows])
+
+    def roll(self, n=1, rng=None):
+        """Roll n times and return the row results."""
+        return [row.result for row in self.sampler.sample(n, rng)]
+
+    def gaps(self):
+        """Rolls on the die that no row covers (usually a parse problem)."""
+        covered = set()
+        for row in self.rows:
+            covered.update(range(row.low, row.high + 1))
+        return [r for r in range(1, self.die + 1) if r not in covered]
+
+def _cells(line):
+    return [c.strip() for c in line.strip().strip('|').split('|')]
+
+def _roll_range(cell, die):
+    """'01–20' -> (1, 20); '91–00' on a d100 -> (91, 100); '—' -> None."""
+    match = ROLL_RE.match(cell.replace('*', '').strip())
+    if not match:
+        return None
+    low = int(match.group(1))
+    high = int(match.group(2)) if match.group(2) else low
+    if low == 0:
+        low = die
+    if high == 0:
+        high = die
+    if low > high:
+        return None
+    return low, high
+
+def parse_dn_tables(body, page=''):
+    """Return a RandomTable for every dN table in a markdown body."""
+    tables = []
+    heading = None
+    lines = body.split('\n')
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+        heading_match = HEADING_RE.match(line)
+        if heading_match:
+            heading = heading_match.group(1)
+        if not line.startswith('|'):
+            i += 1
+            continue
+
+        header = _cells(line)
+        die_match = DIE_RE.match(header[0])
+        if not die_match:
+            # Skip the rest of a non-dice table
+            while i < len(lines) and lines[i].strip().startswith('|'):
+                i += 1
+            continue
+
+        die = int(die_match.group(2))
+        columns = header[1:]
+        rows = []
+        i += 1
+        while i < len(lines) and lines[i].strip().startswith('|'):
+            cells = _cells(lines[i])
+            i += 1
+            if set(''.join(cells)) <= set('-: '):
+                continue  # separator row
+            span = _roll_range(cells[0], die)
+            if span is None:
+                continue  # "—" rows are chosen, not rolled
+            values = cells[1:] + [''] * (len(columns) - len(cells) + 1)
+            result = values[0] if len(columns) == 1 else dict(zip(columns, values))
+            rows.append(Row(span[0], span[1], result))
+
+        if rows:
+            name = f"{page}#{len(tables) + 1}"
+            if heading:
+                name += f" ({heading})"
+            tables.append(RandomTable(name, die, columns, rows))
+    return tables
+
+def compile_page(path):
+    """Compile every dN table in one MDX page."""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        _, body = split_frontmatter(f.read())
+    try:
+        page = path.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        page = path.as_posix()
+    return parse_dn_tables(body, page)
+
+# --- Magic item queries ---
+
+def parse_item_query(text):
+    """
+    Parse "Rare, non-attunement, category Potion" into a filter dict with
+    keys rarity, attunement (True/False) and category. Unknown terms raise
+    ValueError.
+    """
+    query = {}
+    rarity_names = {r.lower(): r for r in RARITIES}
+    for term in [t.strip() for t in text.split(',') if t.strip()]:
+        lowered = term.lower()
+        if lowered in rarity_names:
+            query['rarity'] = rarity_names[lowered]
+        elif lowered in ('attunement', 'requires attunement'):
+            query['attunement'] = True
+        elif lowered in ('non-attunement', 'no attunement'):
+            query['attunement'] = False
+        elif lowered.startswith('category '):
+            query['category'] = term.split(None, 1)[1]
+        else:
+            raise ValueError(f"unknown query term: {term!r}")
+    return query
+
+def _item_records(data, body):
+    """One (name, rarity) record per variant of an item, or the item itself."""
+    return [(v['name'], v['rarity']) for v in page_variants(data, body)]
+
+def compile_item_query(query, weight=None):
+    """
+    Compile a magic item query into a RandomTable over matching item names.
+
+    query is a string or a dict from parse_item_query(); weight optionally
+    maps (frontmatter, variant rarity) to a relative weight (default 1).
+    """
+    if isinstance(query, str):
+        query = parse_item_query(query)
+    rows = []
+    weights = []
+    for _, _, data, body in iter_pages('magicitems'):
+        if 'category' in query and (data.get('category') or '').lower() != query['category'].lower():
+            continue
+        if 'attunement' in query and bool(data.get('attunement')) != query['attunement']:
+            continue
+        for name, rarity in _item_records(data, body):
+            if 'rarity' in query and rarity != query['rarity']:
+                continue
+            rows.append(name)
+            weights.append(weight(data, rarity) if weight else 1)
+    if not rows:
+        raise ValueError(f"no magic items match {query}")
+
+    # Items are rows of width 1 so the table behaves like a dN table
+    table = RandomTable(f"items: {query}", len(rows), ['Item'],
+                        [Row(i + 1, i + 1, name) for i, name in enumerate(rows)])
+    if weight:
+        table.sampler = AliasSampler(table.rows, weights)
+    return table
+
+# --- Cache ---
+
+def _signature(paths):
+    """Size and mtime of every source file; changes when any source changes."""
+    sig = []
+    for path in paths:
+        st = os.stat(path)
+        sig.append((str(path), st.st_size, st.st_mtime_ns))
+    return tuple(sig)
+
+def _load_cache():
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return {}
+    return cache if cache.get('version') == CACHE_VERSION else {}
+
+def _save_cache(cache):
+    CACHE_FILE.parent.mkdir(exist_ok=True)
+    cache['version'] = CACHE_VERSION
+    tmp = CACHE_FILE.with_suffix('.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, CACHE_FILE)
+
+def _cached(key, sources, build):
+    cache = _load_cache()
+    signature = _signature(sources)
+    entry = cache.get(key)
+    if entry and entry[0] == signature:
+        return entry[1]
+    value = build()
+    cache[key] = (signature, value)
+    _save_cache(cache)
+    return value
+
+def load_page_tables(path):
+    """Compiled dN tables for a page, from the cache when the page is unchanged."""
+    path = Path(path).resolve()
+    return _cached(('page', str(path)), [path], lambda: compile_page(path))
+
+def load_item_query(query):
+    """Compiled item query table, rebuilt when any magic item page changes."""
+    if isinstance(query, str):
+        query = parse_item_query(query)
+    key = ('items', tuple(sorted(query.items())))
+    sources = sorted((ROOT / 'magicitems').rglob('*.mdx'))
+    return _cached(key, sources, lambda: compile_item_query(query))
@@ -0,0 +1,188 @@
+"""
+Planned page moves into group folders.
+
+A reorganization is computed in full before anything is touched: each move
+takes a page at the top of a layout dir (bestiary/dragon) into a group
+folder under a new slug (adult-red-dragon.mdx -> red-dragon/adult.mdx).
+Collisions are checked on the whole plan, then the moves are done with
+os.rename. Sidebar order isn't the plan's job: the caller rebuilds the
+section's meta.json files from scripts/meta-order.json afterwards:
+
+    plan = Plan(ROOT / 'bestiary' / 'fiend')
+    plan.add('imp', 'devils', 'imp')
+    problems = plan.collisions()
+    if not problems:
+        plan.apply()
+        rebuild_meta('bestiary')
+
+plan_from_rules() builds plans from a rules file (scripts/layouts.json),
+where each layout dir has an ordered list of rules:
+
+    {"match": "(?P<age>young|adult|ancient)-(?P<color>red|blue)-dragon",
+     "group": "{color}-dragon", "slug": "{age}", "title": "{age!t}"}
+
+The first rule whose pattern matches the whole slug wins. Templates are
+str.format strings over the pattern's named groups and {slug}; the !t
+conversion turns a slug into Title Case. "slug" defaults to the old slug,
+and "title" (optional) rewrites the page's frontmatter title. Only pages
+at the top of a layout dir are candidates, so running the rules again on
+an organized tree plans nothing.
+
+A new group folder gets an index.mdx. Its frontmatter comes from the
+group's spec in the layout's "groups" ({"title", "description", ...}).
+Its body comes from the "index" template lines of the group spec, or of
+the layout:
+
+    "index": ["# {title}", "", "{intro}", "", "## Life Stages", "", "{table}"]
+
+{title}, {description} and every other key of the group spec fill the
+lines. {table} is an empty summary table with the headers of the group's
+or layout's "table", and update-index-tables.py fills in its rows. Blank
+lines left by fields a group doesn't set collapse into one.
+"""
+
+import json
+import os
+import re
+import string
+from pathlib import Path
+
+from corpus import ROOT
+from frontmatter_patch import PatchSet
+
+LAYOUTS_FILE = Path(__file__).parent / 'layouts.json'
+
+class _Template(string.Formatter):
+    def convert_field(self, value, conversion):
+        if conversion == 't':
+            return slug_title(value)
+        return super().convert_field(value, conversion)
+
+_template = _Template()
+
+class _Fields(dict):
+    def __missing__(self, key):
+        return ''
+
+# Body of a new group index page when neither the group nor the layout has one
+DEFAULT_INDEX = ['# {title}', '', '{table}']
+
+def slug_title(slug):
+    """'pit-fiend' -> 'Pit Fiend'."""
+    return slug.replace('-', ' ').title()
+
+class Plan:
+    """Moves of pages in one layout dir into group folders."""
+
+    def __init__(self, base_dir, groups=None, table=None, index=None):
+        self.base = Path(base_dir)
+        # {group: {'title', 'description', 'table', 'index', ...}}; titles default to the folder name
+        self.groups = groups or {}
+        # Summary table headers and body template for new group index pages
+        self.table = table
+        self.index = index
+        self.moves = []
+
+    def add(self, slug, group, new_slug=None, title=None):
+        self.moves.append({
+            'src': self.base / f'{slug}.mdx',
+            'dst': self.base / group / f'{new_slug or slug}.mdx',
+            'slug': slug,
+            'group': group,
+            'new_slug': new_slug or slug,
+            'title': title,
+        })
+
+    def group_title(self, group):
+        return self.groups.get(group, {}).get('title') or slug_title(group)
+
+    def collisions(self):
+        """Problems that would make the plan lose or shadow a page, as messages."""
+        problems = []
+        targets = {}
+        moving = {m['slug'] for m in self.moves}
+        for m in self.moves:
+            dst = m['dst'].relative_to(ROOT).as_posix()
+            if m['dst'] in targets:
+                problems.append(f"{targets[m['dst']]} and {m['slug']} both move to {dst}")
+            targets[m['dst']] = m['slug']
+            if m['dst'].exists():
+                problems.append(f"{m['slug']} would overwrite {dst}")
+            if m['new_slug'] == 'index':
+                problems.append(f"{m['slug']} would replace the index page of {m['group']}")
+        for group in {m['group'] for m in self.moves}:
+            # A page and a folder with the same name compete for one route
+            if (self.base / f'{group}.mdx').exists() and group not in moving:
+                page = (self.base / f'{group}.mdx').relative_to(ROOT).as_posix()
+                problems.append(f"group folder {group}/ would shadow {page}")
+        return problems
+
+    def apply(self):
+        """Move the pages, retitle them and write new group index pages; returns the files written."""
+        written = []
+        titles = PatchSet()
+        groups = []
+        for m in self.moves:
+            m['dst'].parent.mkdir(exist_ok=True)
+            os.rename(m['src'], m['dst'])
+            if m['group'] not in groups:
+                groups.append(m['group'])
+            if m['title']:
+                titles.update(m['dst'], {'title': m['title']})
+        written.extend(titles.commit())
+
+        for group in groups:
+            index_path = self.base / group / 'index.mdx'
+            if not index_path.exists():
+                index_path.write_text(self.index_stub(group), encoding='utf-8')
+                written.append(index_path)
+        return written
+
+    def index_stub(self, group):
+        """Front page of a new group folder, with an empty summary table."""
+        spec = self.groups.get(group, {})
+        title = self.group_title(group)
+        description = spec.get('description')
+        lines = ['---', f'title: {title}']
+        if description:
+            lines.append(f'description: {description}')
+        lines += ['---', '']
+
+        table = ''
+        headers = spec.get('table') or self.table
+        if headers:
+            # Rows are filled in by update-index-tables.py
+            table = '\n'.join(['| ' + ' | '.join(headers) + ' |',
+                               '|' + '|'.join('-' * (len(h) + 2) for h in headers) + '|'])
+        fields = _Fields({k: v for k, v in spec.items() if isinstance(v, str)})
+        fields.update(title=title, description=description or '', table=table)
+        body = '\n'.join(_template.vformat(line, (), fields)
+                         for line in spec.get('index') or self.index or DEFAULT_INDEX)
+        body = re.sub(r'\n{3,}', '\n\n', body).strip('\n')
+        return '\n'.join(lines) + '\n' + body + '\n'
+
+def load_layouts(path=LAYOUTS_FILE):
+    with open(path) as f:
+        return json.load(f)
+
+def plan_from_rules(layouts):
+    """One Plan per layout dir of a rules file, in file order."""
+    plans = []
+    for rel_dir, layout in layouts.items():
+        base = ROOT / rel_dir
+        plan = Plan(base, layout.get('groups'), layout.get('table'), layout.get('index'))
+        rules = [(re.compile(rule['match']), rule) for rule in layout['rules']]
+        with os.scandir(base) as entries:
+            slugs = sorted(e.name[:-len('.mdx')] for e in entries
+                           if e.is_file() and e.name.endswith('.mdx') and e.name != 'index.mdx')
+        for slug in slugs:
+            for pattern, rule in rules:
+                match = pattern.fullmatch(slug)
+                if not match:
+                    continue
+                fields = {'slug': slug, **match.groupdict()}
+                fill = lambda key: _template.format(rule[key], **fields) if rule.get(key) else None
+                plan.add(slug, fill('group'), fill('slug'), fill('title'))
+                break
+        plans.append(plan)
+    return plans
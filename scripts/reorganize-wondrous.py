@@ -1,165 +1,268 @@
 #!/usr/bin/env python3
 """
-Reorganize wondrous items into subcategories.
+Reorganize magic items into subcategories.
+
+Items are classified with the rule engine in item_classifier.py, using the
+layout for the chosen section (wondrous-items by default; weapons, armor and
+rings also have layouts). Rules are name keywords or frontmatter rules such
+as 'itemType:shield'. Items matched by more than one subcategory are listed
+in an ambiguity report. Links to the moved items are rewritten to their
+new place (see link_index.py).
+
+Usage:
+  python scripts/reorganize-wondrous.py [section] [--report]
+
+--report classifies every item already in the section, including ones that
+are already in a subfolder, and lists ambiguous and misplaced items without
+moving anything.
 """
 
 import os
-import json
-import shutil
+import sys
 
-BASE_DIR = os.path.join(os.path.dirname(__file__), '..', 'magicitems', 'wondrous-items')
+from corpus import split_frontmatter
+from index_tables import load_pages, update_tables
+from item_classifier import ItemClassifier
+from link_index import LinkIndex, rewrite_links
+from reorganization import Plan
+from site_meta import rebuild_meta
 
-# Categorization rules based on item name prefixes/keywords
-CATEGORIES = {
-    'worn': {
-        'title': 'Worn Items',
-        'keywords': ['boots', 'belt', 'cloak', 'cape', 'robe', 'slippers', 'mantle', 'gloves', 'gauntlets', 'bracers', 'winged-boots', 'wings'],
-        'items': []
-    },
-    'head': {
-        'title': 'Head Items',
-        'keywords': ['helm', 'hat', 'headband', 'circlet', 'goggles', 'eyes'],
-        'items': []
-    },
-    'jewelry': {
-        'title': 'Jewelry',
-        'keywords': ['amulet', 'necklace', 'medallion', 'brooch', 'periapt', 'pearl', 'scarab', 'talisman'],
-        'items': []
-    },
-    'containers': {
-        'title': 'Containers',
-        'keywords': ['bag', 'bottle', 'bowl', 'decanter', 'flask', 'quiver', 'haversack', 'hole', 'well'],
-        'items': []
+MAGICITEMS_DIR = os.path.join(os.path.dirname(__file__), '..', 'magicitems')
+
+# Subcategory layouts per section. Higher priority wins over position.
+LAYOUTS = {
+    'wondrous-items': {
+        'title': 'Wondrous Items',
+        'description': 'Miscellaneous magical objects',
+        'intro': "Wondrous items include wearable items such as boots, belts, capes, and gloves, as well as items that don't fit any other category.",
+        'categories': {
+            'worn': {
+                'title': 'Worn Items',
+                'rules': ['boots', 'belt', 'cloak', 'cape', 'robe', 'slippers', 'mantle', 'gloves', 'gauntlets', 'bracers', 'winged-boots', 'wings'],
+            },
+            'head': {
+                'title': 'Head Items',
+                'rules': ['helm', 'hat', 'headband', 'circlet', 'goggles', 'eyes'],
+            },
+            'jewelry': {
+                'title': 'Jewelry',
+                'rules': ['amulet', 'necklace', 'medallion', 'brooch', 'periapt', 'pearl', 'scarab', 'talisman'],
+            },
+            'containers': {
+                'title': 'Containers',
+                'rules': ['bag', 'bottle', 'bowl', 'decanter', 'flask', 'quiver', 'haversack', 'portable-hole', 'well'],
+            },
+            'figurines': {
+                'title': 'Figurines',
+                'rules': ['figurine'],
+            },
+            'instruments': {
+                'title': 'Instruments & Tools',
+                'rules': ['horn', 'pipes', 'chime', 'drum', 'candle', 'lantern', 'mirror', 'crystal-ball', 'gem', 'ioun-stone', 'luckstone', 'stone-of-controlling', 'cube-of-force', 'sphere-of-annihilation', 'orb', 'bead', 'dust', 'rope', 'carpet', 'broom'],
+            },
+            'tomes': {
+                'title': 'Tomes & Manuals',
+                'rules': ['tome', 'manual', 'deck'],
+            },
+        },
     },
-    'figurines': {
-        'title': 'Figurines',
-        'keywords': ['figurine'],
-        'items': []
+    'weapons': {
+        'title': 'Weapons',
+        'description': 'Magic weapons and ammunition',
+        'intro': 'Magic weapons grouped by the kind of weapon they can be.',
+        'categories': {
+            'blades': {
+                'title': 'Swords & Blades',
+                'rules': ['sword', 'blade', 'dagger', 'scimitar', 'itemType:longsword', 'itemType:greatsword',
+                          'itemType:rapier', 'itemType:shortsword', 'itemType:scimitar', 'itemType:dagger'],
+            },
+            'bludgeons': {
+                'title': 'Axes, Maces & Hammers',
+                'rules': ['axe', 'mace', 'hammer', 'greatclub', 'itemType:battleaxe', 'itemType:mace',
+                          'itemType:warhammer', 'itemType:maul', 'itemType:greatclub'],
+            },
+            'ranged': {
+                'title': 'Ranged & Thrown',
+                'rules': ['bow', 'oathbow', 'javelin', 'itemType:longbow', 'itemType:javelin'],
+            },
+            'polearms': {
+                'title': 'Staves & Polearms',
+                'rules': ['trident', 'quarterstaff', 'itemType:trident', 'itemType:quarterstaff'],
+            },
+            'ammunition': {
+                'title': 'Ammunition',
+                'rules': ['ammunition', 'itemType:any ammunition'],
+                'priority': 1,
+            },
+            'any-weapon': {
+                'title': 'Any Weapon',
+                'rules': ['itemType:any simple or martial', 'itemType:any melee weapon'],
+            },
+        },
     },
-    'instruments': {
-        'title': 'Instruments & Tools',
-        'keywords': ['horn', 'pipes', 'chime', 'drum', 'candle', 'lantern', 'mirror', 'crystal', 'gem', 'stone', 'cube', 'sphere', 'orb', 'bead', 'dust', 'rope', 'carpet', 'broom'],
-        'items': []
+    'armor': {
+        'title': 'Armor',
+        'description': 'Magic armor and shields',
+        'intro': 'Magic armor and shields grouped by what they can be made from.',
+        'categories': {
+            'shields': {
+                'title': 'Shields',
+                'rules': ['shield', 'itemType:shield'],
+                'priority': 1,
+            },
+            'any-armor': {
+                'title': 'Any Armor',
+                'rules': ['itemType:any light', 'itemType:any medium'],
+            },
+            'specific-armor': {
+                'title': 'Specific Armor',
+                'rules': ['itemType:plate', 'itemType:mail', 'itemType:chain', 'itemType:leather'],
+            },
+        },
     },
-    'tomes': {
-        'title': 'Tomes & Manuals',
-        'keywords': ['tome', 'manual', 'deck'],
-        'items': []
+    'rings': {
+        'title': 'Rings',
+        'description': 'Magic rings',
+        'intro': 'Magic rings grouped by whether they require attunement.',
+        'categories': {
+            'attuned': {
+                'title': 'Requires Attunement',
+                'rules': ['attunement:true'],
+            },
+            'unattuned': {
+                'title': 'No Attunement',
+                'rules': ['attunement:false'],
+            },
+        },
     },
 }
 
-def categorize_item(filename):
-    """Determine which category an item belongs to."""
-    name = filename.replace('.mdx', '').lower()
+def read_item(filepath):
+    """Return frontmatter for an item file."""
+    with open(filepath, 'r') as f:
+        data, _ = split_frontmatter(f.read())
+    return data
+
+def collect_items(base_dir, recursive):
+    """Map slug -> (path, frontmatter) for items in a section."""
+    items = {}
+    for dirpath, dirnames, filenames in os.walk(base_dir):
+        for filename in filenames:
+            if filename.endswith('.mdx') and filename != 'index.mdx':
+                path = os.path.join(dirpath, filename)
+                items[filename[:-len('.mdx')]] = (path, read_item(path))
+        if not recursive:
+            break
+    return items
+
+def print_ambiguities(ambiguities):
+    if not ambiguities:
+        return
+    print(f"\nAmbiguous matches ({len(ambiguities)}):")
+    for slug, chosen, matches in sorted(ambiguities):
+        candidates = ', '.join(f"{key} ('{rule}')" for key, rule in matches)
+        print(f"  {slug} -> {chosen}  [{candidates}]")
 
-    for cat_key, cat_info in CATEGORIES.items():
-        for keyword in cat_info['keywords']:
-            if keyword in name:
-                return cat_key
+def report(section, classifier, base_dir):
+    """Classify the whole section in place and list misplaced items."""
+    items = collect_items(base_dir, recursive=True)
+    groups, ambiguities = classifier.classify_all(
+        (slug, fm) for slug, (_, fm) in sorted(items.items())
+    )
+    print(f"Classified {len(items)} items in {section}:")
+    for key, slugs in groups.items():
+        if slugs:
+            print(f"  {key}: {len(slugs)} items")
+    print_ambiguities(ambiguities)
 
-    return 'misc'
+    misplaced = []
+    unorganized = 0
+    for key, slugs in groups.items():
+        for slug in slugs:
+            current_dir = os.path.dirname(items[slug][0])
+            if os.path.samefile(current_dir, base_dir):
+                unorganized += 1
+            elif os.path.basename(current_dir) != key:
+                misplaced.append((slug, os.path.basename(current_dir), key))
+    if unorganized:
+        print(f"\nNot yet in a subcategory: {unorganized} items")
+    if misplaced:
+        print(f"\nMisplaced ({len(misplaced)}):")
+        for slug, current, key in sorted(misplaced):
+            print(f"  {slug}: {current} -> {key}")
 
 def main():
-    # Get all mdx files (excluding index)
-    files = [f for f in os.listdir(BASE_DIR) if f.endswith('.mdx') and f != 'index.mdx']
-
-    # Categorize each item
-    misc_items = []
-    for filename in files:
-        category = categorize_item(filename)
-        if category == 'misc':
-            misc_items.append(filename)
-        else:
-            CATEGORIES[category]['items'].append(filename)
-
-    # Add misc category
-    CATEGORIES['misc'] = {
-        'title': 'Miscellaneous',
-        'keywords': [],
-        'items': misc_items
-    }
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    section = args[0] if args else 'wondrous-items'
+    if section not in LAYOUTS:
+        print(f"No layout for {section} (expected one of {', '.join(LAYOUTS)})")
+        sys.exit(1)
+
+    layout = LAYOUTS[section]
+    categories = layout['categories']
+    base_dir = os.path.join(MAGICITEMS_DIR, section)
+    classifier = ItemClassifier(categories)
+
+    if '--report' in sys.argv:
+        report(section, classifier, base_dir)
+        return
+
+    # Categorize all top-level items in one pass
+    items = collect_items(base_dir, recursive=False)
+    groups, ambiguities = classifier.classify_all(
+        (slug, fm) for slug, (_, fm) in sorted(items.items())
+    )
+    titles = {key: spec['title'] for key, spec in categories.items()}
+    titles['misc'] = 'Miscellaneous'
 
     # Print summary
     print("Categorization summary:")
-    for cat_key, cat_info in CATEGORIES.items():
-        print(f"  {cat_info['title']}: {len(cat_info['items'])} items")
-
-    # Create subdirectories and move files
-    for cat_key, cat_info in CATEGORIES.items():
-        if not cat_info['items']:
-            continue
-
-        cat_dir = os.path.join(BASE_DIR, cat_key)
-        os.makedirs(cat_dir, exist_ok=True)
-
-        # Move files
-        for filename in cat_info['items']:
-            src = os.path.join(BASE_DIR, filename)
-            dst = os.path.join(cat_dir, filename)
-            if os.path.exists(src):
-                shutil.move(src, dst)
-
-        # Create meta.json
-        slugs = sorted([f.replace('.mdx', '') for f in cat_info['items']])
-        meta = {
-            'title': cat_info['title'],
-            'pages': slugs,
-            'defaultOpen': False
-        }
-        meta_path = os.path.join(cat_dir, 'meta.json')
-        with open(meta_path, 'w') as f:
-            json.dump(meta, f, indent=2)
-            f.write('\n')
-
-        # Create index.mdx
-        index_content = f"""---
-title: {cat_info['title']}
-description: {cat_info['title']} - Wondrous Items
----
+    for cat_key, slugs in groups.items():
+        print(f"  {titles[cat_key]}: {len(slugs)} items")
+    print_ambiguities(ambiguities)
 
-# {cat_info['title']}
+    # Plan every move first, then rename; meta.json order comes from
+    # scripts/meta-order.json
+    specs = {key: {'title': title, 'description': f"{title} - {layout['title']}"}
+             for key, title in titles.items()}
+    plan = Plan(base_dir, specs, table=['Item', 'Rarity'])
+    for cat_key, slugs in groups.items():
+        for slug in slugs:
+            plan.add(slug, cat_key)
+    problems = plan.collisions()
+    if problems:
+        print("\nCollisions, nothing moved:")
+        for p in problems:
+            print(f"  {p}")
+        sys.exit(1)
+    rewritten = rewrite_links(LinkIndex.load(), [(m['src'], m['dst']) for m in plan.moves])
+    plan.apply()
+    rebuild_meta('magicitems')
+    if rewritten:
+        print(f"\nRewrote {sum(rewritten.values())} links in {len(rewritten)} files")
 
-| Item | Rarity |
-|------|--------|
-"""
-        for filename in sorted(cat_info['items']):
-            slug = filename.replace('.mdx', '')
-            # Read the file to get rarity
-            filepath = os.path.join(cat_dir, filename)
-            rarity = 'Unknown'
-            with open(filepath, 'r') as f:
-                for line in f:
-                    if line.startswith('rarity:'):
-                        rarity = line.split(':')[1].strip()
-                        break
-            title = slug.replace('-', ' ').title()
-            index_content += f"| [{title}]({slug}) | {rarity} |\n"
-
-        index_path = os.path.join(cat_dir, 'index.mdx')
-        with open(index_path, 'w') as f:
-            f.write(index_content)
-
-    # Update wondrous-items meta.json
-    categories_with_items = [k for k, v in CATEGORIES.items() if v['items']]
-    meta = {
-        'title': 'Wondrous Items',
-        'pages': categories_with_items,
-        'defaultOpen': False
-    }
-    meta_path = os.path.join(BASE_DIR, 'meta.json')
-    with open(meta_path, 'w') as f:
-        json.dump(meta, f, indent=2)
-        f.write('\n')
-
-    # Update wondrous-items index.mdx
-    index_content = """---
-title: Wondrous Items
-description: Miscellaneous magical objects
+    categories_with_items = [k for k, v in groups.items() if v]
+
+    # Write the section index.mdx the first time; later runs only refresh
+    # the item counts along with the category tables
+    index_path = os.path.join(base_dir, 'index.mdx')
+    if not os.path.exists(index_path):
+        write_section_index(index_path, layout, titles, groups, categories_with_items)
+    for update in update_tables(load_pages()):
+        if update['changed']:
+            print(f"Updated {update['file']}")
+
+    print(f"\nReorganized {len(items)} items into {len(categories_with_items)} categories")
+
+def write_section_index(index_path, layout, titles, groups, categories_with_items):
+    index_content = f"""---
+title: {layout['title']}
+description: {layout['description']}
 ---
 
-# Wondrous Items
+# {layout['title']}
 
-Wondrous items include wearable items such as boots, belts, capes, and gloves, as well as items that don't fit any other category.
+{layout['intro']}
 
 ## Categories
 
@@ -167,14 +270,10 @@ Wondrous items include wearable items such as boots, belts, capes, and gloves, a
 |----------|-------|
 """
     for cat_key in categories_with_items:
-        cat_info = CATEGORIES[cat_key]
-        index_content += f"| [{cat_info['title']}]({cat_key}) | {len(cat_info['items'])} |\n"
+        index_content += f"| [{titles[cat_key]}]({cat_key}) | {len(groups[cat_key])} |\n"
 
-    index_path = os.path.join(BASE_DIR, 'index.mdx')
     with open(index_path, 'w') as f:
         f.write(index_content)
 
-    print(f"\nReorganized {len(files)} wondrous items into {len(categories_with_items)} categories")
-
 if __name__ == '__main__':
     main()
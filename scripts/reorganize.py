@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Move pages into group folders as laid out in scripts/layouts.json.
+
+Each layout dir (bestiary/dragon, bestiary/fiend, ...) lists rules that map
+a slug pattern to a group folder and a new slug; see reorganization.py for
+the format. The whole move plan is computed and checked for collisions
+before any file moves, so a bad rule leaves the tree untouched. Pages are
+moved with os.rename, then the section's meta.json files are rebuilt once
+from scripts/meta-order.json (see site_meta.py). Links
+to the moved pages, and relative links on them, are rewritten first from
+the reverse link index (see link_index.py), so nothing needs a grep of the
+corpus and validate-links.mjs stays clean. New group index pages get an empty summary table, which is then filled in from
+the moved pages (see index_tables.py). Running it on an organized tree
+does nothing.
+
+Usage:
+  python scripts/reorganize.py [DIR ...] [--rules FILE] [--dry-run]
+
+DIR limits the run to some layout dirs (e.g. bestiary/fiend). --dry-run
+prints the plan, and the links it would rewrite, without moving anything.
+Exits 1 on collisions.
+"""
+
+import argparse
+import sys
+
+from corpus import ROOT
+from index_tables import load_pages, update_tables
+from link_index import LinkIndex, planned_rewrites, rewrite_links
+from reorganization import LAYOUTS_FILE, load_layouts, plan_from_rules
+from site_meta import load_rules, rebuild_meta
+
+def main():
+    parser = argparse.ArgumentParser(description='Move pages into group folders.')
+    parser.add_argument('dirs', nargs='*', help='layout dirs to reorganize (default: all)')
+    parser.add_argument('--rules', default=LAYOUTS_FILE, help='rules file')
+    parser.add_argument('--dry-run', action='store_true', help='print the plan only')
+    args = parser.parse_args()
+
+    layouts = load_layouts(args.rules)
+    unknown = [d for d in args.dirs if d.rstrip('/') not in layouts]
+    if unknown:
+        parser.error(f"no layout for {', '.join(unknown)} (layouts: {', '.join(layouts)})")
+    if args.dirs:
+        layouts = {d: layout for d, layout in layouts.items() if d in {a.rstrip('/') for a in args.dirs}}
+
+    plans = [plan for plan in plan_from_rules(layouts) if plan.moves]
+    if not plans:
+        print("✓ Nothing to move")
+        return 0
+
+    problems = [p for plan in plans for p in plan.collisions()]
+    for plan in plans:
+        print(f"{plan.base.relative_to(ROOT)}:")
+        for m in plan.moves:
+            retitle = f"  (title: {m['title']})" if m['title'] else ''
+            print(f"  {m['slug']} -> {m['group']}/{m['new_slug']}{retitle}")
+    if problems:
+        print(f"\n✗ {len(problems)} collision{'s' if len(problems) != 1 else ''}, nothing moved:")
+        for p in problems:
+            print(f"  {p}")
+        return 1
+
+    moves = [(m['src'], m['dst']) for plan in plans for m in plan.moves]
+    links = LinkIndex.load()
+    if args.dry_run:
+        rewrites = planned_rewrites(links, moves)
+        print(f"\n{len(moves)} moves planned, "
+              f"{sum(map(len, rewrites.values()))} links in {len(rewrites)} files to rewrite (dry run)")
+        return 0
+
+    rewritten = rewrite_links(links, moves)
+    written = set()
+    for plan in plans:
+        written.update(plan.apply())
+    rules = load_rules()
+    for section in sorted({plan.base.relative_to(ROOT).parts[0] for plan in plans}):
+        written.update(rebuild_meta(section, rules))
+    print(f"\nMoved {len(moves)} pages, wrote {len(written)} files")
+    if rewritten:
+        print(f"Rewrote {sum(rewritten.values())} links in {len(rewritten)} files")
+    for update in update_tables(load_pages()):
+        if update['changed']:
+            print(f"Updated {update['file']}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
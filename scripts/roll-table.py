@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Roll on random tables.
+
+Usage:
+  python scripts/roll-table.py <page.mdx> [--table N] [-n COUNT] [--seed S]
+  python scripts/roll-table.py --items "Rare, non-attunement, category Potion" [-n COUNT] [--seed S]
+  python scripts/roll-table.py <page.mdx> --list
+
+Page tables are the dN tables on the page (e.g.
+content/character-creation/trinkets.mdx); --table picks one when a page has
+several. --items rolls magic items matching a query of rarity, attunement /
+non-attunement and "category X" terms. --stats prints how often each result
+came up instead of listing the rolls.
+"""
+
+import argparse
+import random
+import sys
+from collections import Counter
+
+from random_tables import load_item_query, load_page_tables
+
+def main():
+    parser = argparse.ArgumentParser(description='Roll on random tables.')
+    parser.add_argument('page', nargs='?', help='MDX page containing dN tables')
+    parser.add_argument('--items', help='magic item query, e.g. "Rare, category Potion"')
+    parser.add_argument('--table', type=int, default=1, help='which table on the page (1-based)')
+    parser.add_argument('-n', type=int, default=1, help='number of rolls')
+    parser.add_argument('--seed', type=int, help='random seed for repeatable rolls')
+    parser.add_argument('--list', action='store_true', help='list the tables on the page')
+    parser.add_argument('--stats', action='store_true', help='print result frequencies')
+    args = parser.parse_args()
+
+    if bool(args.page) == bool(args.items):
+        parser.error('give either a page or --items')
+
+    if args.items:
+        try:
+            table = load_item_query(args.items)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+    else:
+        tables = load_page_tables(args.page)
+        if not tables:
+            print(f"No dN tables found in {args.page}")
+            sys.exit(1)
+        if args.list:
+            for i, t in enumerate(tables, 1):
+                gaps = t.gaps()
+                note = f", uncovered rolls: {gaps}" if gaps else ''
+                print(f"{i}. {t.name}: d{t.die}, {len(t.rows)} rows{note}")
+            return
+        if not 1 <= args.table <= len(tables):
+            print(f"{args.page} has {len(tables)} tables")
+            sys.exit(1)
+        table = tables[args.table - 1]
+
+    rng = random.Random(args.seed)
+    results = table.roll(args.n, rng)
+
+    if args.stats:
+        counts = Counter(str(r) for r in results)
+        for result, count in counts.most_common():
+            print(f"{count / args.n:7.2%}  {result}")
+        return
+
+    for result in results:
+        if isinstance(result, dict):
+            result = ' | '.join(f"{k}: {v}" for k, v in result.items())
+        print(result)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+Bounded-time parsing for untrusted (homebrew) sources.
+
+The importers' parsers are regex-heavy, and a malformed block can make a
+pattern backtrack for minutes. run_blocks() runs a parser over a list of
+text blocks in worker processes, each block with a time budget and each
+worker with a memory budget. A block that overruns, exhausts memory,
+crashes its worker or raises is quarantined, the worker is replaced, and
+the rest of the blocks carry on:
+
+    results, quarantine = run_blocks(parse_monster, blocks)
+    print_quarantine(quarantine)
+    write_quarantine_report('monsters', quarantine)
+
+Workers are forked, so the parser can be any function defined in the
+calling script (including the hyphenated import scripts, which can't be
+imported by name). Fork is POSIX-only.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from corpus import ROOT
+
+DEFAULT_TIMEOUT = 2.0   # seconds per block
+DEFAULT_MEMORY_MB = 256  # extra address space per worker
+
+REPORT_DIR = ROOT / '.cache' / 'quarantine'
+
+def _address_space():
+    """Current virtual memory size in bytes (Linux), or 0 if unknown."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+def _worker(func, conn, memory_mb):
+    if memory_mb:
+        try:
+            import resource
+            limit = _address_space() + memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            pass
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        index, block = task
+        try:
+            conn.send((index, 'ok', func(block)))
+        except MemoryError:
+            conn.send((index, 'memory', 'exceeded memory budget'))
+        except Exception as e:
+            conn.send((index, 'error', f"{type(e).__name__}: {e}"))
+
+class _Worker:
+    def __init__(self, ctx, func, memory_mb):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker, args=(func, child, memory_mb), daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None
+        self.started = None
+
+    def submit(self, index, block):
+        self.task = index
+        self.started = time.monotonic()
+        self.conn.send((index, block))
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+
+def _preview(block, length=80):
+    first = str(block).strip().split('\n', 1)[0]
+    return first[:length]
+
+def run_blocks(func, blocks, timeout=DEFAULT_TIMEOUT, memory_mb=DEFAULT_MEMORY_MB, workers=None):
+    """
+    Apply func to each block under a time and memory budget.
+
+    Returns (results, quarantine). results lines up with blocks and holds
+    None for quarantined blocks; quarantine is a list of dicts with index,
+    reason ('timeout', 'memory', 'crash' or 'error'), detail and preview.
+    """
+    blocks = list(blocks)
+    results = [None] * len(blocks)
+    quarantine = []
+    if not blocks:
+        return results, quarantine
+
+    ctx = multiprocessing.get_context('fork')
+    workers = min(workers or os.cpu_count() or 1, len(blocks))
+    pool = [_Worker(ctx, func, memory_mb) for _ in range(workers)]
+    pending = deque(range(len(blocks)))
+    done = 0
+
+    def reject(index, reason, detail):
+        quarantine.append({
+            'index': index,
+            'reason': reason,
+            'detail': detail,
+            'preview': _preview(blocks[index]),
+        })
+
+    try:
+        while done < len(blocks):
+            # Hand out work to idle workers
+            for w in pool:
+                if w.task is None and pending:
+                    index = pending.popleft()
+                    w.submit(index, blocks[index])
+
+            busy = [w for w in pool if w.task is not None]
+            now = time.monotonic()
+            next_deadline = min(w.started + timeout for w in busy)
+            ready = wait([w.conn for w in busy], max(0.0, next_deadline - now))
+
+            for i, w in enumerate(pool):
+                if w.task is None:
+                    continue
+                index = w.task
+                if w.conn in ready:
+                    try:
+                        _, status, value = w.conn.recv()
+                    except (EOFError, OSError):
+                        # Worker died mid-block (e.g. killed for memory)
+                        w.kill()
+                        reject(index, 'crash', f"worker exited with code {w.process.exitcode}")
+                        pool[i] = _Worker(ctx, func, memory_mb)
+                    else:
+                        if status == 'ok':
+                            results[index] = value
+                        else:
+                            reject(index, status, value)
+                        w.task = None
+                    done += 1
+                elif time.monotonic() - w.started >= timeout:
+                    reject(index, 'timeout', f"exceeded {timeout:g}s")
+                    w.kill()
+                    pool[i] = _Worker(ctx, func, memory_mb)
+                    done += 1
+    finally:
+        for w in pool:
+            w.close()
+
+    quarantine.sort(key=lambda q: q['index'])
+    return results, quarantine
+
+def print_quarantine(quarantine):
+    """Print a short quarantine summary."""
+    if not quarantine:
+        return
+    print(f"\nQuarantined {len(quarantine)} blocks:")
+    for q in quarantine:
+        print(f"  #{q['index']} [{q['reason']}] {q['preview']} ({q['detail']})")
+
+def write_quarantine_report(name, quarantine):
+    """Write the quarantine list to .cache/quarantine/<name>.json and return its path."""
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPORT_DIR / f'{name}.json'
+    with open(path, 'w') as f:
+        json.dump(quarantine, f, indent=2)
+        f.write('\n')
+    return path
@@ -0,0 +1,267 @@
+"""
+Sidebar order (meta.json) for every folder, from one scan of the tree.
+
+Each section is walked once with os.scandir. For every folder the scan
+keeps its pages (with the title and CR read from the top of each file),
+its subfolders, its index page and its current meta.json. The folder's
+"pages" list is then rebuilt with the ordering rule that matches its path
+in scripts/meta-order.json:
+
+    {"bestiary/*": {"order": "alpha"},
+     "bestiary/fiend": {"order": "alpha", "pin": ["devils", "demons"]},
+     "bestiary/*/*": {"order": "cr"}}
+
+Patterns match whole path segments; when several match, the last one wins.
+
+  explicit  keep the hand-written order; entries whose page is gone are
+            dropped (the default for folders no rule matches)
+  alpha     pinned entries, then subfolders, then pages, by slug
+  cr        pinned entries, then subfolders by slug, then pages by CR and
+            title
+
+"pin" entries go first and "last" entries at the end, in the order given.
+"index" stays first where the current list has it. Separators
+("---Rules---"), links and "..." entries are fumadocs syntax and are kept
+in explicit lists. Pages that exist but are missing from an explicit
+list are orphans: the sidebar doesn't show them, and they are reported
+rather than added.
+
+    tree = scan('bestiary')
+    for folder in tree.walk():
+        meta, orphans, missing = build_meta(folder, rule_for(folder.rel, rules))
+"""
+
+import json
+import os
+import re
+from fnmatch import fnmatch
+from fractions import Fraction
+from pathlib import Path
+
+from corpus import ROOT, SECTIONS
+from reorganization import slug_title
+
+RULES_FILE = Path(__file__).parent / 'meta-order.json'
+TOC_FILE = ROOT / 'TOC.md'
+TOC_START = '<!-- site-structure:start -->'
+TOC_END = '<!-- site-structure:end -->'
+ORDERS = ('explicit', 'alpha', 'cr')
+
+SEPARATOR_RE = re.compile(r'^---.*---$')
+LINK_ENTRY_RE = re.compile(r'^(?:external:)?\[.*\]\(.*\)$')
+HEAD_FIELD_RE = re.compile(r'^(title|cr):[ \t]*(["\']?)(.*?)\2[ \t]*$', re.MULTILINE)
+# Enough of a page to hold its title and CR
+HEAD_BYTES = 2048
+
+def read_head(path):
+    """{'title', 'cr'} from the frontmatter at the top of a page."""
+    with open(path, encoding='utf-8') as f:
+        head = f.read(HEAD_BYTES)
+    if not head.startswith('---\n'):
+        return {}
+    end = head.find('\n---', 3)
+    fields = {}
+    for key, _, value in HEAD_FIELD_RE.findall(head[4:end if end != -1 else None]):
+        fields.setdefault(key, value)
+    return fields
+
+class Folder:
+    """One content folder: its pages, subfolders, index page and meta.json."""
+
+    def __init__(self, path):
+        self.path = path
+        self.rel = path.relative_to(ROOT).as_posix()
+        self.pages = {}     # slug -> {'title', 'cr'}
+        self.folders = {}   # name -> Folder
+        self.index = None   # index page fields, if there is one
+        self.meta = None
+
+    def walk(self):
+        yield self
+        for name in sorted(self.folders):
+            yield from self.folders[name].walk()
+
+    def title(self):
+        if self.meta and self.meta.get('title'):
+            return self.meta['title']
+        if self.index and self.index.get('title'):
+            return self.index['title']
+        return slug_title(self.path.name)
+
+def scan(section):
+    """The Folder tree of a section, from one os.scandir pass per directory."""
+    def visit(path):
+        folder = Folder(path)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.name.startswith('.'):
+                        folder.folders[entry.name] = visit(Path(entry.path))
+                elif entry.name == 'meta.json':
+                    with open(entry.path) as f:
+                        folder.meta = json.load(f)
+                elif entry.name == 'index.mdx':
+                    folder.index = read_head(entry.path)
+                elif entry.name.endswith('.mdx'):
+                    folder.pages[entry.name[:-len('.mdx')]] = read_head(entry.path)
+        # Folders without pages (assets, empty leftovers) aren't in the sidebar
+        folder.folders = {name: sub for name, sub in folder.folders.items()
+                          if sub.pages or sub.folders or sub.index}
+        return folder
+    return visit(ROOT / section)
+
+def load_rules(path=RULES_FILE):
+    with open(path) as f:
+        rules = json.load(f)
+    for pattern, rule in rules.items():
+        if rule.get('order', 'explicit') not in ORDERS:
+            raise ValueError(f"{pattern}: order must be one of {', '.join(ORDERS)}")
+    return rules
+
+def rule_for(rel, rules):
+    """The last rule whose pattern matches every segment of rel."""
+    parts = rel.split('/')
+    found = {}
+    for pattern, rule in rules.items():
+        pattern_parts = pattern.split('/')
+        if len(pattern_parts) == len(parts) and all(map(fnmatch, parts, pattern_parts)):
+            found = rule
+    return found
+
+def _cr_value(cr):
+    try:
+        return Fraction(cr)
+    except (TypeError, ValueError, ZeroDivisionError):
+        return Fraction(999)
+
+def _valid(folder, entry):
+    if entry == '...' or SEPARATOR_RE.match(entry) or LINK_ENTRY_RE.match(entry):
+        return True
+    if entry == 'index':
+        return folder.index is not None
+    if entry.startswith('...'):
+        return entry[3:] in folder.folders
+    return entry in folder.pages or entry in folder.folders
+
+def build_meta(folder, rule):
+    """
+    (new meta dict or None, orphans, missing) for a folder: None when the
+    folder has no meta.json and its rule keeps the order explicit.
+    """
+    current = folder.meta.get('pages', []) if folder.meta else []
+    missing = [e for e in current if not _valid(folder, e)]
+    kept = [e for e in current if _valid(folder, e)]
+    listed = {e[3:] if e.startswith('...') else e for e in kept}
+    entries = set(folder.pages) | set(folder.folders)
+    orphans = [] if (folder.meta is None or '...' in kept) else sorted(entries - listed)
+
+    order = rule.get('order', 'explicit')
+    if order == 'explicit':
+        if folder.meta is None:
+            return None, [], []
+        pages = kept
+    else:
+        pins = [p for p in rule.get('pin', []) if _valid(folder, p)]
+        if 'index' in kept and 'index' not in pins:
+            pins.insert(0, 'index')
+        last = [p for p in rule.get('last', []) if _valid(folder, p) and p not in pins]
+        subfolders = sorted(n for n in folder.folders if n not in pins and n not in last)
+        rest = [s for s in folder.pages if s not in pins and s not in last]
+        if order == 'cr':
+            rest.sort(key=lambda s: (_cr_value(folder.pages[s].get('cr')),
+                                     folder.pages[s].get('title') or s))
+        else:
+            rest.sort()
+        pages = pins + subfolders + rest + last
+        orphans = []
+
+    if folder.meta is None:
+        return {'title': folder.title(), 'pages': pages, 'defaultOpen': False}, orphans, missing
+    return {**folder.meta, 'pages': pages}, orphans, missing
+
+def rebuild_meta(section, rules=None):
+    """Rebuild the meta.json files of one section; returns the folders written."""
+    rules = rules or load_rules()
+    written = []
+    for folder in scan(section).walk():
+        meta, _, _ = build_meta(folder, rule_for(folder.rel, rules))
+        if meta is not None and write_meta(folder, meta):
+            written.append(folder.rel)
+    return written
+
+def write_meta(folder, meta):
+    """Write a folder's meta.json if it changed; returns True if it did."""
+    if folder.meta == meta:
+        return False
+    with open(folder.path / 'meta.json', 'w') as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    folder.meta = meta
+    return True
+
+def sidebar(folder):
+    """The entries of a folder in sidebar order, with '...' and '...name' expanded."""
+    if folder.meta is None:
+        return sorted(folder.folders) + sorted(folder.pages)
+    entries = []
+    current = folder.meta.get('pages', [])
+    listed = {e[3:] if e.startswith('...') else e for e in current}
+    for entry in current:
+        if entry == '...':
+            entries += sorted((set(folder.folders) | set(folder.pages)) - listed)
+        elif entry.startswith('...') and entry[3:] in folder.folders:
+            sub = folder.folders[entry[3:]]
+            entries += [(sub, e) for e in sidebar(sub)]
+        else:
+            entries.append(entry)
+    return entries
+
+def page_count(folder):
+    return len(folder.pages) + sum(page_count(sub) for sub in folder.folders.values())
+
+def structure_lines(folder, route, depth=0, collapse=20):
+    """Markdown list of a folder's sidebar, folders with many pages summarized."""
+    lines = []
+    indent = '  ' * depth
+    for entry in sidebar(folder):
+        owner, name = entry if isinstance(entry, tuple) else (folder, entry)
+        base = route if owner is folder else f'{route}/{owner.path.name}'
+        if SEPARATOR_RE.match(name):
+            lines.append(f'{indent}- *{name.strip("-")}*')
+        elif name in owner.pages:
+            title = owner.pages[name].get('title') or slug_title(name)
+            lines.append(f'{indent}- [{title}]({base}/{name})')
+        elif name in owner.folders:
+            sub = owner.folders[name]
+            if len(sub.pages) > collapse:
+                lines.append(f'{indent}- [{sub.title()}]({base}/{name}) ({page_count(sub)} pages)')
+            else:
+                lines.append(f'{indent}- [{sub.title()}]({base}/{name})')
+                lines += structure_lines(sub, f'{base}/{name}', depth + 1, collapse)
+    return lines
+
+def update_toc(trees, write=True):
+    """
+    Regenerate the site structure section of TOC.md from the scanned
+    sections ({section: Folder}); returns True if it changed.
+    """
+    lines = [TOC_START, '']
+    for section, tree in trees.items():
+        lines += [f'### {tree.title()} (`{SECTIONS[section]}`)', '']
+        lines += structure_lines(tree, SECTIONS[section])
+        lines.append('')
+    lines.append(TOC_END)
+    block = '\n'.join(lines)
+
+    text = TOC_FILE.read_text(encoding='utf-8')
+    if TOC_START in text and TOC_END in text:
+        start = text.index(TOC_START)
+        end = text.index(TOC_END) + len(TOC_END)
+        new_text = text[:start] + block + text[end:]
+    else:
+        new_text = text.rstrip('\n') + '\n\n## Site Structure\n\n' + block + '\n'
+    if new_text == text:
+        return False
+    if write:
+        TOC_FILE.write_text(new_text, encoding='utf-8')
+    return True
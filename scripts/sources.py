@@ -0,0 +1,221 @@
+"""
+Registry of import inputs with checksums.
+
+scripts/sources.json names every input the importers and validators read:
+
+    "spells-markdown": {
+      "path": "pdfs/spells_markdown.md",
+      "format": "text",
+      "sha256": null
+    }
+
+path is relative to the repo root. format is one of text, gzip, zip or tar
+(compressed tars included); for zip and tar sources, "member" names the
+file inside the archive. Archives are read by streaming the member, never
+by extracting to disk, so versioned source bundles can be used as-is:
+
+    "spells-markdown": {
+      "path": "pdfs/srd-5.2.1-markdown.tar.gz",
+      "format": "tar",
+      "member": "dndsrd5.2_markdown/src/spells.md"
+    }
+
+sha256 is the checksum of the source content (the member, for archives).
+When set, reading a source whose content has a different checksum fails,
+so a build can't silently run against the wrong bundle.
+
+Importers call unchanged_since_import() before parsing and skip the run
+when none of their inputs changed since their last successful import;
+record_import() stores the checksums after a run. Checksums of loose files
+are cached by size and mtime in .cache/sources-state.json, so the check is a
+stat per input unless something actually changed.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import zipfile
+from contextlib import contextmanager
+
+from corpus import ROOT
+
+REGISTRY_FILE = ROOT / 'scripts' / 'sources.json'
+STATE_FILE = ROOT / '.cache' / 'sources-state.json'
+
+FORMATS = ['text', 'gzip', 'zip', 'tar']
+CHUNK_SIZE = 1 << 20
+
+class SourceError(Exception):
+    """A registered source is missing, unreadable or fails its checksum."""
+
+def load_registry():
+    with open(REGISTRY_FILE) as f:
+        return json.load(f)
+
+def save_registry(registry):
+    with open(REGISTRY_FILE, 'w') as f:
+        json.dump(registry, f, indent=2)
+        f.write('\n')
+
+def _load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_state(state):
+    STATE_FILE.parent.mkdir(exist_ok=True)
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def guess_format(path):
+    """Format from a file name: .gz -> gzip, .zip -> zip, .tar/.tgz/.tar.* -> tar."""
+    name = str(path).lower()
+    if name.endswith(('.tar', '.tgz', '.tar.gz', '.tar.bz2', '.tar.xz')):
+        return 'tar'
+    if name.endswith('.gz'):
+        return 'gzip'
+    if name.endswith('.zip'):
+        return 'zip'
+    return 'text'
+
+def get_source(name):
+    """Registry entry for a source, with its absolute path filled in."""
+    registry = load_registry()
+    if name not in registry:
+        raise SourceError(f"unknown source {name!r} (see {REGISTRY_FILE.relative_to(ROOT)})")
+    entry = dict(registry[name])
+    entry['name'] = name
+    entry['abspath'] = ROOT / entry['path']
+    entry.setdefault('format', guess_format(entry['path']))
+    if entry['format'] not in FORMATS:
+        raise SourceError(f"{name}: unknown format {entry['format']!r}")
+    if entry['format'] in ('zip', 'tar') and not entry.get('member'):
+        raise SourceError(f"{name}: {entry['format']} sources need a 'member'")
+    return entry
+
+@contextmanager
+def _open_binary(entry):
+    path = entry['abspath']
+    if not path.exists():
+        raise SourceError(f"{entry['name']}: {entry['path']} not found")
+    fmt = entry['format']
+    if fmt == 'text':
+        with open(path, 'rb') as f:
+            yield f
+    elif fmt == 'gzip':
+        with gzip.open(path, 'rb') as f:
+            yield f
+    elif fmt == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            try:
+                with archive.open(entry['member']) as f:
+                    yield f
+            except KeyError:
+                raise SourceError(f"{entry['name']}: {entry['member']} not in {entry['path']}")
+    else:
+        with tarfile.open(path, 'r:*') as archive:
+            try:
+                f = archive.extractfile(entry['member'])
+            except KeyError:
+                f = None
+            if f is None:
+                raise SourceError(f"{entry['name']}: {entry['member']} not in {entry['path']}")
+            with f:
+                yield f
+
+def _stat_key(entry):
+    st = os.stat(entry['abspath'])
+    return [entry['path'], entry.get('member'), st.st_size, st.st_mtime_ns]
+
+def source_digest(name):
+    """SHA-256 of a source's content, from the stat cache when the file is unchanged."""
+    entry = get_source(name)
+    if not entry['abspath'].exists():
+        raise SourceError(f"{name}: {entry['path']} not found")
+    state = _load_state()
+    cached = state.get('digests', {}).get(name)
+    key = _stat_key(entry)
+    if cached and cached['stat'] == key:
+        return cached['sha256']
+
+    digest = hashlib.sha256()
+    with _open_binary(entry) as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    state.setdefault('digests', {})[name] = {'stat': key, 'sha256': digest.hexdigest()}
+    _save_state(state)
+    return digest.hexdigest()
+
+def _check_pinned(entry, digest):
+    pinned = entry.get('sha256')
+    if pinned and pinned != digest:
+        raise SourceError(
+            f"{entry['name']}: checksum mismatch for {entry['path']} "
+            f"(registry {pinned[:12]}, file {digest[:12]})"
+        )
+
+def read_source(name):
+    """Read a source as text, streaming it out of its archive if needed."""
+    entry = get_source(name)
+    with _open_binary(entry) as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    _check_pinned(entry, digest)
+
+    state = _load_state()
+    state.setdefault('digests', {})[name] = {'stat': _stat_key(entry), 'sha256': digest}
+    _save_state(state)
+    return data.decode('utf-8')
+
+@contextmanager
+def open_source(name):
+    """Open a source as a text stream (for line-by-line readers)."""
+    entry = get_source(name)
+    if entry.get('sha256'):
+        _check_pinned(entry, source_digest(name))
+    with _open_binary(entry) as f:
+        yield io.TextIOWrapper(f, encoding='utf-8')
+
+def unchanged_since_import(importer, names):
+    """True when every source in names has the checksum it had at importer's last run."""
+    previous = _load_state().get('imports', {}).get(importer)
+    if not previous:
+        return False
+    try:
+        return all(previous.get(name) == source_digest(name) for name in names)
+    except SourceError:
+        return False
+
+def record_import(importer, names):
+    """Remember the checksums of the sources an importer just processed."""
+    digests = {name: source_digest(name) for name in names}
+    state = _load_state()
+    state.setdefault('imports', {})[importer] = digests
+    _save_state(state)
+
+def register(name, path, fmt=None, member=None, description=None):
+    """Add or update a registry entry and pin its current checksum."""
+    registry = load_registry()
+    entry = registry.get(name, {})
+    entry['path'] = os.path.relpath(os.path.abspath(path), ROOT)
+    entry['format'] = fmt or guess_format(path)
+    if member:
+        entry['member'] = member
+    else:
+        entry.pop('member', None)
+    if description:
+        entry['description'] = description
+    entry['sha256'] = None
+    registry[name] = entry
+    save_registry(registry)
+
+    entry['sha256'] = source_digest(name)
+    registry[name] = entry
+    save_registry(registry)
+    return entry
@@ -0,0 +1,121 @@
+"""
+Spell block parsing for SRD text.
+
+parse_spell_block() reads one SRD spell entity (heading line first, as
+srd_index slices it) and returns the fields import-spells.py writes to
+frontmatter, plus the description without its higher-level paragraph:
+
+    level, school, classes, castingTime, range, components {verbal,
+    somatic, material}, duration, concentration, ritual, higherLevel,
+    description
+
+Field lines may wrap: a line that isn't a "Label:" line is joined onto the
+field before it, as long as another label follows within the first lines
+of the block (or the field still has an unclosed parenthesis, for a
+wrapped material component that ends the fields). The example in
+parse_spell_block() runs with python -m doctest scripts/spell_block.py.
+
+Used by validate-spells.py and srd-diff.py.
+"""
+
+import re
+
+INFO_RE = re.compile(r'^\s*(?:Level\s+(\d+)\s+(\w+)|(\w+)\s+Cantrip)\s+\(([^)]+)\)')
+FIELD_RE = re.compile(r'^\s*(Casting Time|Range|Components?|Duration):\s*(.*?)\s*$')
+MATERIAL_RE = re.compile(r'\bM\s*\((.+)\)\s*$', re.DOTALL)
+HIGHER_RE = re.compile(r'(?:Using a Higher-Level Spell Slot|Cantrip Upgrade)\.\s*(.+)', re.DOTALL)
+RITUAL_RE = re.compile(r'\s+or\s+Ritual\b', re.IGNORECASE)
+FIELD_KEYS = {
+    'Casting Time': 'castingTime',
+    'Range': 'range',
+    'Component': 'components',
+    'Components': 'components',
+    'Duration': 'duration',
+}
+# Lines after the level/school line that can hold the fields, wrapped or not
+FIELD_WINDOW = 10
+
+def _field_lines(lines):
+    """[(label, text)] of the field lines at the top of a block, and where the body starts."""
+    window = lines[2:2 + FIELD_WINDOW]
+    labels = []
+    for i, line in enumerate(window):
+        field = FIELD_RE.match(line)
+        if field:
+            labels.append(i)
+            # Duration is always the last field
+            if field.group(1) == 'Duration':
+                break
+    if not labels or labels[0] != 0:
+        return [], 2
+
+    fields = []
+    for line in window[:labels[-1] + 1]:
+        field = FIELD_RE.match(line)
+        if field:
+            fields.append([field.group(1), field.group(2)])
+        elif line.strip():
+            fields[-1][1] += ' ' + line.strip()
+    end = labels[-1] + 1
+    # The last field wraps past the last label only inside parentheses
+    while (end < len(window) and window[end].strip()
+           and fields[-1][1].count('(') > fields[-1][1].count(')')):
+        fields[-1][1] += ' ' + window[end].strip()
+        end += 1
+    return fields, 2 + end
+
+def parse_spell_block(block):
+    """
+    Parse one SRD spell entity (heading line first) into a field dict.
+
+    >>> spell = parse_spell_block('\\n'.join([
+    ...     'Raise Dead',
+    ...     'Level 5 Necromancy (Bard, Cleric, Paladin)',
+    ...     'Casting Time: 1 hour',
+    ...     'Range: Touch',
+    ...     'Components: V, S, M (a diamond worth 500+ GP, which the',
+    ...     'spell consumes)',
+    ...     'Duration: Instantaneous',
+    ...     'With a touch, you revive a dead creature.']))
+    >>> spell['components']['material'], spell['duration'], spell['description']
+    ('a diamond worth 500+ GP, which the spell consumes', 'Instantaneous', 'With a touch, you revive a dead creature.')
+    """
+    lines = block.replace('\r\n', '\n').split('\n')
+    info = INFO_RE.match(lines[1]) if len(lines) > 1 else None
+    if not info:
+        return None
+    level, school, cantrip_school, classes = info.groups()
+    spell = {
+        'level': int(level) if level else 0,
+        'school': school or cantrip_school,
+        'classes': [c.strip() for c in classes.split(',')],
+    }
+
+    fields, body_start = _field_lines(lines)
+    for label, text in fields:
+        spell[FIELD_KEYS[label]] = text.strip()
+
+    casting_time = spell.get('castingTime', '')
+    spell['ritual'] = bool(RITUAL_RE.search(casting_time))
+    spell['castingTime'] = RITUAL_RE.sub('', casting_time).strip()
+    spell['concentration'] = 'Concentration' in spell.get('duration', '')
+
+    components = spell.pop('components', '')
+    material = MATERIAL_RE.search(components)
+    head = components.split('(')[0]
+    spell['components'] = {
+        'verbal': 'V' in head,
+        'somatic': 'S' in head,
+    }
+    if material:
+        spell['components']['material'] = material.group(1).strip()
+    elif 'M' in [c.strip() for c in head.split(',')]:
+        spell['components']['material'] = 'required'
+
+    description = '\n'.join(lines[body_start:]).strip()
+    higher = HIGHER_RE.search(description)
+    if higher:
+        spell['higherLevel'] = higher.group(1).strip()
+        description = description[:higher.start()].strip()
+    spell['description'] = description
+    return spell
@@ -0,0 +1,275 @@
+"""
+Structured effect extraction for spell descriptions.
+
+Pulls damage dice and types, saving throws, attack type, area of effect,
+applied conditions, costly material components and higher-level scaling out
+of the spell text so they can be stored as typed frontmatter fields.
+
+Used by import-spells.py, extract-spells.py and extract-spell-effects.py.
+"""
+
+import re
+
+DAMAGE_TYPES = ['Acid', 'Bludgeoning', 'Cold', 'Fire', 'Force', 'Lightning', 'Necrotic',
+                'Piercing', 'Poison', 'Psychic', 'Radiant', 'Slashing', 'Thunder']
+
+ABILITIES = ['Strength', 'Dexterity', 'Constitution', 'Intelligence', 'Wisdom', 'Charisma']
+
+CONDITIONS = ['Blinded', 'Charmed', 'Deafened', 'Exhaustion', 'Frightened', 'Grappled',
+              'Incapacitated', 'Invisible', 'Paralyzed', 'Petrified', 'Poisoned', 'Prone',
+              'Restrained', 'Stunned', 'Unconscious']
+
+AREA_SHAPES = ['Cone', 'Cube', 'Cylinder', 'Emanation', 'Line', 'Sphere']
+
+# Frontmatter keys written by this module, in output order
+EFFECT_KEYS = ['damage', 'save', 'attackType', 'area', 'conditions', 'materialCost', 'scaling']
+
+_TYPES = '|'.join(DAMAGE_TYPES)
+_DICE = r'\d+d\d+(?: ?[+-] ?\d+)?'
+
+# "8d6 Fire damage", "5d10 Radiant or Necrotic damage"
+DAMAGE_RE = re.compile(rf'({_DICE}) ((?:{_TYPES})(?:(?:, | or | and )(?:{_TYPES}))*) damage')
+SAVE_RE = re.compile(rf'\b({"|".join(ABILITIES)}) saving throw')
+ATTACK_RE = re.compile(r'\b(melee|ranged) spell attack', re.IGNORECASE)
+_CONDITIONS = '|'.join(CONDITIONS)
+# Phrasing that imposes a condition: "has the Prone and Incapacitated
+# conditions", "or have the Blinded or Deafened condition", "is Petrified"
+CONDITION_RE = re.compile(
+    rf'\b(?:has|have|gains?) the ((?:{_CONDITIONS})(?:(?:,? and |,? or |, )(?:{_CONDITIONS}))*)'
+    rf' conditions?\b(?! removed)'
+    rf'|\b(?:is|are|becomes?|falls?) ({_CONDITIONS})\b'
+)
+# Earlier in the same clause (since the last comma), these make a mention
+# something other than the spell imposing the condition: ending or removing
+# it, immunity, "can't be", "Advantage on saving throws ... to avoid"
+NOT_IMPOSED_RE = re.compile(
+    r"\b(?:ends?|ending|remov\w*|immun\w*|can't|cannot|neither|nor)\b(?! of)"
+    r'|\bAdvantage on (?:any )?(?:new )?saving throws\b',
+    re.IGNORECASE,
+)
+# "if it has the Invisible condition", "objects that have", "that is possessed by or has"
+CONDITIONAL_RE = re.compile(r'\b(?:if|that|who)\s+(?:[\w\']+\s+){0,4}$', re.IGNORECASE)
+CLAUSE_RE = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+# "20-foot-radius Sphere", "10-foot-radius, 40-foot-high Cylinder", "15-foot Cone"
+AREA_RE = re.compile(
+    rf'(\d+)[- ]foot(?:-radius)?(?:, \d+[- ]foot[- ]?(?:high|tall))? ({"|".join(AREA_SHAPES)})s?\b'
+)
+# "100-foot-long, 5-foot-wide Line" or "5-foot-wide, 60-foot-long Line"
+LINE_RE = re.compile(r'(\d+)-foot-(long|wide), (\d+)-foot-(long|wide) Line')
+CYLINDER_RE = re.compile(r'\d+[- ]foot[- ]?(?:high|tall), (\d+)-foot-radius Cylinder')
+
+GP_RE = re.compile(r'worth ([\d,]+)\+? GP')
+
+# "The damage increases by 1d6 for each spell slot level above 3."
+SLOT_SCALING_RE = re.compile(
+    r'^(?:The |Each target\'s |Both types of )?([\w\' ]+?)(?: \([^)]*\))? increases? by (\d+d\d+|\d+)(?: \w+)?'
+    r' for (?:each|every) (?:spell )?slot level above (\d)'
+)
+# "You can target one additional creature for each spell slot level above 1."
+# "The spell creates one more dart for each spell slot level above 1."
+COUNT_SCALING_RE = re.compile(
+    r'(one|two|three|four|up to three|\d+) (?:additional|more) (?:willing )?([\w ]+?)'
+    r'(?: \([^)]*\))? for each spell slot level above (\d)'
+)
+# "The damage increases by 1d8 when you reach levels 5 (2d8), 11 (3d8), and 17 (4d8)."
+CANTRIP_SCALING_RE = re.compile(
+    r'(?:The )?([\w\' ]+?) increases? by (\d+d\d+|\d+) when you reach levels? ([\d ,()d+and]+)'
+)
+
+NUMBER_WORDS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'up to three': 3}
+
+
+def parse_damage(text):
+    """Return a list of {'dice', 'type'} dicts in order of first appearance."""
+    damage = []
+    seen = set()
+    for match in DAMAGE_RE.finditer(text):
+        dice = match.group(1).replace(' ', '')
+        for damage_type in re.split(r', | or | and ', match.group(2)):
+            key = (dice, damage_type)
+            if key not in seen:
+                seen.add(key)
+                damage.append({'dice': dice, 'type': damage_type})
+    return damage
+
+
+def parse_conditions(text):
+    """Return the conditions the text imposes, in order of first appearance."""
+    conditions = []
+    for clause in CLAUSE_RE.split(text):
+        for match in CONDITION_RE.finditer(clause):
+            before = clause[:match.start()].rsplit(',', 1)[-1]
+            if NOT_IMPOSED_RE.search(before) or CONDITIONAL_RE.search(before):
+                continue
+            for condition in re.findall(_CONDITIONS, match.group(1) or match.group(2)):
+                if condition not in conditions:
+                    conditions.append(condition)
+    return conditions
+
+
+def parse_area(text):
+    """Return the first area of effect as {'shape', 'size'} (size in feet)."""
+    line_match = LINE_RE.search(text)
+    area_match = AREA_RE.search(text)
+    cylinder_match = CYLINDER_RE.search(text)
+
+    candidates = []
+    if line_match:
+        dims = {line_match.group(2): int(line_match.group(1)), line_match.group(4): int(line_match.group(3))}
+        candidates.append((line_match.start(), {'shape': 'Line', 'size': dims.get('long'), 'width': dims.get('wide')}))
+    if area_match:
+        candidates.append((area_match.start(), {'shape': area_match.group(2), 'size': int(area_match.group(1))}))
+    if cylinder_match:
+        candidates.append((cylinder_match.start(), {'shape': 'Cylinder', 'size': int(cylinder_match.group(1))}))
+
+    if not candidates:
+        return None
+    return min(candidates, key=lambda c: c[0])[1]
+
+
+def parse_material_cost(material):
+    """Return {'gp', 'consumed'} for costly material components, else None."""
+    if not material:
+        return None
+    match = GP_RE.search(material)
+    if not match:
+        return None
+    return {
+        'gp': int(match.group(1).replace(',', '')),
+        'consumed': 'consumes' in material,
+    }
+
+
+def parse_scaling(higher_level):
+    """Parse per-slot or per-character-level scaling out of higherLevel text."""
+    if not higher_level:
+        return None
+    text = higher_level.strip()
+
+    match = SLOT_SCALING_RE.search(text)
+    if match:
+        return {
+            'by': 'slot',
+            'applies': _scaling_subject(match.group(1)),
+            'increment': match.group(2),
+            'above': int(match.group(3)),
+        }
+
+    match = COUNT_SCALING_RE.search(text)
+    if match:
+        count = match.group(1)
+        return {
+            'by': 'slot',
+            'applies': _count_subject(match.group(2)),
+            'increment': count if count.isdigit() else str(NUMBER_WORDS[count]),
+            'above': int(match.group(3)),
+        }
+
+    match = CANTRIP_SCALING_RE.search(text)
+    if match:
+        return {
+            'by': 'characterLevel',
+            'applies': _scaling_subject(match.group(1)),
+            'increment': match.group(2),
+            'levels': [int(n) for n in re.findall(r'\b(\d+) \(', match.group(3))],
+        }
+
+    return None
+
+
+def _scaling_subject(subject):
+    """Normalize 'The Cold damage', "fog's radius", 'healing and damage' to one word."""
+    subject = subject.lower()
+    for word in ['damage', 'healing', 'hit points', 'duration', 'radius', 'size', 'range']:
+        if word in subject:
+            return word.replace(' ', '')
+    return subject.split()[-1]
+
+
+def _count_subject(noun):
+    """Normalize 'creature', 'willing creatures', 'dart', 'Temporary Hit Points'."""
+    noun = noun.lower()
+    if 'creature' in noun or noun in ('beast', 'target', 'targets'):
+        return 'targets'
+    if 'hit points' in noun:
+        return 'hitpoints'
+    return noun.split()[-1].rstrip('s') + 's'
+
+
+def extract_effects(description, higher_level=None, material=None):
+    """
+    Extract structured effect fields from a spell.
+
+    Returns a dict with only the keys that were found, using the frontmatter
+    names in EFFECT_KEYS.
+    """
+    effects = {}
+
+    damage = parse_damage(description)
+    if damage:
+        effects['damage'] = damage
+
+    save_match = SAVE_RE.search(description)
+    if save_match:
+        effects['save'] = save_match.group(1)
+
+    attack_match = ATTACK_RE.search(description)
+    if attack_match:
+        effects['attackType'] = attack_match.group(1).capitalize()
+
+    area = parse_area(description)
+    if area:
+        effects['area'] = area
+
+    conditions = parse_conditions(description)
+    if conditions:
+        effects['conditions'] = conditions
+
+    material_cost = parse_material_cost(material)
+    if material_cost:
+        effects['materialCost'] = material_cost
+
+    scaling = parse_scaling(higher_level)
+    if scaling:
+        effects['scaling'] = scaling
+
+    return effects
+
+
+def effect_frontmatter_lines(effects):
+    """Render extracted effects as frontmatter lines, matching import-spells.py."""
+    lines = []
+    if 'damage' in effects:
+        lines.append('damage:')
+        for entry in effects['damage']:
+            lines.append(f"  - dice: {entry['dice']}")
+            lines.append(f"    type: {entry['type']}")
+    if 'save' in effects:
+        lines.append(f"save: {effects['save']}")
+    if 'attackType' in effects:
+        lines.append(f"attackType: {effects['attackType']}")
+    if 'area' in effects:
+        lines.append('area:')
+        for key, value in effects['area'].items():
+            if value is not None:
+                lines.append(f"  {key}: {value}")
+    if 'conditions' in effects:
+        lines.append('conditions:')
+        for condition in effects['conditions']:
+            lines.append(f"  - {condition}")
+    if 'materialCost' in effects:
+        lines.append('materialCost:')
+        lines.append(f"  gp: {effects['materialCost']['gp']}")
+        lines.append(f"  consumed: {str(effects['materialCost']['consumed']).lower()}")
+    if 'scaling' in effects:
+        scaling = effects['scaling']
+        lines.append('scaling:')
+        lines.append(f"  by: {scaling['by']}")
+        lines.append(f"  applies: {scaling['applies']}")
+        lines.append(f"  increment: \"{scaling['increment']}\"")
+        if 'above' in scaling:
+            lines.append(f"  above: {scaling['above']}")
+        if 'levels' in scaling:
+            lines.append(f"  levels: [{', '.join(str(n) for n in scaling['levels'])}]")
+    return lines
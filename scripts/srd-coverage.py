@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Map which parts of the SRD text are covered by pages.
+
+Every page's SRD spans (see page_spans.py) go into an interval tree per
+source document (see interval_tree.py), which answers three questions:
+
+  coverage   share of each SRD chapter covered by at least one page
+  uncovered  stretches of SRD text no page was derived from
+  overlaps   pages derived from the same SRD text
+
+Usage:
+  python scripts/srd-coverage.py [SOURCE...] [--uncovered N] [--overlaps]
+                                 [--json REPORT] [--rebuild]
+
+SOURCE is a name from scripts/sources.json (default: srd-text). --uncovered
+lists the N longest uncovered stretches (default 20). --json writes the
+full report; use - for stdout.
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+from body_verify import sentences
+from interval_tree import IntervalForest
+from page_spans import page_spans
+from srd_index import SrdIndex
+
+# Uncovered stretches without at least this many bytes of sentences are noise
+MIN_UNCOVERED_BYTES = 80
+
+def chapter_of(srd, pos):
+    for name, (start, end) in srd.chapters.items():
+        if start <= pos < end:
+            return name
+    return None
+
+def coverage_report(source, spans, forest):
+    srd = SrdIndex.load(source)
+    tree = forest.tree(source)
+    size = len(srd.buffer)
+
+    chapters = {}
+    for name, (start, end) in sorted(srd.chapters.items(), key=lambda c: c[1]):
+        chapters[name] = {'bytes': end - start, 'covered': tree.covered(start, end)}
+    chapters['(document)'] = {'bytes': size, 'covered': tree.covered(0, size)}
+
+    uncovered = []
+    for start, end in tree.gaps(0, size):
+        text = srd.buffer[start:end].decode('utf-8', 'replace')
+        prose = sentences(text.split('\n'))
+        if sum(len(s) for s in prose) < MIN_UNCOVERED_BYTES:
+            continue
+        uncovered.append({
+            'start': start,
+            'end': end,
+            'chapter': chapter_of(srd, start),
+            'preview': prose[0][:80],
+        })
+    uncovered.sort(key=lambda u: u['end'] - u['start'], reverse=True)
+
+    shared = defaultdict(int)
+    for page, page_ranges in spans.items():
+        for start, end in page_ranges:
+            for other_start, other_end, other in tree.overlapping(start, end):
+                if other > page:
+                    shared[(page, other)] += min(end, other_end) - max(start, other_start)
+    overlaps = [{'pages': list(pair), 'bytes': n} for pair, n in
+                sorted(shared.items(), key=lambda item: item[1], reverse=True)]
+
+    return {'source': source, 'pages': len(spans), 'chapters': chapters,
+            'uncovered': uncovered, 'overlaps': overlaps}
+
+def main():
+    parser = argparse.ArgumentParser(description='Map SRD coverage by pages.')
+    parser.add_argument('sources', nargs='*', default=['srd-text'])
+    parser.add_argument('--uncovered', type=int, default=20, metavar='N')
+    parser.add_argument('--overlaps', action='store_true', help='list pages sharing SRD text')
+    parser.add_argument('--json', metavar='REPORT')
+    parser.add_argument('--rebuild', action='store_true', help='locate every page again')
+    args = parser.parse_args()
+
+    by_source = {source: page_spans(source, args.rebuild) for source in args.sources}
+    forest = IntervalForest(
+        (source, start, end, page)
+        for source, spans in by_source.items()
+        for page, page_ranges in spans.items()
+        for start, end in page_ranges
+    )
+    reports = [coverage_report(source, by_source[source], forest) for source in args.sources]
+
+    if args.json:
+        text = json.dumps(reports, indent=2)
+        if args.json == '-':
+            print(text)
+            return 0
+        with open(args.json, 'w') as f:
+            f.write(text + '\n')
+
+    for report in reports:
+        print(f"{report['source']}: {report['pages']} pages with SRD spans\n")
+        print(f"  {'Chapter':16} {'Covered':>8}  Bytes")
+        for name, c in report['chapters'].items():
+            pct = 100 * c['covered'] / c['bytes'] if c['bytes'] else 0
+            print(f"  {name:16} {pct:7.1f}%  {c['covered']}/{c['bytes']}")
+
+        uncovered = report['uncovered']
+        if uncovered and args.uncovered:
+            print(f"\n  Uncovered ({len(uncovered)} stretches, longest first):")
+            for u in uncovered[:args.uncovered]:
+                print(f"    {u['chapter'] or '-':15} {u['start']}-{u['end']}  {u['preview']}")
+
+        if args.overlaps and report['overlaps']:
+            print(f"\n  Overlaps ({len(report['overlaps'])} page pairs):")
+            for o in report['overlaps']:
+                print(f"    {o['bytes']:6} bytes  {o['pages'][0]}  &  {o['pages'][1]}")
+        elif report['overlaps']:
+            print(f"\n  {len(report['overlaps'])} page pairs share SRD text (--overlaps to list)")
+        print()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Diff two SRD text versions entity by entity.
+
+Usage:
+  python scripts/srd-diff.py OLD NEW [--kind spell|item|monster]
+                             [--output CHANGELOG] [--verbose]
+
+OLD and NEW are names from scripts/sources.json (register the previous
+version with manage-sources.py first). The changelog (default
+.cache/srd-changelog.json) lists every added, removed, renamed and changed
+spell, magic item and stat block with its field-level changes; pass it to
+import-spells.py, import-monsters.py or import-magic-items.py with
+--changelog to regenerate only those pages. See srd_diff.py.
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from corpus import ROOT
+from sources import source_digest
+from srd_diff import KINDS, diff_entities, entity_records
+from srd_index import SrdIndex
+
+DEFAULT_OUTPUT = ROOT / '.cache' / 'srd-changelog.json'
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff two SRD text versions entity by entity.')
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--kind', choices=KINDS, action='append')
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT), metavar='CHANGELOG')
+    parser.add_argument('--verbose', action='store_true', help='show field and text changes')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    kinds = args.kind or KINDS
+    old_records = entity_records(SrdIndex.load(args.old), kinds)
+    new_records = entity_records(SrdIndex.load(args.new), kinds)
+    entries, unchanged = diff_entities(old_records, new_records)
+    elapsed = time.perf_counter() - started
+
+    changelog = {
+        'old': {'source': args.old, 'sha256': source_digest(args.old), 'entities': len(old_records)},
+        'new': {'source': args.new, 'sha256': source_digest(args.new), 'entities': len(new_records)},
+        'unchanged': unchanged,
+        'entities': entries,
+    }
+    Path(args.output).parent.mkdir(exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(changelog, f, indent=2)
+        f.write('\n')
+
+    print(f"{args.old} ({len(old_records)} entities) -> {args.new} ({len(new_records)} entities) "
+          f"in {elapsed:.2f}s")
+    counts = Counter((e['kind'], e['status']) for e in entries)
+    for kind in kinds:
+        summary = ', '.join(f"{counts[(kind, status)]} {status}"
+                            for status in ('added', 'removed', 'renamed', 'changed')
+                            if counts[(kind, status)])
+        print(f"  {kind:8} {summary or 'no changes'}")
+    print(f"  {unchanged} unchanged")
+
+    for e in entries:
+        name = f"{e['oldName']} -> {e['name']}" if e['status'] == 'renamed' else e['name']
+        print(f"\n{e['status']:8} {e['kind']:8} {name}")
+        if args.verbose:
+            for field, change in e.get('fields', {}).items():
+                print(f"    {field}: {change['old']!r} -> {change['new']!r}")
+            text = e.get('text', {})
+            for s in text.get('removed', []):
+                print(f"    - {s}")
+            for s in text.get('added', []):
+                print(f"    + {s}")
+            for a in text.get('altered', []):
+                print(f"    ~ {a['old']}\n      {a['new']}")
+
+    print(f"\nChangelog written to {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
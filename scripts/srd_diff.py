@@ -0,0 +1,193 @@
+"""
+Entity-aligned diff between two SRD text versions.
+
+Both versions are segmented by srd_index into spells, magic items and stat
+blocks. Each entity gets a normalized name key, a content fingerprint (hash
+of its normalized text without the heading) and its parsed fields (see
+spell_block.py, stat_block.py, item_info.py). Entities are then aligned in
+three hash-driven passes:
+
+    1. same kind and name key         -> unchanged, or changed
+    2. same kind and fingerprint      -> renamed
+    3. shared body shingles >= 0.6    -> renamed (and changed)
+
+Whatever is left is removed (old only) or added (new only). Changed
+entities list their field-level differences and the missing, extra and
+altered sentences (see body_verify.py).
+
+The changelog is what importers take with --changelog to regenerate only
+the affected pages:
+
+    changelog = Changelog(path, 'spell')
+    spells = [s for s in spells if changelog.wants(s['name'])]
+    for path in changelog.stale_pages('spellbook'): path.unlink()
+"""
+
+import json
+from collections import Counter, defaultdict
+
+from body_verify import align, sentences, shingles, srd_lines
+from corpus import iter_pages
+from item_info import parse_info_line
+from name_index import normalize_name
+from page_spans import page_names
+from spell_block import parse_spell_block
+from stat_block import parse_stat_block
+from verification_cache import text_hash
+
+KINDS = ['spell', 'item', 'monster']
+# Share of body shingles two differently named entities need to be a rename
+RENAME_THRESHOLD = 0.6
+
+def parse_fields(kind, text):
+    """Parsed fields of one entity, comparable between versions."""
+    if kind == 'spell':
+        fields = parse_spell_block(text) or {}
+        fields.pop('description', None)
+        return fields
+    if kind == 'monster':
+        return parse_stat_block(text)
+    lines = text.replace('\r\n', '\n').split('\n')
+    info = parse_info_line(lines[1]) if len(lines) > 1 else {}
+    info.pop('folder', None)
+    return info
+
+def entity_records(srd, kinds=KINDS):
+    """One record per named entity of the given kinds, in file order."""
+    records = []
+    for entity in srd.entities():
+        if entity.kind not in kinds or entity.chapter is None:
+            continue
+        text = srd.text(entity)
+        body = sentences(srd_lines(text, entity.kind))
+        whole = sentences(text.replace('\r\n', '\n').split('\n')[1:])
+        records.append({
+            'name': entity.name,
+            'kind': entity.kind,
+            'key': normalize_name(entity.name),
+            'fingerprint': text_hash('\n'.join(whole)),
+            'fields': parse_fields(entity.kind, text),
+            'sentences': body,
+        })
+    return records
+
+def field_changes(old, new):
+    """{field: {'old': ..., 'new': ...}} for every field that differs."""
+    changes = {}
+    for field in sorted(set(old) | set(new)):
+        if old.get(field) != new.get(field):
+            changes[field] = {'old': old.get(field), 'new': new.get(field)}
+    return changes
+
+def _entry(status, old, new):
+    entry = {'kind': (new or old)['kind'], 'status': status, 'name': (new or old)['name']}
+    if status == 'renamed':
+        entry['oldName'] = old['name']
+    if old and new and old['fingerprint'] != new['fingerprint']:
+        entry['fields'] = field_changes(old['fields'], new['fields'])
+        _, missing, extra, altered = align(new['sentences'], old['sentences'])
+        entry['text'] = {
+            'removed': missing,
+            'added': extra,
+            'altered': [{'old': s, 'new': o, 'similarity': sim} for o, s, sim in altered],
+        }
+    return entry
+
+def _body_shingles(record):
+    grams = set()
+    for sentence in record['sentences']:
+        grams |= shingles(sentence)
+    return grams
+
+def diff_entities(old_records, new_records):
+    """Align two record lists; returns (changelog entries, unchanged count)."""
+    old_by_key = {}
+    for r in old_records:
+        old_by_key.setdefault((r['kind'], r['key']), r)
+    new_by_key = {}
+    for r in new_records:
+        new_by_key.setdefault((r['kind'], r['key']), r)
+
+    entries = []
+    unchanged = 0
+    for key, new in new_by_key.items():
+        old = old_by_key.get(key)
+        if old is None:
+            continue
+        if old['fingerprint'] == new['fingerprint']:
+            unchanged += 1
+        else:
+            entries.append(_entry('changed', old, new))
+
+    old_left = [r for k, r in old_by_key.items() if k not in new_by_key]
+    new_left = [r for k, r in new_by_key.items() if k not in old_by_key]
+
+    # Renames with identical content
+    by_fingerprint = {(r['kind'], r['fingerprint']): r for r in new_left}
+    matched_new = set()
+    still_old = []
+    for old in old_left:
+        new = by_fingerprint.get((old['kind'], old['fingerprint']))
+        if new is not None and id(new) not in matched_new:
+            matched_new.add(id(new))
+            entries.append(_entry('renamed', old, new))
+        else:
+            still_old.append(old)
+    new_left = [r for r in new_left if id(r) not in matched_new]
+
+    # Renames with edited content, through a shingle inverted index
+    new_grams = [_body_shingles(r) for r in new_left]
+    postings = defaultdict(list)
+    for idx, grams in enumerate(new_grams):
+        for gram in grams:
+            postings[gram].append(idx)
+    used = set()
+    for old in still_old:
+        grams = _body_shingles(old)
+        hits = Counter(idx for gram in grams for idx in postings.get(gram, ())
+                       if idx not in used and new_left[idx]['kind'] == old['kind'])
+        best = None
+        for idx, shared in hits.most_common(3):
+            similarity = shared / max(len(grams), len(new_grams[idx]))
+            if similarity >= RENAME_THRESHOLD and (best is None or similarity > best[1]):
+                best = (idx, similarity)
+        if best is None:
+            entries.append(_entry('removed', old, None))
+        else:
+            used.add(best[0])
+            entries.append(_entry('renamed', old, new_left[best[0]]))
+
+    entries.extend(_entry('added', None, r) for idx, r in enumerate(new_left) if idx not in used)
+    entries.sort(key=lambda e: (KINDS.index(e['kind']), e['name']))
+    return entries, unchanged
+
+class Changelog:
+    """The entries of one entity kind in a changelog written by srd-diff.py."""
+
+    def __init__(self, path, kind):
+        with open(path) as f:
+            data = json.load(f)
+        entries = [e for e in data['entities'] if e['kind'] == kind]
+        self.entries = entries
+        self.regenerate = {normalize_name(e['name']) for e in entries if e['status'] != 'removed'}
+        self.removed = {normalize_name(e.get('oldName', e['name'])) for e in entries
+                        if e['status'] in ('removed', 'renamed')}
+
+    def wants(self, name):
+        """True if the entity with this name was added, changed or renamed."""
+        return normalize_name(name) in self.regenerate
+
+    def _pages(self, section, keys):
+        for page, path, data, _ in iter_pages(section):
+            for name in page_names(section, page, data):
+                if name and normalize_name(name) in keys:
+                    yield normalize_name(name), path
+                    break
+
+    def stale_pages(self, section):
+        """Paths of pages for entities that were removed or renamed away."""
+        return [path for _, path in self._pages(section, self.removed - self.regenerate)]
+
+    def current_pages(self, section):
+        """{normalized name: path} of existing pages for entities to regenerate."""
+        return dict(self._pages(section, self.regenerate))
@@ -0,0 +1,221 @@
+"""
+Section and entity span index for the SRD text sources.
+
+Segmenting the SRD once finds the chapters the tools care about (spells,
+rules-glossary, magic-items, monsters, animals) and every entity heading (a
+spell, item or stat block name, with or without its "12." numbering),
+recognized by the line that follows it:
+
+    spell     "Level 3 Evocation (Sorcerer, Wizard)" / "Evocation Cantrip (...)"
+    item      "Wondrous Item, Rare (Requires Attunement)"
+    monster   "Large Dragon (Chromatic), Chaotic Evil"
+
+Chapters are located from their entities and the chapter title lines
+around them, so no line numbers are hard-coded. The byte spans are saved
+to .cache/srd-index-<source>.json together with the source's SHA-256 and
+reused until the source changes. Offsets refer to the source's normalized
+text (see text_normalize.py), which tools mmap to slice out just the
+section or entity they need:
+
+    srd = SrdIndex.load('srd-text')
+    text = srd.section_text('spells')
+    for entity in srd.entities(kind='monster', chapter='monsters'):
+        block = srd.text(entity)
+"""
+
+import json
+import mmap
+import re
+from collections import namedtuple
+
+from corpus import ROOT
+from name_index import normalize_name
+from sources import source_digest
+from text_normalize import NORMALIZE_VERSION, normalized_path
+
+CACHE_DIR = ROOT / '.cache'
+# Bump when segmentation rules change
+INDEX_VERSION = 2
+
+Entity = namedtuple('Entity', ['name', 'kind', 'chapter', 'start', 'end'])
+
+SIGNATURES = [
+    ('spell', re.compile(
+        rb'^\s*(?:Level \d+ \w+|\w+ Cantrip) \([^)]+\)')),
+    ('item', re.compile(
+        rb'^\s*\*?(?:Armor|Potion|Ring|Rod|Scroll|Staff|Wand|Weapon|Wondrous Item)\b'
+        rb'.*\b(?:Common|Uncommon|Rare|Legendary|Artifact|Rarity Varies)\b', re.IGNORECASE)),
+    ('monster', re.compile(
+        rb'^\s*\*?(?:Tiny|Small|Medium|Large|Huge|Gargantuan)\b.*\b(?:Aberration|Beast|Celestial|'
+        rb'Construct|Dragon|Elemental|Fey|Fiend|Giant|Humanoid|Monstrosity|Ooze|Plant|Undead)\b')),
+]
+
+HEADING_RE = re.compile(rb'^\s*(?:\d+\.\s+)?([A-Z][^\r\n]{0,78}?)\s*$')
+
+# Chapter title lines that can bound a chapter
+CHAPTER_TITLES = [
+    'playing the game', 'character creation', 'classes', 'character origins',
+    'feats', 'equipment', 'spells', 'rules glossary', 'gameplay toolbox',
+    'magic items', 'monsters', 'animals',
+]
+
+def iter_lines(buf):
+    """Yield (offset, line bytes without newline) for every line."""
+    pos = 0
+    size = len(buf)
+    while pos < size:
+        end = buf.find(b'\n', pos)
+        if end == -1:
+            end = size
+        yield pos, buf[pos:end].rstrip(b'\r')
+        pos = end + 1
+
+def segment(buf):
+    """Return ({chapter: (start, end)}, [Entity]) for an SRD text buffer."""
+    titles = {}
+    headings = []  # (offset, name, kind)
+    prev = None
+    for offset, line in iter_lines(buf):
+        stripped = line.strip().decode('utf-8', 'replace').lower()
+        if stripped in CHAPTER_TITLES:
+            titles.setdefault(stripped, []).append(offset)
+        if prev is not None:
+            for kind, pattern in SIGNATURES:
+                if pattern.match(line):
+                    heading = HEADING_RE.match(prev[1])
+                    if heading:
+                        name = heading.group(1).decode('utf-8', 'replace').strip('*_ ')
+                        headings.append((prev[0], name, kind))
+                    break
+        prev = (offset, line)
+
+    size = len(buf)
+    all_titles = sorted(o for offsets in titles.values() for o in offsets)
+
+    def last_title_before(title, pos, floor=0):
+        found = [o for o in titles.get(title, []) if floor <= o <= pos]
+        return found[-1] if found else None
+
+    def next_title_after(pos):
+        return next((o for o in all_titles if o > pos), size)
+
+    chapters = {}
+
+    def add_chapter(name, title, kind, after=0):
+        offsets = [o for o, _, k in headings if k == kind and o >= after]
+        if not offsets:
+            return
+        first, last = offsets[0], offsets[-1]
+        start = last_title_before(title, first, after)
+        start = first if start is None else start
+        chapters[name] = (start, next_title_after(last))
+
+    add_chapter('spells', 'spells', 'spell')
+    add_chapter('magic-items', 'magic items', 'item')
+    after = max((end for _, end in chapters.values()), default=0)
+    add_chapter('monsters', 'monsters', 'monster', after=after)
+
+    if 'monsters' in chapters:
+        start, end = chapters['monsters']
+        animals = [o for o in titles.get('animals', []) if o > start]
+        animal_heads = [o for o, _, k in headings if k == 'monster' and animals and o > animals[0]]
+        if animals and animal_heads:
+            chapters['monsters'] = (start, animals[0])
+            chapters['animals'] = (animals[0], next_title_after(animal_heads[-1]))
+
+    if 'magic-items' in chapters:
+        floor = chapters.get('spells', (0, 0))[1]
+        start = last_title_before('rules glossary', chapters['magic-items'][0], floor)
+        if start is not None:
+            chapters['rules-glossary'] = (start, next_title_after(start))
+
+    def chapter_of(pos):
+        for name, (start, end) in chapters.items():
+            if start <= pos < end:
+                return name, end
+        return None, size
+
+    entities = []
+    for i, (offset, name, kind) in enumerate(headings):
+        chapter, chapter_end = chapter_of(offset)
+        next_start = headings[i + 1][0] if i + 1 < len(headings) else size
+        entities.append(Entity(name, kind, chapter, offset, min(next_start, chapter_end)))
+    return chapters, entities
+
+def _open_buffer(source):
+    """The normalized source bytes (see text_normalize.py), memory-mapped."""
+    with open(normalized_path(source), 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+class SrdIndex:
+    """Chapter and entity spans over one registered SRD text source."""
+
+    def __init__(self, source, chapters, entities, buf=None):
+        self.source = source
+        self.chapters = chapters
+        self._entities = entities
+        self._by_name = {}
+        for entity in entities:
+            self._by_name.setdefault(normalize_name(entity.name), []).append(entity)
+        self._buf = buf
+
+    @classmethod
+    def load(cls, source='srd-text', rebuild=False):
+        """Load the index for a source, rebuilding it if the source changed."""
+        digest = source_digest(source)
+        cache_file = CACHE_DIR / f'srd-index-{source}.json'
+        if not rebuild and cache_file.exists():
+            with open(cache_file) as f:
+                data = json.load(f)
+            if (data.get('sha256') == digest and data.get('version') == INDEX_VERSION
+                    and data.get('normalize') == NORMALIZE_VERSION):
+                return cls(source,
+                           {k: tuple(v) for k, v in data['chapters'].items()},
+                           [Entity(*e) for e in data['entities']])
+
+        buf = _open_buffer(source)
+        chapters, entities = segment(buf)
+        index = cls(source, chapters, entities, buf)
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(cache_file, 'w') as f:
+            json.dump({
+                'version': INDEX_VERSION,
+                'normalize': NORMALIZE_VERSION,
+                'sha256': digest,
+                'chapters': chapters,
+                'entities': [list(e) for e in entities],
+            }, f)
+        return index
+
+    @property
+    def buffer(self):
+        """The source bytes, opened on first use."""
+        if self._buf is None:
+            self._buf = _open_buffer(self.source)
+        return self._buf
+
+    def _decode(self, start, end):
+        return self.buffer[start:end].decode('utf-8', 'replace')
+
+    def section_text(self, *names):
+        """Text of one or more chapters, in file order. Missing chapters are skipped."""
+        spans = sorted(self.chapters[n] for n in names if n in self.chapters)
+        return ''.join(self._decode(start, end) for start, end in spans)
+
+    def entities(self, kind=None, chapter=None):
+        """Entities in file order, optionally filtered by kind and chapter."""
+        return [e for e in self._entities
+                if (kind is None or e.kind == kind) and (chapter is None or e.chapter == chapter)]
+
+    def entity(self, name, kind=None):
+        """The first entity with this (normalized) name, or None."""
+        for entity in self._by_name.get(normalize_name(name), []):
+            if kind is None or entity.kind == kind:
+                return entity
+        return None
+
+    def text(self, entity):
+        """Text of one entity, from its heading to the next heading."""
+        return self._decode(entity.start, entity.end)
@@ -0,0 +1,136 @@
+"""
+Stat block parsing shared by the monster importer and validator.
+
+parse_stat_block() reads a plain-text SRD stat block line by line and
+returns the same fields import-monsters.py writes to frontmatter:
+
+    size, creatureType, alignment, ac, hp {average, formula},
+    speed {walk, fly, swim, burrow, climb}, abilities, saves, skills,
+    senses, languages, immunities, resistances, vulnerabilities, cr, xp
+
+Each line is classified once by a single compiled field pattern, so a
+block is parsed in one pass no matter how many fields it has.
+"""
+
+import re
+
+SIZES = ['Tiny', 'Small', 'Medium', 'Large', 'Huge', 'Gargantuan']
+ABILITIES = ['str', 'dex', 'con', 'int', 'wis', 'cha']
+
+TYPE_LINE_RE = re.compile(
+    r'^\*?(Tiny|Small|Medium|Large|Huge|Gargantuan)(?:\s+or\s+\w+)?\s+([^,]+),\s*(.+?)\*?$'
+)
+FIELD_RE = re.compile(
+    r'^-?\s*\**(Armor Class|AC|Hit Points|HP|Speed|Skills|Senses|Languages|CR|Challenge|'
+    r'Immunities|Resistances|Vulnerabilities)\**\s*:?\**\s*(.*)$'
+)
+ABILITY_RE = re.compile(
+    r'\b(STR|DEX|CON|INT|WIS|CHA|Str|Dex|Con|Int|Wis|Cha)\s+(\d+)\s+([+-]\s?\d+)\s+([+-]\s?\d+)'
+)
+
+def parse_speed(speed_line):
+    """Parse speed string like '10 ft., Swim 40 ft.'"""
+    result = {}
+    # Walk speed (first number without prefix)
+    walk_match = re.match(r'(\d+)\s*ft\.', speed_line)
+    if walk_match:
+        result['walk'] = int(walk_match.group(1))
+    # Other speeds
+    for speed_type in ['Fly', 'Swim', 'Burrow', 'Climb']:
+        match = re.search(rf'{speed_type}\s+(\d+)\s*ft\.', speed_line, re.IGNORECASE)
+        if match:
+            result[speed_type.lower()] = int(match.group(1))
+    return result
+
+def parse_hp(hp_line):
+    """Parse HP like '150 (20d10 + 40)'"""
+    match = re.match(r'(\d+)\s*\(([^)]+)\)', hp_line)
+    if match:
+        return {
+            'average': int(match.group(1)),
+            'formula': match.group(2).strip()
+        }
+    return None
+
+def parse_cr(cr_line):
+    """Parse CR like '10 (XP 5,900, or 7,200 in lair)'"""
+    cr_match = re.match(r'([\d/]+)', cr_line)
+    xp_match = re.search(r'XP\s*([\d,]+)', cr_line)
+    cr = cr_match.group(1) if cr_match else None
+    xp = int(xp_match.group(1).replace(',', '')) if xp_match else None
+    return cr, xp
+
+def proficient_saves(abilities, save_values):
+    """Keep only saves that differ from the plain modifier (proficiency)."""
+    return {
+        stat: save for stat, save in save_values.items()
+        if stat in abilities and save != (abilities[stat] - 10) // 2
+    }
+
+def _split(value, sep):
+    return [part.strip() for part in value.split(sep) if part.strip()]
+
+def parse_stat_block(text):
+    """
+    Parse a plain-text stat block (heading line first) into frontmatter fields.
+
+    Returns a dict with only the fields found.
+    """
+    block = {}
+    text = text.replace('\r\n', '\n').replace('−', '-').replace('–', '-')
+    lines = text.split('\n')
+
+    for line in lines[1:]:
+        line = line.strip()
+        if not line:
+            continue
+        if 'size' not in block:
+            type_match = TYPE_LINE_RE.match(line)
+            if type_match:
+                block['size'] = type_match.group(1)
+                block['creatureType'] = type_match.group(2).strip()
+                block['alignment'] = type_match.group(3).strip()
+                continue
+
+        match = FIELD_RE.match(line)
+        if not match:
+            continue
+        field, value = match.group(1), match.group(2).strip()
+        if field in ('Armor Class', 'AC'):
+            ac = re.match(r'(\d+)', value)
+            if ac:
+                block['ac'] = int(ac.group(1))
+        elif field in ('Hit Points', 'HP'):
+            hp = parse_hp(value)
+            if hp:
+                block['hp'] = hp
+        elif field == 'Speed':
+            block['speed'] = parse_speed(value)
+        elif field == 'Skills':
+            block['skills'] = _split(value, ',')
+        elif field == 'Senses':
+            block['senses'] = _split(value, ';')
+        elif field == 'Languages':
+            # "—" in older stat blocks, "None" in the 5.2.1 SRD
+            if value and value != '—' and value.lower() != 'none':
+                block['languages'] = _split(value, ',')
+        elif field in ('CR', 'Challenge'):
+            block['cr'], block['xp'] = parse_cr(value)
+        else:
+            block[field.lower()] = _split(value, ',')
+
+    abilities = {}
+    save_values = {}
+    for match in ABILITY_RE.finditer(text):
+        stat = match.group(1).lower()
+        if stat in abilities:
+            continue
+        abilities[stat] = int(match.group(2))
+        save_values[stat] = int(match.group(4).replace(' ', ''))
+    if abilities:
+        block['abilities'] = abilities
+        saves = proficient_saves(abilities, save_values)
+        if saves:
+            block['saves'] = saves
+
+    return block
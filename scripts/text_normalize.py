@@ -0,0 +1,167 @@
+"""
+One normalization stage for text extracted from the SRD PDF and docx.
+
+Extraction leaves artifacts every parser used to clean up on its own:
+ligatures, soft hyphens, non-breaking and zero-width spaces, CRLF line
+ends, page footers ("212   System Reference Document 5.2.1"), running
+headers, bare page numbers and words hyphenated across a line break.
+normalize_source() removes them in one pass:
+
+  characters  str.translate with SOURCE_TRANSLATION (typography such as
+              curly quotes and em dashes is kept, pages are built from it)
+  lines       classify_lines() tags every line as text, footer, header or
+              page-number and the non-text lines are dropped
+  words       a word split as "hyp-" / "henated" is joined; the hyphen is
+              kept when the hyphenated form occurs elsewhere in the source
+              ("ten-foot"), dropped otherwise
+
+Leading indentation is preserved, since layout-based parsers
+(extract-spells.py) depend on it.
+
+The result is cached per source in .cache/normalized-<source>.txt with the
+source checksum, so the work is done once per source version:
+
+    text = normalized_text('srd-text')     # importers, audits
+    path = normalized_path('srd-lines')    # srd_index mmaps this file
+
+Comparisons (validators, body verification) additionally fold quotes,
+dashes and the multiplication sign with FOLD_TRANSLATION.
+"""
+
+import json
+import re
+from collections import Counter
+
+from corpus import ROOT
+from sources import read_source, source_digest
+
+CACHE_DIR = ROOT / '.cache'
+# Bump when any rule below changes, to rebuild cached normalized text
+NORMALIZE_VERSION = 2
+
+SOURCE_TRANSLATION = str.maketrans({
+    '\ufb00': 'ff', '\ufb01': 'fi', '\ufb02': 'fl', '\ufb03': 'ffi', '\ufb04': 'ffl',
+    '\ufb05': 'st', '\ufb06': 'st',
+    # non-breaking, narrow and thin spaces
+    '\u00a0': ' ', '\u202f': ' ', '\u2009': ' ', '\u2007': ' ',
+    # zero-width spaces and joiners, byte order mark
+    '\u200b': None, '\u200c': None, '\u200d': None, '\u2060': None, '\ufeff': None,
+    # line and paragraph separators
+    '\u2028': '\n', '\u2029': '\n',
+})
+# Soft hyphens only mark where a word may break; they go after de-hyphenation
+SOFT_HYPHEN = '\u00ad'
+
+FOLD_TRANSLATION = str.maketrans({
+    '‘': "'", '’': "'", '“': '"', '”': '"',
+    '–': '-', '—': '-', '−': '-', '×': 'x',
+})
+
+FOOTER_RE = re.compile(
+    r'^\s*(?:\d+\s+)?System Reference Document \d+(?:\.\d+)*(?:\s+\d+)?\s*$', re.IGNORECASE)
+PAGE_NUMBER_RE = re.compile(r'^\s*(?:Page\s+)?\d{1,4}\s*$', re.IGNORECASE)
+DIGITS_RE = re.compile(r'\d+')
+HYPHENATED_END_RE = re.compile(r'([A-Za-z]+)[-\u00ad]$')
+WORD_START_RE = re.compile(r'^(\s*)([a-z]+)(.*)$', re.DOTALL)
+HYPHENATED_WORD_RE = re.compile(r'\b[A-Za-z]+-[a-z]+\b')
+# A line that starts this many pages is a running header
+HEADER_MIN_PAGES = 3
+
+def classify_lines(lines):
+    """
+    Tag each line as 'text', 'footer', 'header' or 'page-number'.
+
+    Footers are recognized by their wording. Bare numbers only count as
+    page numbers next to a page break (a form feed or a footer), so numbers
+    in table cells survive. Headers are first lines of a page that recur
+    (with digits ignored) on at least HEADER_MIN_PAGES pages.
+    """
+    tags = ['footer' if FOOTER_RE.match(line.lstrip('\f')) else 'text' for line in lines]
+
+    page_tops = []
+    for i, line in enumerate(lines):
+        if i == 0 or line.startswith('\f') or tags[i - 1] == 'footer':
+            j = i
+            while j < len(lines) and not lines[j].strip('\f \t'):
+                j += 1
+            if j < len(lines) and tags[j] == 'text':
+                page_tops.append(j)
+    top_counts = Counter(DIGITS_RE.sub('#', lines[j].strip('\f \t')) for j in page_tops)
+    for j in page_tops:
+        if top_counts[DIGITS_RE.sub('#', lines[j].strip('\f \t'))] >= HEADER_MIN_PAGES:
+            tags[j] = 'header'
+
+    for i, line in enumerate(lines):
+        if tags[i] != 'text' or not PAGE_NUMBER_RE.match(line.lstrip('\f')):
+            continue
+        at_break = (line.startswith('\f')
+                    or (i > 0 and tags[i - 1] in ('footer', 'header'))
+                    or (i + 1 < len(lines) and (lines[i + 1].startswith('\f')
+                                                or tags[i + 1] in ('footer', 'header'))))
+        if at_break:
+            tags[i] = 'page-number'
+    return tags
+
+def dehyphenate(lines, vocabulary):
+    """
+    Join words hyphenated across line breaks, in place. A line left empty
+    by the join (the rest of the word stood alone on it) is dropped.
+    """
+    i = 0
+    while i < len(lines) - 1:
+        end = HYPHENATED_END_RE.search(lines[i])
+        start = end and WORD_START_RE.match(lines[i + 1])
+        if start:
+            indent, rest, tail = start.groups()
+            first = end.group(1)
+            soft = lines[i].endswith(SOFT_HYPHEN)
+            if not soft and f'{first}-{rest}'.lower() in vocabulary:
+                joined = f'{first}-{rest}'
+            else:
+                joined = first + rest
+            lines[i] = lines[i][:end.start()] + joined
+            tail = tail.lstrip(' ')
+            if tail:
+                lines[i + 1] = indent + tail
+            else:
+                del lines[i + 1]
+        i += 1
+    return lines
+
+def normalize_source(text):
+    """Normalized text of an extracted source (see the module docstring)."""
+    text = text.replace('\r\n', '\n').replace('\r', '\n').translate(SOURCE_TRANSLATION)
+    lines = text.split('\n')
+    tags = classify_lines(lines)
+    lines = [line.lstrip('\f') for line, tag in zip(lines, tags) if tag == 'text']
+    vocabulary = {w.lower() for w in HYPHENATED_WORD_RE.findall(text)}
+    lines = dehyphenate(lines, vocabulary)
+    return '\n'.join(line.replace(SOFT_HYPHEN, '') for line in lines)
+
+def fold(text):
+    """Text with quotes, dashes and the multiplication sign folded, for comparisons."""
+    return text.translate(FOLD_TRANSLATION)
+
+def normalized_path(source):
+    """Path of the cached normalized text of a source, rebuilt when the source changes."""
+    digest = source_digest(source)
+    text_file = CACHE_DIR / f'normalized-{source}.txt'
+    meta_file = CACHE_DIR / f'normalized-{source}.json'
+    if text_file.exists() and meta_file.exists():
+        with open(meta_file) as f:
+            meta = json.load(f)
+        if meta.get('sha256') == digest and meta.get('version') == NORMALIZE_VERSION:
+            return text_file
+
+    text = normalize_source(read_source(source))
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(text_file, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    with open(meta_file, 'w') as f:
+        json.dump({'version': NORMALIZE_VERSION, 'sha256': digest}, f)
+    return text_file
+
+def normalized_text(source):
+    """Normalized text of a source, from the cache when the source is unchanged."""
+    with open(normalized_path(source), encoding='utf-8') as f:
+        return f.read()
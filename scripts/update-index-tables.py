@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Regenerate the summary tables of index pages from the pages they list.
+
+Group index pages (dragon life stages, devils, golems, wondrous item
+categories, ...) summarize their members' CR, AC, HP, type or rarity. This
+fills those cells from the members' frontmatter (see index_tables.py). Only
+indexes whose members changed since the last run, whose folder gained or
+lost a page, or that were edited themselves, are regenerated; a page with
+no row in its folder's table is reported.
+
+Usage:
+  python scripts/update-index-tables.py [--check] [--rebuild]
+
+--check reports stale tables without writing and exits 1 if there are
+any. --rebuild ignores .cache/index-tables.json and regenerates every
+index.
+"""
+
+import argparse
+import sys
+import time
+
+from index_tables import load_pages, update_tables
+
+def main():
+    parser = argparse.ArgumentParser(description='Regenerate index page summary tables.')
+    parser.add_argument('--check', action='store_true', help="report stale tables, don't write")
+    parser.add_argument('--rebuild', action='store_true', help='regenerate every index')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    pages = load_pages()
+    updates = update_tables(pages, rebuild=args.rebuild, write=not args.check)
+    elapsed = time.perf_counter() - started
+
+    changed = [u for u in updates if u['changed']]
+    for u in changed:
+        verb = 'Stale' if args.check else 'Updated'
+        print(f"{verb} {u['file']} ({u['reason']})")
+    for u in updates:
+        for member in u['missing']:
+            print(f"  note: {u['file']} has no row for {member}")
+
+    indexes = sum(1 for p in pages.values() if p['index'])
+    print(f"\nLooked at {len(updates)} of {indexes} index pages in {elapsed:.2f}s, "
+          f"{len(changed)} {'stale' if args.check else 'updated'}")
+    return 1 if args.check and changed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Check every page's frontmatter against the zod schemas in source.config.ts.
+
+Catches the errors fumadocs-mdx would otherwise report minutes into
+`next build`: YAML that doesn't parse (unquoted colons and the like),
+missing required keys, wrong types, values outside an enum and numbers out
+of range. See frontmatter_schema.py.
+
+Usage:
+  python scripts/validate-frontmatter.py [SECTION...] [--workers N] [--json REPORT]
+
+SECTION limits the check to collection dirs (content, bestiary, spellbook,
+magicitems). --json writes {path: [[field, message]]}; use - for stdout.
+Exits 1 when any page fails.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from corpus import ROOT
+from frontmatter_schema import check_tree, load_schemas, report_page_errors
+
+def main():
+    parser = argparse.ArgumentParser(description='Check frontmatter against source.config.ts.')
+    parser.add_argument('sections', nargs='*', help='collection dirs to check (default: all)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--json', metavar='REPORT')
+    args = parser.parse_args()
+
+    collections = load_schemas()
+    unknown = [s for s in args.sections if s not in collections]
+    if unknown:
+        parser.error(f"not a collection in source.config.ts: {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    failures = check_tree(args.sections or None, args.workers)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        report = {os.path.relpath(path, ROOT): errors for path, errors in sorted(failures.items())}
+        text = json.dumps(report, indent=2)
+        if args.json == '-':
+            print(text)
+            return 1 if failures else 0
+        with open(args.json, 'w') as f:
+            f.write(text + '\n')
+
+    for path, errors in sorted(failures.items()):
+        report_page_errors(os.path.relpath(path, ROOT), errors)
+
+    checked = ', '.join(args.sections or collections)
+    if failures:
+        print(f"\n{len(failures)} pages fail the schema ({checked}) in {elapsed:.2f}s")
+        return 1
+    print(f"✓ All frontmatter matches source.config.ts ({checked}) in {elapsed:.2f}s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,147 +1,175 @@
 #!/usr/bin/env python3
-"""Validate monster frontmatter against SRD extracted text."""
-
-import os
+"""
+Validate monster frontmatter against SRD stat blocks.
+
+Every stat block in the SRD monster and animal chapters is parsed once (see
+stat_block.py) and every bestiary page, including reorganized dragon,
+devil and group folders, is paired with its SRD entry by name and compared
+field by field: size, AC, HP and formula, speeds, abilities, saves, skills,
+senses, languages, CR and XP.
+
+Usage:
+  python scripts/validate-monsters.py [--json REPORT] [--no-cache]
+
+Pages paired only by a fuzzy name match are listed but not compared.
+--json writes the full report (mismatches, unmatched pages and fuzzy name
+pairings) as JSON; use - for stdout. Verdicts are cached per page and SRD
+span (see verification_cache.py); --no-cache compares every page again.
+Exits 1 when any field differs.
+"""
+
+import json
 import re
-import yaml
-from pathlib import Path
-
-# Load SRD monster data
-SRD_FILE = "pdfs/DND-SRD-5.2.1-CC - updated.docx.txt"
-
-def parse_srd_monsters():
-    """Extract monster data from SRD text."""
+import sys
+import time
+
+from bestiary_names import get_monster_name
+from corpus import iter_pages
+from name_index import NameIndex
+from srd_index import SrdIndex
+from stat_block import parse_stat_block
+from verification_cache import VerificationCache, file_hash, text_hash
+
+# Bump when parsing or comparison rules change, to invalidate cached verdicts
+CHECKER = 'monster-fields'
+CHECKER_VERSION = 2
+
+# Frontmatter fields compared against the SRD, in report order
+FIELDS = ['size', 'ac', 'hp', 'speed', 'abilities', 'saves', 'skills',
+          'senses', 'languages', 'cr', 'xp']
+
+def srd_monster_entities(srd):
+    """Stat block entities of the SRD monster chapters as {name: entity}."""
     monsters = {}
-
-    with open(SRD_FILE, 'r') as f:
-        content = f.read()
-
-    # Find monster entries (starting at line ~18678)
-    # Pattern: "      N. Monster Name" followed by stat block
-    pattern = r'      \d+\. ([A-Z][^\n]+)\n([^\n]+(?:Beast|Dragon|Fiend|Celestial|Undead|Construct|Elemental|Fey|Giant|Humanoid|Monstrosity|Ooze|Plant|Aberration)[^\n]*)\nArmor Class: (\d+)[^\n]*\nHit Points:(\d+)[^\n]*\nSpeed: ([^\n]+)'
-
-    matches = re.findall(pattern, content, re.IGNORECASE)
-
-    for match in matches:
-        name, type_line, ac, hp, speed = match
-        name = name.strip()
-
-        # Parse size and type
-        size_match = re.match(r'(Tiny|Small|Medium|Large|Huge|Gargantuan)', type_line)
-        size = size_match.group(1) if size_match else None
-
-        # Parse CR (appears later in block)
-        cr_pattern = rf'{re.escape(name)}.*?CR: ([0-9/]+)'
-        cr_match = re.search(cr_pattern, content[content.find(name):content.find(name)+2000], re.DOTALL)
-        cr = cr_match.group(1) if cr_match else None
-
-        monsters[name] = {
-            'size': size,
-            'ac': int(ac),
-            'hp': int(hp),
-            'cr': cr
-        }
-
+    for chapter in ('monsters', 'animals'):
+        for entity in srd.entities(kind='monster', chapter=chapter):
+            monsters.setdefault(entity.name, entity)
     return monsters
 
-def parse_mdx_monster(filepath):
-    """Extract frontmatter from monster MDX file."""
-    with open(filepath, 'r') as f:
-        content = f.read()
-
-    # Extract YAML frontmatter
-    if content.startswith('---'):
-        end = content.find('---', 3)
-        if end != -1:
-            yaml_content = content[3:end]
-            try:
-                data = yaml.safe_load(yaml_content)
-                return data
-            except:
-                return None
-    return None
-
-def get_monster_name_from_path(filepath):
-    """Convert filepath to SRD monster name."""
-    # This mirrors the logic in list-bestiary.py
-    rel = str(filepath).replace('bestiary/', '').replace('.mdx', '')
-    parts = rel.split('/')
-
-    if len(parts) == 2:
-        name = parts[1].replace('-', ' ').title()
-    elif len(parts) == 3:
-        creature_type, subfolder, filename = parts
-
-        if creature_type == 'dragon' and subfolder.endswith('-dragon'):
-            color = subfolder.replace('-dragon', '').replace('-', ' ').title()
-            age = filename.replace('-', ' ').title()
-            if age == 'Wyrmling':
-                name = f"{color} Dragon Wyrmling"
-            else:
-                name = f"{age} {color} Dragon"
-        elif subfolder == 'devils':
-            if filename in ['pit-fiend', 'erinyes', 'lemure', 'imp']:
-                name = filename.replace('-', ' ').title()
-            else:
-                name = f"{filename.replace('-', ' ').title()} Devil"
-        elif subfolder == 'goblins':
-            name = f"Goblin {filename.replace('-', ' ').title()}"
-        elif subfolder == 'hobgoblins':
-            name = f"Hobgoblin {filename.replace('-', ' ').title()}"
-        elif subfolder == 'bugbears':
-            name = f"Bugbear {filename.replace('-', ' ').title()}"
-        elif subfolder == 'sphinxes':
-            name = f"Sphinx of {filename.replace('-', ' ').title()}"
-        else:
-            name = filename.replace('-', ' ').title()
-    else:
-        name = parts[-1].replace('-', ' ').title()
-
-    # Handle special cases
-    special = {
-        'Saber Toothed Tiger': 'Saber-Toothed Tiger',
-        'Will O Wisp': "Will-o'-Wisp",
-        'Half Dragon': 'Half-Dragon',
+def _normalize(value):
+    """Normalize a field value so formatting differences don't count."""
+    if isinstance(value, str):
+        value = value.replace('−', '-').replace('–', '-')
+        return re.sub(r'\s+', ' ', value).strip().lower()
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    return value
+
+def _normalize_hp(hp):
+    if not isinstance(hp, dict):
+        return hp
+    return {
+        'average': hp.get('average'),
+        'formula': re.sub(r'\s+', '', str(hp.get('formula', ''))),
     }
-    return special.get(name, name)
 
-def main():
-    # Sample a subset of monsters for validation
-    sample_monsters = [
-        'bestiary/aberration/aboleth.mdx',
-        'bestiary/beast/wolf.mdx',
-        'bestiary/dragon/red-dragon/adult.mdx',
-        'bestiary/fiend/devils/pit-fiend.mdx',
-        'bestiary/undead/vampire.mdx',
-        'bestiary/giant/frost-giant.mdx',
-        'bestiary/construct/iron-golem.mdx',
-        'bestiary/celestial/solar.mdx',
-        'bestiary/elemental/elementals/fire-elemental.mdx',
-        'bestiary/monstrosity/tarrasque.mdx',
-    ]
-
-    print("Sampling 10 monsters for metadata validation...\n")
-
-    issues = []
-    for filepath in sample_monsters:
-        if not os.path.exists(filepath):
-            print(f"  SKIP: {filepath} (not found)")
+def compare_monster(ours, srd):
+    """Return [(field, ours, srd)] for every field that differs."""
+    diffs = []
+    for field in FIELDS:
+        if field not in srd:
             continue
-
-        mdx_data = parse_mdx_monster(filepath)
-        if not mdx_data:
-            print(f"  SKIP: {filepath} (parse error)")
+        our_value, srd_value = ours.get(field), srd[field]
+        if field == 'hp':
+            equal = _normalize_hp(our_value) == _normalize_hp(srd_value)
+        elif field == 'cr':
+            equal = str(our_value) == str(srd_value)
+        else:
+            equal = _normalize(our_value or None) == _normalize(srd_value or None)
+        if not equal:
+            diffs.append((field, our_value, srd_value))
+    return diffs
+
+def validate(use_cache=True):
+    """Compare every bestiary page with the SRD and return the report dict."""
+    started = time.perf_counter()
+    srd = SrdIndex.load('srd-text')
+    srd_monsters = srd_monster_entities(srd)
+    index = NameIndex(srd_monsters)
+    cache = VerificationCache(CHECKER, CHECKER_VERSION, enabled=use_cache)
+
+    report = {
+        'srdMonsters': len(srd_monsters),
+        'pages': 0,
+        'matched': 0,
+        'cached': 0,
+        'mismatches': [],
+        'unmatched': [],
+        'fuzzy': [],
+    }
+    for page, path, data, _ in iter_pages('bestiary'):
+        report['pages'] += 1
+        path_name = get_monster_name(f'bestiary/{page}.mdx')
+        match = index.resolve(path_name, data.get('title'))
+        if not match:
+            report['unmatched'].append({'page': page, 'name': path_name or data.get('title')})
+            continue
+        if not match.exact:
+            # A close name is often a different monster (Dire Wolf ~ Wolf);
+            # report the pairing, but don't compare fields or cache a verdict
+            report['fuzzy'].append({'page': page, 'name': path_name, 'srdName': match.name, 'score': match.score})
             continue
+        report['matched'] += 1
+
+        key = f'bestiary/{page}'
+        srd_text = srd.text(match.payload)
+        page_hash, srd_hash = file_hash(path), text_hash(srd_text)
+        entry = cache.lookup(key, page_hash, srd_hash)
+        if entry is None:
+            mismatches = [{
+                'page': page,
+                'srdName': match.name,
+                'field': field,
+                'ours': ours,
+                'srd': srd_value,
+            } for field, ours, srd_value in compare_monster(data, parse_stat_block(srd_text))]
+            fields = ', '.join(m['field'] for m in mismatches)
+            entry = cache.store(key, page_hash, srd_hash, 'fail' if mismatches else 'pass',
+                                mismatches, fields)
+        report['mismatches'].extend(entry['result'])
+
+    cache.save()
+    report['cached'] = cache.hits
+    report['elapsed'] = round(time.perf_counter() - started, 3)
+    return report
 
-        name = get_monster_name_from_path(filepath)
-        print(f"  {name}:")
-        print(f"    Size: {mdx_data.get('size')}")
-        print(f"    AC: {mdx_data.get('ac')}")
-        print(f"    HP: {mdx_data.get('hp', {}).get('average') if isinstance(mdx_data.get('hp'), dict) else mdx_data.get('hp')}")
-        print(f"    CR: {mdx_data.get('cr')}")
-        print()
+def main():
+    report = validate(use_cache='--no-cache' not in sys.argv)
+
+    if '--json' in sys.argv:
+        target = sys.argv[sys.argv.index('--json') + 1]
+        text = json.dumps(report, indent=2)
+        if target == '-':
+            print(text)
+            return 1 if report['mismatches'] else 0
+        with open(target, 'w') as f:
+            f.write(text + '\n')
+
+    print(f"Parsed {report['srdMonsters']} SRD stat blocks")
+    print(f"Checked {report['pages']} bestiary pages ({report['matched']} matched, "
+          f"{report['cached']} unchanged since the last run) in {report['elapsed']}s")
+
+    if report['fuzzy']:
+        print(f"\nFuzzy name matches, not compared ({len(report['fuzzy'])}):")
+        for f in report['fuzzy']:
+            print(f"  {f['page']}: {f['name']} ~ {f['srdName']} ({f['score']})")
+
+    if report['unmatched']:
+        print(f"\nNot found in SRD ({len(report['unmatched'])}):")
+        for u in report['unmatched']:
+            print(f"  {u['page']} ({u['name']})")
+
+    if report['mismatches']:
+        pages = {m['page'] for m in report['mismatches']}
+        print(f"\nMismatches ({len(report['mismatches'])} fields on {len(pages)} pages):")
+        for m in report['mismatches']:
+            print(f"  {m['page']} {m['field']}: ours={m['ours']} srd={m['srd']}")
+    else:
+        print("\n✓ All matched monsters agree with the SRD")
 
-    print("Manual spot-check against SRD recommended for these samples.")
+    return 1 if report['mismatches'] else 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
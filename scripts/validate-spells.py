@@ -1,224 +1,251 @@
 #!/usr/bin/env python3
 """
 Validate spell MDX frontmatter against SRD 5.2.1 extracted text.
-Compares: level, school, classes, casting time, range, components, duration, concentration, ritual
+
+Every spell in the SRD spell chapter (located by the SRD span index) is
+parsed with precompiled patterns and compared with its spellbook page:
+level, school, classes, casting time, range, components (including the
+material text), duration, concentration, ritual and higher-level text.
+Text fields are compared after normalizing case, whitespace, dashes and
+quotes. Structured effect fields are recomputed from the SRD text and
+reported as notes when they differ.
+
+Usage:
+  python scripts/validate-spells.py [FILES...] [--format text|json|sarif]
+                                    [--output FILE] [--no-cache]
+
+FILES limits the check to those spellbook pages (as a pre-commit hook
+would pass them). Verdicts are cached per page and SRD span (see
+verification_cache.py); --no-cache compares every page again. Exits 1
+when any error is found.
 """
 
-import os
+import json
 import re
-import yaml
+import sys
 from pathlib import Path
 
-SPELLBOOK_DIR = Path(__file__).parent.parent / "spellbook"
-SRD_FILE = Path(__file__).parent.parent / "pdfs" / "DND-SRD-5.2.1-CC - updated.docx.txt"
-
-def parse_mdx_frontmatter(filepath):
-    """Extract YAML frontmatter from MDX file."""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return None
-
-    try:
-        return yaml.safe_load(match.group(1))
-    except yaml.YAMLError:
-        return None
-
-def load_our_spells():
-    """Load all spells from our MDX files."""
+from corpus import ROOT, iter_pages
+from name_index import NameIndex
+from spell_block import parse_spell_block
+from spell_effects import EFFECT_KEYS, extract_effects
+from srd_index import SrdIndex
+from text_normalize import fold
+from verification_cache import VerificationCache, file_hash, text_hash
+
+# Bump when parsing or comparison rules change, to invalidate cached verdicts
+CHECKER = 'spell-fields'
+CHECKER_VERSION = 2
+
+SPACE_RE = re.compile(r'\s+')
+
+# Rule IDs and levels for machine-readable output
+RULES = {
+    'spell/not-in-srd': 'warning',
+    'spell/fuzzy-name': 'warning',
+    'spell/level': 'error',
+    'spell/school': 'error',
+    'spell/classes': 'error',
+    'spell/castingTime': 'error',
+    'spell/range': 'error',
+    'spell/duration': 'error',
+    'spell/concentration': 'error',
+    'spell/ritual': 'error',
+    'spell/components': 'error',
+    'spell/material': 'error',
+    'spell/higherLevel': 'warning',
+    'spell/effects': 'note',
+}
+
+def normalize_text(text):
+    """Normalize text for comparison: case, whitespace, dashes, quotes, markup."""
+    if text is None:
+        return ''
+    text = fold(str(text))
+    text = text.replace('*', '').replace('_', ' ')
+    return SPACE_RE.sub(' ', text).strip().rstrip('.').lower()
+
+def srd_spell_entities(srd):
+    """Entities of the SRD spell chapter as {name: entity}."""
     spells = {}
-    for school_dir in SPELLBOOK_DIR.iterdir():
-        if not school_dir.is_dir():
-            continue
-        for mdx_file in school_dir.glob("*.mdx"):
-            if mdx_file.name == "index.mdx":
-                continue
-            fm = parse_mdx_frontmatter(mdx_file)
-            if fm and 'title' in fm:
-                spells[fm['title'].lower()] = {
-                    'file': str(mdx_file.relative_to(SPELLBOOK_DIR.parent)),
-                    **fm
-                }
+    for entity in srd.entities(kind='spell', chapter='spells'):
+        spells.setdefault(entity.name, entity)
     return spells
 
-def parse_srd_spells():
-    """Parse spells from SRD extracted text."""
-    with open(SRD_FILE, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Remove Windows line endings
-    content = content.replace('\r\n', '\n')
-
+def field_line(path, field):
+    """Line number of a top-level frontmatter field in a page (1 if not found)."""
+    pattern = re.compile(rf'^{re.escape(field)}:')
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if number > 1 and line.startswith('---'):
+                break
+            if pattern.match(line):
+                return number
+    return 1
+
+def compare_spell(ours, srd):
+    """Return [(rule, field, ours, srd)] for every difference."""
+    diffs = []
+
+    def check(rule, field, our_value, srd_value, equal):
+        if not equal:
+            diffs.append((rule, field, our_value, srd_value))
+
+    check('spell/level', 'level', ours.get('level'), srd['level'], ours.get('level') == srd['level'])
+    check('spell/school', 'school', ours.get('school'), srd['school'],
+          normalize_text(ours.get('school')) == normalize_text(srd['school']))
+    our_classes = sorted(normalize_text(c) for c in ours.get('classes') or [])
+    srd_classes = sorted(normalize_text(c) for c in srd['classes'])
+    check('spell/classes', 'classes', ours.get('classes'), srd['classes'], our_classes == srd_classes)
+
+    for field in ('castingTime', 'range', 'duration'):
+        check(f'spell/{field}', field, ours.get(field), srd.get(field),
+              normalize_text(ours.get(field)) == normalize_text(srd.get(field)))
+
+    for field in ('concentration', 'ritual'):
+        check(f'spell/{field}', field, ours.get(field, False), srd[field],
+              bool(ours.get(field, False)) == srd[field])
+
+    our_components = ours.get('components') or {}
+    srd_components = srd['components']
+    for part in ('verbal', 'somatic'):
+        check('spell/components', 'components', f"{part}={our_components.get(part, False)}",
+              f"{part}={srd_components[part]}",
+              bool(our_components.get(part, False)) == srd_components[part])
+    our_material = our_components.get('material')
+    srd_material = srd_components.get('material')
+    check('spell/material', 'components', our_material, srd_material,
+          normalize_text(our_material) == normalize_text(srd_material))
+
+    if srd.get('higherLevel') or ours.get('higherLevel'):
+        check('spell/higherLevel', 'higherLevel', ours.get('higherLevel'), srd.get('higherLevel'),
+              normalize_text(ours.get('higherLevel')) == normalize_text(srd.get('higherLevel')))
+
+    srd_effects = extract_effects(srd['description'], srd.get('higherLevel'), srd_material)
+    for key in EFFECT_KEYS:
+        if ours.get(key) != srd_effects.get(key):
+            diffs.append(('spell/effects', key, ours.get(key), srd_effects.get(key)))
+
+    return diffs
+
+def load_our_spells(only=None):
+    """Load spellbook pages as {page id: (path, frontmatter)}."""
     spells = {}
-    lines = content.split('\n')
-
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-
-        # Match spell entry headers like "         1. Acid Arrow"
-        spell_match = re.match(r'^\s+\d+\.\s+([A-Z][A-Za-z\s\'/\-]+)$', line)
-        if spell_match:
-            spell_name = spell_match.group(1).strip()
-
-            # Skip stat blocks and non-spells
-            if spell_name in ['Animated Object', 'Otherworldly Steed', 'Draconic Spirit',
-                              'Fey Spirit', 'Shadow Spirit', 'Construct Spirit', 'Undead Spirit',
-                              'Celestial Spirit', 'Fiendish Spirit', 'Aberrant Spirit']:
-                i += 1
-                continue
-
-            # Next line should have level/school/classes
-            if i + 1 < len(lines):
-                info_line = lines[i + 1].strip()
-
-                # Parse "Level X School (Classes)" or "School Cantrip (Classes)"
-                cantrip_match = re.match(r'^(\w+)\s+Cantrip\s+\(([^)]+)\)', info_line)
-                leveled_match = re.match(r'^Level\s+(\d+)\s+(\w+)\s+\(([^)]+)\)', info_line)
-
-                spell_data = {'name': spell_name}
-
-                if cantrip_match:
-                    spell_data['level'] = 0
-                    spell_data['school'] = cantrip_match.group(1)
-                    spell_data['classes'] = [c.strip() for c in cantrip_match.group(2).split(',')]
-                elif leveled_match:
-                    spell_data['level'] = int(leveled_match.group(1))
-                    spell_data['school'] = leveled_match.group(2)
-                    spell_data['classes'] = [c.strip() for c in leveled_match.group(3).split(',')]
-                else:
-                    i += 1
-                    continue
-
-                # Parse remaining fields
-                j = i + 2
-                while j < len(lines) and j < i + 10:
-                    field_line = lines[j].strip()
-
-                    if field_line.startswith('Casting Time:'):
-                        spell_data['castingTime'] = field_line.replace('Casting Time:', '').strip()
-                    elif field_line.startswith('Range:'):
-                        spell_data['range'] = field_line.replace('Range:', '').strip()
-                    elif field_line.startswith('Component:') or field_line.startswith('Components:'):
-                        comp_str = field_line.replace('Components:', '').replace('Component:', '').strip()
-                        spell_data['components_raw'] = comp_str
-                        spell_data['verbal'] = 'V' in comp_str.split(',')[0].split('(')[0]
-                        spell_data['somatic'] = 'S' in comp_str.split('(')[0]
-                        spell_data['material'] = 'M' in comp_str.split('(')[0]
-                    elif field_line.startswith('Duration:'):
-                        dur = field_line.replace('Duration:', '').strip()
-                        spell_data['duration'] = dur
-                        spell_data['concentration'] = 'Concentration' in dur
-
-                    # Stop if we hit the next spell or description
-                    if j > i + 2 and (re.match(r'^\s+\d+\.', lines[j]) or
-                                       (not field_line.startswith(('Casting', 'Range', 'Component', 'Duration'))
-                                        and len(field_line) > 50)):
-                        break
-                    j += 1
-
-                # Check for ritual in casting time
-                spell_data['ritual'] = 'Ritual' in spell_data.get('castingTime', '')
-
-                spells[spell_name.lower()] = spell_data
-
-        i += 1
-
+    for page, path, data, _ in iter_pages('spellbook'):
+        if 'title' not in data:
+            continue
+        if only is not None and path.resolve() not in only:
+            continue
+        spells[page] = (path, data)
     return spells
 
-def compare_spells(ours, srd):
-    """Compare our spells against SRD and report differences."""
-    issues = []
-
-    for name, our_spell in sorted(ours.items()):
-        if name not in srd:
-            # Try alternate names
-            alt_name = name.replace('-', ' ').replace('/', '-')
-            if alt_name not in srd:
-                issues.append(f"NOT IN SRD: {our_spell['title']} ({our_spell['file']})")
-                continue
-            srd_spell = srd[alt_name]
-        else:
-            srd_spell = srd[name]
-
-        spell_issues = []
-
-        # Compare level
-        if our_spell.get('level') != srd_spell.get('level'):
-            spell_issues.append(f"level: ours={our_spell.get('level')} srd={srd_spell.get('level')}")
-
-        # Compare school
-        our_school = our_spell.get('school', '').lower()
-        srd_school = srd_spell.get('school', '').lower()
-        if our_school != srd_school:
-            spell_issues.append(f"school: ours={our_school} srd={srd_school}")
-
-        # Compare classes
-        our_classes = set(c.lower() for c in our_spell.get('classes', []))
-        srd_classes = set(c.lower() for c in srd_spell.get('classes', []))
-        if our_classes != srd_classes:
-            missing = srd_classes - our_classes
-            extra = our_classes - srd_classes
-            if missing:
-                spell_issues.append(f"missing classes: {missing}")
-            if extra:
-                spell_issues.append(f"extra classes: {extra}")
-
-        # Compare concentration
-        our_conc = our_spell.get('concentration', False)
-        srd_conc = srd_spell.get('concentration', False)
-        if our_conc != srd_conc:
-            spell_issues.append(f"concentration: ours={our_conc} srd={srd_conc}")
-
-        # Compare ritual
-        our_ritual = our_spell.get('ritual', False)
-        srd_ritual = srd_spell.get('ritual', False)
-        if our_ritual != srd_ritual:
-            spell_issues.append(f"ritual: ours={our_ritual} srd={srd_ritual}")
-
-        # Compare components
-        our_v = our_spell.get('components', {}).get('verbal', False)
-        our_s = our_spell.get('components', {}).get('somatic', False)
-        our_m = bool(our_spell.get('components', {}).get('material'))
-
-        if our_v != srd_spell.get('verbal', False):
-            spell_issues.append(f"verbal: ours={our_v} srd={srd_spell.get('verbal')}")
-        if our_s != srd_spell.get('somatic', False):
-            spell_issues.append(f"somatic: ours={our_s} srd={srd_spell.get('somatic')}")
-        if our_m != srd_spell.get('material', False):
-            spell_issues.append(f"material: ours={our_m} srd={srd_spell.get('material')}")
-
-        if spell_issues:
-            issues.append(f"\n{our_spell['title']} ({our_spell['file']}):")
-            for issue in spell_issues:
-                issues.append(f"  - {issue}")
-
-    return issues
+def validate(only=None, use_cache=True):
+    """Return a list of result dicts (rule, level, file, line, message)."""
+    ours = load_our_spells(only)
+    srd = SrdIndex.load('srd-text')
+    entities = srd_spell_entities(srd)
+    index = NameIndex(entities)
+    cache = VerificationCache(CHECKER, CHECKER_VERSION, enabled=use_cache)
+    results = []
+
+    def finding(rule, path, field, message):
+        return {
+            'rule': rule,
+            'level': RULES[rule],
+            'file': path.relative_to(ROOT).as_posix(),
+            'line': field_line(path, field),
+            'message': message,
+        }
+
+    for page, (path, data) in sorted(ours.items()):
+        title = data['title']
+        match = index.resolve(title)
+        if not match:
+            results.append(finding('spell/not-in-srd', path, 'title', f"{title} is not in the SRD"))
+            continue
+        if not match.exact:
+            results.append(finding('spell/fuzzy-name', path, 'title',
+                                   f"{title} paired with SRD spell {match.name} ({match.score})"))
+
+        key = f'spellbook/{page}'
+        srd_text = srd.text(match.payload)
+        page_hash, srd_hash = file_hash(path), text_hash(srd_text)
+        entry = cache.lookup(key, page_hash, srd_hash)
+        if entry is None:
+            found = []
+            spell = parse_spell_block(srd_text)
+            if spell:
+                for rule, field, our_value, srd_value in compare_spell(data, spell):
+                    found.append(finding(rule, path, field,
+                                         f"{title} {field}: ours={our_value!r} srd={srd_value!r}"))
+            errors = sorted({r['rule'].split('/')[1] for r in found if r['level'] == 'error'})
+            entry = cache.store(key, page_hash, srd_hash, 'fail' if errors else 'pass',
+                                found, ', '.join(errors))
+        results.extend(entry['result'])
+
+    cache.save(full=only is None)
+    return results, len(ours), len(entities), cache
+
+def to_sarif(results):
+    """Wrap results in a minimal SARIF 2.1.0 log."""
+    return {
+        'version': '2.1.0',
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'runs': [{
+            'tool': {'driver': {
+                'name': 'validate-spells',
+                'rules': [{'id': rule, 'defaultConfiguration': {'level': level}}
+                          for rule, level in RULES.items()],
+            }},
+            'results': [{
+                'ruleId': r['rule'],
+                'level': r['level'],
+                'message': {'text': r['message']},
+                'locations': [{'physicalLocation': {
+                    'artifactLocation': {'uri': r['file']},
+                    'region': {'startLine': r['line']},
+                }}],
+            } for r in results],
+        }],
+    }
 
 def main():
-    print("Loading our spells...")
-    our_spells = load_our_spells()
-    print(f"  Found {len(our_spells)} spells in spellbook/")
-
-    print("\nParsing SRD spells...")
-    srd_spells = parse_srd_spells()
-    print(f"  Found {len(srd_spells)} spells in SRD")
-
-    print("\nComparing...")
-    issues = compare_spells(our_spells, srd_spells)
-
-    if issues:
-        print(f"\n{'='*60}")
-        print(f"ISSUES FOUND ({len([i for i in issues if i.startswith('\\n')])} spells with problems):")
-        print('='*60)
-        for issue in issues:
-            print(issue)
+    args = sys.argv[1:]
+    fmt = 'text'
+    output = None
+    if '--format' in args:
+        fmt = args.pop(args.index('--format') + 1)
+        args.remove('--format')
+    if '--output' in args:
+        output = args.pop(args.index('--output') + 1)
+        args.remove('--output')
+    use_cache = '--no-cache' not in args
+    args = [a for a in args if a != '--no-cache']
+    only = {Path(a).resolve() for a in args if a.endswith('.mdx')} if args else None
+
+    results, checked, srd_count, cache = validate(only, use_cache)
+    errors = [r for r in results if r['level'] == 'error']
+
+    if fmt == 'json':
+        text = json.dumps({'checked': checked, 'srdSpells': srd_count, 'results': results}, indent=2)
+    elif fmt == 'sarif':
+        text = json.dumps(to_sarif(results), indent=2)
+    else:
+        lines = [f"Checked {checked} spells against {srd_count} SRD spells "
+                 f"({cache.hits} unchanged since the last run)"]
+        for r in results:
+            lines.append(f"{r['file']}:{r['line']}: {r['level']} [{r['rule']}] {r['message']}")
+        if not errors:
+            lines.append("✓ All spells match SRD metadata!")
+        text = '\n'.join(lines)
+
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
     else:
-        print("\n✓ All spells match SRD metadata!")
+        print(text)
 
-    return len(issues) > 0
+    return 1 if errors else 0
 
 if __name__ == "__main__":
-    exit(1 if main() else 0)
+    sys.exit(main())
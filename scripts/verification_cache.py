@@ -0,0 +1,158 @@
+"""
+Verification result cache shared by the SRD validators.
+
+Each checker (spell fields, monster fields, page bodies) records, per page,
+the SHA-256 of the page file, the SHA-256 of the SRD span it was compared
+with, the checker version and the verdict. A later run reuses the stored
+result when all three still match, so only edited pages, pages whose SRD
+text moved or changed, or pages checked by a newer checker are compared
+again.
+
+    cache = VerificationCache('spell-fields', version=1)
+    page_hash, srd_hash = file_hash(path), text_hash(srd.text(entity))
+    entry = cache.lookup('spellbook/evocation/fireball', page_hash, srd_hash)
+    if entry is None:
+        ...compare...
+        entry = cache.store(key, page_hash, srd_hash, 'fail', results, 'range')
+    cache.save()
+
+save() writes .cache/verification.json and regenerates the automated
+section of VERIFICATION-STATUS.md from everything in the cache.
+"""
+
+import hashlib
+import json
+import time
+
+from corpus import ROOT
+
+CACHE_FILE = ROOT / '.cache' / 'verification.json'
+STATUS_FILE = ROOT / 'VERIFICATION-STATUS.md'
+
+STATUS_START = '<!-- verification:start -->'
+STATUS_END = '<!-- verification:end -->'
+
+SECTION_TITLES = {
+    'spellbook': 'Spellbook',
+    'magicitems': 'Magic Items',
+    'bestiary': 'Bestiary',
+}
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _load():
+    if CACHE_FILE.exists():
+        with open(CACHE_FILE) as f:
+            return json.load(f)
+    return {'checkers': {}}
+
+class VerificationCache:
+    """Per-page verdicts of one checker, keyed by 'section/page id'."""
+
+    def __init__(self, checker, version, enabled=True):
+        self.checker = checker
+        self.version = version
+        self.enabled = enabled
+        self.data = _load()
+        stored = self.data['checkers'].get(checker, {})
+        self.pages = stored.get('pages', {}) if stored.get('version') == version else {}
+        self.seen = set()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, page_hash, srd_hash):
+        """The stored entry if the page and its SRD span are unchanged, else None."""
+        self.seen.add(key)
+        entry = self.pages.get(key)
+        if (self.enabled and entry and entry['pageHash'] == page_hash
+                and entry['srdHash'] == srd_hash):
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, page_hash, srd_hash, verdict, result, summary=''):
+        """Record a fresh verdict ('pass' or 'fail') and return the entry."""
+        self.seen.add(key)
+        entry = {
+            'pageHash': page_hash,
+            'srdHash': srd_hash,
+            'verdict': verdict,
+            'summary': summary,
+            'result': result,
+        }
+        self.pages[key] = entry
+        return entry
+
+    def save(self, full=True):
+        """
+        Write the cache and regenerate VERIFICATION-STATUS.md.
+
+        On a full run, pages not seen this time (deleted, renamed or no
+        longer paired with the SRD) are dropped.
+        """
+        if full:
+            self.pages = {k: v for k, v in self.pages.items() if k in self.seen}
+        self.data['checkers'][self.checker] = {
+            'version': self.version,
+            'updated': time.strftime('%Y-%m-%d'),
+            'pages': self.pages,
+        }
+        CACHE_FILE.parent.mkdir(exist_ok=True)
+        with open(CACHE_FILE, 'w') as f:
+            json.dump(self.data, f)
+        write_status(self.data)
+
+def render_status(data):
+    """The generated VERIFICATION-STATUS.md section for a cache."""
+    lines = [
+        STATUS_START,
+        '## Automated Verification',
+        '',
+        '*Generated by the SRD validators from their result cache; do not edit by hand.*',
+        '',
+        '| Check | Section | Pages | Pass | Fail | Updated |',
+        '|-------|---------|-------|------|------|---------|',
+    ]
+    failing = []
+    for checker, stored in sorted(data['checkers'].items()):
+        by_section = {}
+        for key, entry in stored['pages'].items():
+            section = key.split('/', 1)[0]
+            by_section.setdefault(section, []).append((key, entry))
+        for section, entries in sorted(by_section.items()):
+            failed = [(k, e) for k, e in entries if e['verdict'] != 'pass']
+            lines.append(f"| {checker} | {SECTION_TITLES.get(section, section)} | {len(entries)} "
+                         f"| {len(entries) - len(failed)} | {len(failed)} | {stored['updated']} |")
+            failing.extend((k, checker, e['summary']) for k, e in failed)
+
+    if failing:
+        lines += ['', '### Pages that differ from the SRD', '']
+        for key, checker, summary in sorted(failing):
+            note = f" — *{summary}*" if summary else ''
+            lines.append(f"- [ ] {key}.mdx ({checker}){note}")
+    lines.append(STATUS_END)
+    return '\n'.join(lines)
+
+def write_status(data):
+    """Replace (or insert before the summary) the generated status section."""
+    if not STATUS_FILE.exists():
+        return
+    content = STATUS_FILE.read_text()
+    block = render_status(data)
+    if STATUS_START in content and STATUS_END in content:
+        head, rest = content.split(STATUS_START, 1)
+        tail = rest.split(STATUS_END, 1)[1]
+        new_content = head + block + tail
+    elif '\n---\n\n## Summary' in content:
+        head, tail = content.split('\n---\n\n## Summary', 1)
+        new_content = head + '\n' + block + '\n\n---\n\n## Summary' + tail
+    else:
+        new_content = content.rstrip('\n') + '\n\n' + block + '\n'
+    if new_content != content:
+        STATUS_FILE.write_text(new_content)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Verify page bodies against the SRD text.
+
+Spell descriptions, magic item text and monster traits and actions are
+compared sentence by sentence with the SRD entity each page is paired
+with (see body_verify.py). Reports missing, extra and altered sentences.
+
+Usage:
+  python scripts/verify-bodies.py [--section spellbook|magicitems|bestiary]
+                                  [--json REPORT] [--no-cache] [PAGE...]
+
+PAGE limits the run to the given page IDs or .mdx paths. --json writes the
+full report; use - for stdout. Verdicts are cached per page and SRD span
+(see verification_cache.py); --no-cache compares every page again. Exits 1
+when any page differs.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from body_verify import verify_body
+from corpus import iter_pages
+from page_spans import SECTION_KINDS, entity_index, page_names
+from srd_index import SrdIndex
+from verification_cache import VerificationCache, file_hash, text_hash
+
+# Bump when normalization or alignment rules change, to invalidate cached verdicts
+CHECKER = 'page-bodies'
+CHECKER_VERSION = 1
+
+def verify_section(srd, section, cache, only=None):
+    """Verify every page of a section; returns (results, unmatched)."""
+    kind, _ = SECTION_KINDS[section]
+    index = entity_index(srd, section)
+
+    results = []
+    unmatched = []
+    for page, path, data, body in iter_pages(section):
+        if only and page not in only and str(path.resolve()) not in only:
+            continue
+        match = index.resolve(*page_names(section, page, data))
+        if not match:
+            unmatched.append(page)
+            continue
+        key = f'{section}/{page}'
+        srd_text = srd.text(match.payload)
+        page_hash, srd_hash = file_hash(path), text_hash(srd_text)
+        entry = cache.lookup(key, page_hash, srd_hash)
+        if entry is None:
+            result = verify_body(body, srd_text, kind)
+            result.update({'section': section, 'page': page, 'srdName': match.name})
+            summary = ', '.join(f"{len(result[k])} {k}" for k in ('missing', 'extra', 'altered') if result[k])
+            entry = cache.store(key, page_hash, srd_hash, 'fail' if differs(result) else 'pass',
+                                result, summary)
+        results.append(entry['result'])
+    return results, unmatched
+
+def differs(result):
+    return bool(result['missing'] or result['extra'] or result['altered'])
+
+def main():
+    parser = argparse.ArgumentParser(description='Verify page bodies against the SRD text.')
+    parser.add_argument('pages', nargs='*', help='page IDs or .mdx paths')
+    parser.add_argument('--section', choices=SECTION_KINDS, action='append')
+    parser.add_argument('--json', metavar='REPORT')
+    parser.add_argument('--no-cache', action='store_true', help='compare every page again')
+    args = parser.parse_args()
+
+    only = {str(Path(p).resolve()) if p.endswith('.mdx') else p for p in args.pages}
+    started = time.perf_counter()
+    srd = SrdIndex.load('srd-text')
+    cache = VerificationCache(CHECKER, CHECKER_VERSION, enabled=not args.no_cache)
+
+    report = {'pages': [], 'unmatched': {}}
+    for section in args.section or SECTION_KINDS:
+        results, unmatched = verify_section(srd, section, cache, only)
+        report['pages'].extend(results)
+        if unmatched:
+            report['unmatched'][section] = unmatched
+    cache.save(full=not only and not args.section)
+    report['cached'] = cache.hits
+    report['elapsed'] = round(time.perf_counter() - started, 3)
+    failing = [r for r in report['pages'] if differs(r)]
+
+    if args.json:
+        text = json.dumps(report, indent=2)
+        if args.json == '-':
+            print(text)
+            return 1 if failing else 0
+        with open(args.json, 'w') as f:
+            f.write(text + '\n')
+
+    for r in failing:
+        print(f"\n{r['section']}/{r['page']} ({r['srdName']}): "
+              f"{r['matched']}/{r['sentences']} sentences match")
+        for s in r['missing']:
+            print(f"  - missing: {s}")
+        for s in r['extra']:
+            print(f"  + extra:   {s}")
+        for a in r['altered']:
+            print(f"  ~ altered ({a['similarity']}):")
+            print(f"      ours: {a['ours']}")
+            print(f"      srd:  {a['srd']}")
+
+    for section, pages in report['unmatched'].items():
+        print(f"\n{section}: {len(pages)} pages not paired with SRD text")
+
+    print(f"\nVerified {len(report['pages'])} pages in {report['elapsed']}s "
+          f"({len(failing)} differ, {report['cached']} unchanged since the last run)")
+    return 1 if failing else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
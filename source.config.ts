@@ -56,6 +56,11 @@ const magicItemSchema = baseSchema.extend({
   rarity: z.enum(['Common', 'Uncommon', 'Rare', 'Very Rare', 'Legendary', 'Artifact']).optional(),
   itemType: z.string().optional(), // Subtype like "Shield", "Any Ammunition", etc.
   attunement: z.union([z.boolean(), z.string()]).optional(), // true, false, or "by a spellcaster"
+  variants: z.array(z.object({ // +1/+2/+3 and "Rarity Varies" items
+    name: z.string(),
+    rarity: z.enum(['Common', 'Uncommon', 'Rare', 'Very Rare', 'Legendary', 'Artifact']),
+    bonus: z.number().optional(),
+  })).optional(),
   charges: z.object({
     max: z.number(),
     recharge: z.string().optional(), // "dawn", "1d6+1 at dawn", etc.
@@ -89,6 +94,30 @@ const spellSchema = baseSchema.extend({
   ritual: z.boolean().default(false),
   classes: z.array(z.string()).optional(),
   higherLevel: z.string().optional(),
+  // Structured effects extracted by scripts/spell_effects.py
+  damage: z.array(z.object({
+    dice: z.string(), // "8d6"
+    type: z.string(), // "Fire"
+  })).optional(),
+  save: z.enum(['Strength', 'Dexterity', 'Constitution', 'Intelligence', 'Wisdom', 'Charisma']).optional(),
+  attackType: z.enum(['Melee', 'Ranged']).optional(),
+  area: z.object({
+    shape: z.enum(['Cone', 'Cube', 'Cylinder', 'Emanation', 'Line', 'Sphere']),
+    size: z.number(), // feet; radius for Sphere/Cylinder, length for Line
+    width: z.number().optional(),
+  }).optional(),
+  conditions: z.array(z.string()).optional(),
+  materialCost: z.object({
+    gp: z.number(),
+    consumed: z.boolean(),
+  }).optional(),
+  scaling: z.object({
+    by: z.enum(['slot', 'characterLevel']),
+    applies: z.string(), // "damage", "healing", "targets", ...
+    increment: z.string(), // "1d6", "5"
+    above: z.number().optional(), // slot level the scaling starts above
+    levels: z.array(z.number()).optional(), // character levels for cantrips
+  }).optional(),
 });
 
 // Main documentation (rules, classes, origins, etc.)